@@ -0,0 +1,45 @@
+"""Background job endpoints - submit, poll, fetch results, cancel"""
+
+from fastapi import APIRouter, HTTPException
+from pydantic import ValidationError
+
+from app.schemas import JobSubmitRequest, JobStatusResponse, JobResultResponse
+from app.services.jobs import get_job_manager
+
+router = APIRouter()
+
+
+@router.post("/", response_model=JobStatusResponse, status_code=202)
+async def submit_job(request: JobSubmitRequest):
+    try:
+        return await get_job_manager().submit(request.kind, request.payload)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_context=False))
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    job = await get_job_manager().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}/result", response_model=JobResultResponse)
+async def get_job_result(job_id: str):
+    job = await get_job_manager().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job['status'] == 'failed':
+        raise HTTPException(status_code=409, detail=f"Job failed: {job['error']}")
+    if job['status'] != 'succeeded':
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return JobResultResponse(id=job['id'], kind=job['kind'], result=job['result'])
+
+
+@router.delete("/{job_id}", response_model=JobStatusResponse)
+async def cancel_job(job_id: str):
+    job = await get_job_manager().cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
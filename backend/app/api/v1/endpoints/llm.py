@@ -2,9 +2,12 @@
 
 from fastapi import APIRouter, HTTPException
 
+from app.core.config import settings
+from app.core.serialization import event_stream
 from app.schemas import (
     LLMQuickSummaryRequest,
     LLMQuickSummaryResponse,
+    LLMBatchQuickSummaryRequest,
     LLMAskArticleRequest,
     LLMAskArticleResponse,
     LLMSynthesisRequest,
@@ -28,6 +31,26 @@ async def quick_summary(request: LLMQuickSummaryRequest):
         raise HTTPException(status_code=502, detail=f"LLM provider error: {exc}") from exc
 
 
+@router.post("/quick-summary/stream")
+async def quick_summary_stream(request: LLMQuickSummaryRequest):
+    """Server-Sent Events: 'token' frames, a 'section' frame per finished heading, then 'done' with the full summary."""
+    if not llm_service.is_configured:
+        raise HTTPException(status_code=503, detail=f"OpenRouter is not configured: {llm_service.configuration_issue}")
+    return event_stream(llm_service.quick_summary_stream(request.article, request.language), "LLM provider error")
+
+
+@router.post("/quick-summary/batch")
+async def quick_summary_batch(request: LLMBatchQuickSummaryRequest):
+    """Server-Sent Events: a 'summary' (or 'error') frame per article in completion order, then 'done' with counts."""
+    if not llm_service.is_configured:
+        raise HTTPException(status_code=503, detail=f"OpenRouter is not configured: {llm_service.configuration_issue}")
+    if not request.articles:
+        raise HTTPException(status_code=400, detail="Articles are required")
+    if len(request.articles) > settings.LLM_BATCH_MAX_ARTICLES:
+        raise HTTPException(status_code=400, detail=f"At most {settings.LLM_BATCH_MAX_ARTICLES} articles per batch")
+    return event_stream(llm_service.quick_summary_batch(request.articles, request.language), "LLM provider error")
+
+
 @router.post("/ask-article", response_model=LLMAskArticleResponse)
 async def ask_article(request: LLMAskArticleRequest):
     if not llm_service.is_configured:
@@ -40,6 +63,11 @@ async def ask_article(request: LLMAskArticleRequest):
         raise HTTPException(status_code=502, detail=f"LLM provider error: {exc}") from exc
 
 
+@router.get("/ask-article/cache-stats")
+async def ask_article_cache_stats():
+    return llm_service.answers.metrics()
+
+
 @router.post("/synthesize", response_model=LLMSynthesisResponse)
 async def synthesize(request: LLMSynthesisRequest):
     if not llm_service.is_configured:
@@ -52,6 +80,18 @@ async def synthesize(request: LLMSynthesisRequest):
         raise HTTPException(status_code=502, detail=f"LLM provider error: {exc}") from exc
 
 
+@router.post("/synthesize/stream")
+async def synthesize_stream(request: LLMSynthesisRequest):
+    """Server-Sent Events: 'token' frames, a 'section' frame per finished heading, then 'done' with the full synthesis."""
+    if not llm_service.is_configured:
+        raise HTTPException(status_code=503, detail=f"OpenRouter is not configured: {llm_service.configuration_issue}")
+    if len(request.articles) < 2:
+        raise HTTPException(status_code=400, detail="At least 2 articles are required")
+    return event_stream(
+        llm_service.synthesize_stream(request.articles, request.synthesis_type, request.size, request.language), "LLM provider error"
+    )
+
+
 @router.post("/recommend-results", response_model=LLMRecommendResultsResponse)
 async def recommend_results(request: LLMRecommendResultsRequest):
     if not llm_service.is_configured:
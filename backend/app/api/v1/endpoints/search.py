@@ -1,7 +1,10 @@
 """Search endpoints"""
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 import time
+from typing import Dict, List
+from app.core.serialization import dumps
 from app.schemas import SearchRequest, SearchResponse, ArticleResponse
 from app.services.search_service import SearchService
 from app.core.database import get_db
@@ -11,6 +14,15 @@ router = APIRouter()
 search_service = SearchService()
 
 
+def _normalize_articles(articles: List[Dict]) -> List[ArticleResponse]:
+    normalized_results = []
+    for idx, article in enumerate(articles):
+        if 'id' not in article or article['id'] is None:
+            article['id'] = idx + 1
+        normalized_results.append(ArticleResponse(**article))
+    return normalized_results
+
+
 @router.post("/articles", response_model=SearchResponse)
 async def search_articles(request: SearchRequest, db: AsyncSession = Depends(get_db)):
     start_time = time.time()
@@ -20,27 +32,46 @@ async def search_articles(request: SearchRequest, db: AsyncSession = Depends(get
         filters=request.filters.model_dump() if request.filters else {},
         limit=request.limit,
         offset=request.offset,
-        sort_by=request.sort_by
+        sort_by=request.sort_by,
+        cursor=request.cursor,
+        db=db
     )
 
     search_time = (time.time() - start_time) * 1000
 
-    normalized_results = []
-    for idx, article in enumerate(results['articles']):
-        if 'id' not in article or article['id'] is None:
-            article['id'] = idx + 1
-        normalized_results.append(ArticleResponse(**article))
-
     return SearchResponse(
         query=request.query,
         total=results['total'],
-        results=normalized_results,
+        results=_normalize_articles(results['articles']),
         sources_used=results['sources_used'],
-        cached=False,
+        sources_timed_out=results.get('sources_timed_out', []),
+        sources_failed=results.get('sources_failed', []),
+        cached=results.get('cached', False),
+        next_cursor=results.get('next_cursor'),
         search_time_ms=search_time
     )
 
 
+@router.post("/articles/stream")
+async def search_articles_stream(request: SearchRequest):
+    """NDJSON stream: one 'source' event per upstream as it resolves, 'update' events with the re-ranked page, then 'done'."""
+    start_time = time.time()
+
+    async def events():
+        async for event in search_service.search_stream(
+            query=request.query,
+            filters=request.filters.model_dump() if request.filters else {},
+            limit=request.limit,
+            offset=request.offset,
+            sort_by=request.sort_by
+        ):
+            event['articles'] = [a.model_dump() for a in _normalize_articles(event.get('articles', []))]
+            event['search_time_ms'] = (time.time() - start_time) * 1000
+            yield dumps(event) + b"\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.get("/suggestions")
 async def get_suggestions(query: str, limit: int = 10):
     suggestions = await search_service.get_suggestions(query, limit)
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, HTTPException
 
+from app.core.serialization import event_stream
 from app.schemas import ThesysChatRequest, ThesysChatResponse
 from app.services.thesys_service import ThesysService
 
@@ -33,3 +34,29 @@ async def chat(request: ThesysChatRequest):
         c1_response=c1_response,
         model="thesys",
     )
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ThesysChatRequest):
+    """Server-Sent Events: 'token' frames as the reply is generated, then 'done' with the full response, or 'error'."""
+    if not thesys_service.is_configured:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Thesys is not configured: {thesys_service.configuration_issue}",
+        )
+
+    async def events():
+        parts = []
+        async for delta in thesys_service.chat_stream(
+            prompt=request.prompt,
+            language=request.language,
+            search_query=request.search_query,
+            history=request.history,
+            results=request.results,
+            saved_articles=request.saved_articles,
+        ):
+            parts.append(delta)
+            yield {"event": "token", "text": delta}
+        yield {"event": "done", **ThesysChatResponse(c1_response="".join(parts).strip(), model="thesys").model_dump()}
+
+    return event_stream(events(), "Thesys provider error")
@@ -8,4 +8,6 @@ from app.api_clients.pubmed import PubMedClient
 from app.api_clients.crossref import CrossRefClient
 from app.api_clients.arxiv import ArxivClient
 
-__all__ = ["BaseClient", "OpenAlexClient", "SemanticScholarClient", "CoreClient", "PubMedClient", "CrossRefClient", "ArxivClient"]
\ No newline at end of file
+UPSTREAM_CLIENTS = [OpenAlexClient, SemanticScholarClient, CoreClient, PubMedClient, CrossRefClient, ArxivClient]
+
+__all__ = ["UPSTREAM_CLIENTS", "BaseClient", "OpenAlexClient", "SemanticScholarClient", "CoreClient", "PubMedClient", "CrossRefClient", "ArxivClient"]
\ No newline at end of file
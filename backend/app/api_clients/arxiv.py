@@ -1,34 +1,84 @@
 """arXiv API client"""
 
-from typing import Dict, Any, Optional
+import re
+from typing import Dict, Any, List, Optional
+from xml.etree.ElementTree import Element, XMLPullParser
+
 from app.api_clients.base import BaseClient
-import feedparser
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+ARXIV = '{http://arxiv.org/schemas/atom}'
+VERSION_SUFFIX = re.compile(r'v\d+$')
+
+
+def _text(element: Optional[Element]) -> str:
+    return ' '.join(element.text.split()) if element is not None and element.text else ''
+
+
+class ArxivAtomParser:
+    """Incremental Atom parser; entries are extracted as they close, so a feed is never held whole."""
+
+    def __init__(self):
+        self._parser = XMLPullParser(events=('start', 'end'))
+        self._root: Optional[Element] = None
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        self._parser.feed(chunk)
+        entries = []
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                if self._root is None:
+                    self._root = element
+            elif element.tag == f'{ATOM}entry':
+                entries.append(self.extract(element))
+                self._root.remove(element)
+        return entries
+
+    def close(self) -> None:
+        self._parser.close()
+
+    @staticmethod
+    def extract(entry: Element) -> Dict[str, Any]:
+        entry_id = _text(entry.find(f'{ATOM}id'))
+        published = _text(entry.find(f'{ATOM}published'))
+        url = next((link.get('href', '') for link in entry.iterfind(f'{ATOM}link')
+                    if link.get('rel') == 'alternate' and 'arxiv.org/abs' in link.get('href', '')), entry_id)
+        return {
+            'title': _text(entry.find(f'{ATOM}title')),
+            'authors': [{'name': _text(author.find(f'{ATOM}name'))} for author in entry.iterfind(f'{ATOM}author')],
+            'year': int(published[:4]) if published[:4].isdigit() else None,
+            'journal': 'arXiv',
+            'doi': _text(entry.find(f'{ARXIV}doi')),
+            'arxiv_id': VERSION_SUFFIX.sub('', entry_id.split('/abs/', 1)[-1]),
+            'abstract': _text(entry.find(f'{ATOM}summary')),
+            'url': url,
+            'type': 'preprint',
+            'open_access': True
+        }
 
 
 class ArxivClient(BaseClient):
     BASE_URL = "https://export.arxiv.org/api/query"
+    SOURCE = "arxiv"
+    RATE_LIMIT_PER_SECOND = 0.34
+    RATE_LIMIT_BURST = 1
 
-    async def search(self, query: str, filters: Dict[str, Any], limit: int) -> Dict[str, Any]:
-        params = {"search_query": f"all:{query}", "max_results": min(limit, 100)}
+    async def search(self, query: str, filters: Dict[str, Any], limit: int, offset: int = 0) -> Dict[str, Any]:
+        params = {"search_query": f"all:{query}", "start": offset, "max_results": min(limit, 100)}
 
         try:
-            response = await self.client.get(self.BASE_URL, params=params)
-            response.raise_for_status()
-            feed = feedparser.parse(response.text)
-            articles = [self._normalize_article(self._extract(entry)) for entry in feed.entries]
+            parser = ArxivAtomParser()
+            articles = []
+            async with self._stream("GET", self.BASE_URL, params=params) as response:
+                async for chunk in response.aiter_bytes():
+                    articles.extend(self._normalize(entry) for entry in parser.feed(chunk))
+            parser.close()
             return {'articles': articles}
         except Exception as e:
             print(f"arXiv error: {e}")
-            return {'articles': []}
+            return self._failed(e)
 
-    def _extract(self, raw: Dict) -> Dict:
-        return {
-            'title': raw.get('title') or '',
-            'authors': [{'name': a.get('name', '')} for a in raw.get('authors', [])],
-            'year': int(raw.get('published', '').split('-')[0]) if raw.get('published') else None,
-            'journal': 'arXiv',
-            'abstract': ' '.join(raw.get('summary', '').split()) if raw.get('summary') else '',
-            'url': next((l.get('href', '') for l in raw.get('links', []) if 'arxiv.org/abs' in l.get('href', '')), ''),
-            'type': 'preprint',
-            'open_access': True
-        }
+    def _normalize(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        article = self._normalize_article(entry)
+        article['arxiv_id'] = entry['arxiv_id']
+        return article
@@ -1,20 +1,138 @@
 """Base API client"""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional, AsyncIterator, Union
 import httpx
 
+from app.api_clients.http_cache import freshness_lifetime, get_http_cache
+from app.api_clients.resilience import CircuitOpenError, backoff_delay, get_breaker, get_bucket, retry_after_seconds
+from app.api_clients.transport import get_http_client
+from app.core.config import settings
+from app.core.serialization import loads
+
+
+# Where a source resumes paging: a record offset, or whatever the source returned as `next_offset` with its
+# previous page (an OpenAlex cursor, PubMed history-server state). Must stay JSON-serializable for snapshots.
+Offset = Union[int, str, Dict[str, Any]]
+
 
 class BaseClient(ABC):
+    BASE_URL = ""
+    SOURCE = ""
+    RATE_LIMIT_PER_SECOND: Optional[float] = None
+    RATE_LIMIT_BURST = 1
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    # Freshness lifetime for cached GETs in seconds; None follows the upstream Cache-Control headers.
+    HTTP_CACHE_TTL: Optional[float] = None
+
     def __init__(self, api_key: Optional[str] = None, timeout: int = 30):
         self.api_key = api_key
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return get_http_client()
+
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        return await self._request("GET", url, **kwargs)
+
+    def _json(self, response: httpx.Response) -> Any:
+        return loads(response.content)
+
+    @asynccontextmanager
+    async def _stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Like _request, but the body is left unread for incremental consumption."""
+        response = await self._request(method, url, stream=True, **kwargs)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    async def _request(self, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """Send through the HTTP cache, the source's rate limiter and circuit breaker, retrying throttling and server errors."""
+        kwargs.setdefault("timeout", self.timeout)
+        request = self.client.build_request(method, url, **kwargs)
+        cache = get_http_cache() if method == "GET" else None
+        if cache is None:
+            response = await self._send(request, stream)
+            response.raise_for_status()
+            return response
+
+        key = cache.key(request)
+        entry = await cache.get(key)
+        if entry and cache.is_fresh(entry):
+            return cache.build_response(entry, request)
+        if entry:
+            request.headers.update(cache.conditional_headers(entry))
+
+        response = await self._send(request, stream)
+        ttl = settings.HTTP_CACHE_TTLS.get(self.SOURCE, self.HTTP_CACHE_TTL)
+        if response.status_code == 304 and entry:
+            await response.aclose()
+            return cache.build_response(await cache.revalidated(key, entry, response, ttl), request)
+        response.raise_for_status()
+        await cache.store(key, response, freshness_lifetime(response, ttl), streamed=stream)
+        return response
+
+    async def _send(self, request: httpx.Request, stream: bool) -> httpx.Response:
+        breaker = get_breaker(self.SOURCE or type(self).__name__, settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_COOLDOWN_SECONDS)
+        probe = breaker.check()
+
+        rate = settings.UPSTREAM_RATE_LIMITS.get(self.SOURCE, self.RATE_LIMIT_PER_SECOND)
+        bucket = get_bucket(self.SOURCE or type(self).__name__, rate, self.RATE_LIMIT_BURST) if rate else None
+
+        try:
+            return await self._send_with_retries(request, stream, breaker, bucket)
+        except BaseException:
+            # Cancelled (deadlines), rate-limit timeouts and non-transport errors record no outcome.
+            if probe:
+                breaker.release()
+            raise
+
+    async def _send_with_retries(self, request: httpx.Request, stream: bool, breaker, bucket) -> httpx.Response:
+        attempt = 0
+        while True:
+            if bucket:
+                await bucket.acquire(settings.UPSTREAM_RATE_LIMIT_MAX_WAIT_SECONDS)
+            try:
+                response = await self.client.send(request, stream=stream)
+            except httpx.TransportError:
+                if attempt >= settings.UPSTREAM_MAX_RETRIES:
+                    breaker.record_failure()
+                    raise
+                await asyncio.sleep(backoff_delay(attempt, settings.UPSTREAM_RETRY_BASE_SECONDS, settings.UPSTREAM_RETRY_MAX_SECONDS))
+                attempt += 1
+                continue
+
+            if response.status_code not in self.RETRY_STATUSES:
+                break
+            delay = retry_after_seconds(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = backoff_delay(attempt, settings.UPSTREAM_RETRY_BASE_SECONDS, settings.UPSTREAM_RETRY_MAX_SECONDS)
+            if attempt >= settings.UPSTREAM_MAX_RETRIES or delay > settings.UPSTREAM_MAX_RETRY_AFTER_SECONDS:
+                break
+            await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        if response.status_code in self.RETRY_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if stream and response.is_error:
+            await response.aclose()
+        return response
 
     @abstractmethod
-    async def search(self, query: str, filters: Dict[str, Any], limit: int) -> Dict[str, Any]:
+    async def search(self, query: str, filters: Dict[str, Any], limit: int, offset: Offset = 0) -> Dict[str, Any]:
         pass
 
+    def _failed(self, exc: Exception) -> Dict[str, Any]:
+        """Empty search result that still tells the caller the source failed (and whether it was even contacted)."""
+        return {'articles': [], 'error': str(exc), 'circuit_open': isinstance(exc, CircuitOpenError)}
+
     def _normalize_article(self, raw: Dict[str, Any]) -> Dict[str, Any]:
         return {
             'title': raw.get('title', ''),
@@ -35,4 +153,5 @@ class BaseClient(ABC):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
\ No newline at end of file
+        # The pooled transport is shared and owned by the app lifespan.
+        pass
\ No newline at end of file
@@ -6,24 +6,26 @@ from app.api_clients.base import BaseClient
 
 class CoreClient(BaseClient):
     BASE_URL = "https://api.core.ac.uk/v3"
+    SOURCE = "core"
+    RATE_LIMIT_PER_SECOND = 0.5
+    RATE_LIMIT_BURST = 2
 
     def __init__(self, api_key: Optional[str] = None, timeout: int = 30):
         super().__init__(api_key, timeout)
         self.headers = {"Accept": "application/json"}
         if api_key: self.headers["Authorization"] = f"Bearer {api_key}"
 
-    async def search(self, query: str, filters: Dict[str, Any], limit: int) -> Dict[str, Any]:
-        params = {"q": query, "limit": min(limit, 100)}
+    async def search(self, query: str, filters: Dict[str, Any], limit: int, offset: int = 0) -> Dict[str, Any]:
+        params = {"q": query, "limit": min(limit, 100), "offset": offset}
 
         try:
-            response = await self.client.get(f"{self.BASE_URL}/search/works", params=params, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
+            response = await self._get(f"{self.BASE_URL}/search/works", params=params, headers=self.headers)
+            data = self._json(response)
             articles = [self._normalize_article(self._extract(work)) for work in data.get('results', [])]
             return {'articles': articles}
         except Exception as e:
             print(f"CORE error: {e}")
-            return {'articles': []}
+            return self._failed(e)
 
     def _extract(self, raw: Dict) -> Dict:
         return {
@@ -6,23 +6,25 @@ from app.api_clients.base import BaseClient
 
 class CrossRefClient(BaseClient):
     BASE_URL = "https://api.crossref.org"
+    SOURCE = "crossref"
+    RATE_LIMIT_PER_SECOND = 10
+    RATE_LIMIT_BURST = 5
 
     def __init__(self, api_key: Optional[str] = None, timeout: int = 30):
         super().__init__(api_key, timeout)
         self.headers = {"Accept": "application/json"}
 
-    async def search(self, query: str, filters: Dict[str, Any], limit: int) -> Dict[str, Any]:
-        params = {"query": query, "rows": min(limit, 100)}
+    async def search(self, query: str, filters: Dict[str, Any], limit: int, offset: int = 0) -> Dict[str, Any]:
+        params = {"query": query, "rows": min(limit, 100), "offset": offset}
 
         try:
-            response = await self.client.get(f"{self.BASE_URL}/works", params=params, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
+            response = await self._get(f"{self.BASE_URL}/works", params=params, headers=self.headers)
+            data = self._json(response)
             articles = [self._normalize_article(self._extract(item)) for item in data.get('message', {}).get('items', [])]
             return {'articles': articles}
         except Exception as e:
             print(f"Crossref error: {e}")
-            return {'articles': []}
+            return self._failed(e)
 
     def _extract(self, raw: Dict) -> Dict:
         pub_date = raw.get('published', {}).get('date-parts', [[]])
@@ -0,0 +1,214 @@
+"""HTTP response cache for upstream GETs - Cache-Control freshness with ETag/Last-Modified revalidation"""
+
+import hashlib
+import time
+import zlib
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.serialization import dumps, loads
+
+CACHEABLE_STATUSES = {200, 203}
+# Hop-by-hop and framing headers describe the original transfer, not the stored body.
+DROPPED_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-length", "set-cookie"}
+HEURISTIC_FRACTION = 0.1
+HEURISTIC_MAX_SECONDS = 86400
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp() if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(response: httpx.Response, override: Optional[float] = None) -> Optional[float]:
+    """Seconds the response may be served without revalidation, or None when it must not be stored (RFC 9111 4.2.1)."""
+    directives = parse_cache_control(response.headers.get("cache-control"))
+    if "no-store" in directives or response.headers.get("vary") == "*":
+        return None
+    if override is not None:
+        return override
+    if "no-cache" in directives:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        if (directives.get(name) or "").isdigit():
+            return float(directives[name])
+
+    date = _http_date(response.headers.get("date")) or time.time()
+    expires = _http_date(response.headers.get("expires"))
+    if expires is not None:
+        return max(expires - date, 0.0)
+    last_modified = _http_date(response.headers.get("last-modified"))
+    if last_modified is not None:
+        return min(max(date - last_modified, 0.0) * HEURISTIC_FRACTION, HEURISTIC_MAX_SECONDS)
+    return 0.0
+
+
+class _TeeStream(httpx.AsyncByteStream):
+    """Passes a streamed body through while keeping a copy, handed to `on_complete` once fully read."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, max_bytes: int, on_complete: Callable[[bytes], Awaitable[None]]):
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.on_complete = on_complete
+
+    async def __aiter__(self):
+        chunks, size = [], 0
+        async for chunk in self.stream:
+            size += len(chunk)
+            if size <= self.max_bytes:
+                chunks.append(chunk)
+            yield chunk
+        if size <= self.max_bytes:
+            await self.on_complete(b"".join(chunks))
+
+    async def aclose(self) -> None:
+        await self.stream.aclose()
+
+
+class HTTPCache:
+    PREFIX = "http:v1:"
+    REDIS_RETRY_SECONDS = 30
+
+    def __init__(self, memory_size: int = 128, max_bytes: int = 1_000_000, stale: float = 86400):
+        self.memory_size = memory_size
+        self.max_bytes = max_bytes
+        self.stale = stale
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._redis_down_until = 0.0
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        raw = f"{request.method} {request.url} {request.headers.get('accept', '')}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["stored_at"] < entry["lifetime"]
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        headers = {}
+        if entry["headers"].get("etag"):
+            headers["If-None-Match"] = entry["headers"]["etag"]
+        if entry["headers"].get("last-modified"):
+            headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+        return headers
+
+    @staticmethod
+    def build_response(entry: Dict[str, Any], request: httpx.Request) -> httpx.Response:
+        return httpx.Response(entry["status"], headers=entry["headers"], content=entry["content"], request=request)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        entry = await self._redis_get(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    async def store(self, key: str, response: httpx.Response, lifetime: Optional[float], streamed: bool = False) -> None:
+        """Cache a fresh response; a streamed one is stored once the caller has read it to the end."""
+        if lifetime is None or response.status_code not in CACHEABLE_STATUSES:
+            return
+        headers = {k.lower(): v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS}
+        if not lifetime and not ("etag" in headers or "last-modified" in headers):
+            return
+        entry = {"stored_at": time.time(), "lifetime": lifetime, "status": response.status_code, "headers": headers}
+
+        if not streamed or response.is_stream_consumed:
+            # Already decoded by httpx, so the stored body must not claim an encoding.
+            headers.pop("content-encoding", None)
+            if len(response.content) <= self.max_bytes:
+                await self._save(key, {**entry, "content": response.content})
+            return
+
+        async def on_complete(content: bytes) -> None:
+            await self._save(key, {**entry, "content": content})
+
+        response.stream = _TeeStream(response.stream, self.max_bytes, on_complete)
+
+    async def revalidated(self, key: str, entry: Dict[str, Any], response: httpx.Response, override: Optional[float]) -> Dict[str, Any]:
+        """Apply a 304: refresh the stored metadata and restart the freshness clock (RFC 9111 4.3.4)."""
+        headers = dict(entry["headers"])
+        for name in ("cache-control", "date", "etag", "expires", "last-modified"):
+            if name in response.headers:
+                headers[name] = response.headers[name]
+        lifetime = freshness_lifetime(httpx.Response(200, headers=headers), override)
+        entry = {**entry, "headers": headers, "stored_at": time.time(), "lifetime": lifetime or 0.0}
+        await self._save(key, entry)
+        return entry
+
+    async def _save(self, key: str, entry: Dict[str, Any]) -> None:
+        self._remember(key, entry)
+        await self._redis_set(key, entry)
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _redis(self):
+        if time.time() < self._redis_down_until:
+            return None
+        return get_redis()
+
+    def _redis_failed(self, exc: Exception) -> None:
+        print(f"HTTP cache Redis error: {exc}")
+        self._redis_down_until = time.time() + self.REDIS_RETRY_SECONDS
+
+    async def _redis_get(self, key: str) -> Optional[Dict[str, Any]]:
+        redis = self._redis()
+        if redis is None:
+            return None
+        try:
+            data = await redis.get(self.PREFIX + key)
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        if not data:
+            return None
+        meta, _, content = zlib.decompress(data).partition(b"\n")
+        return {**loads(meta), "content": content}
+
+    async def _redis_set(self, key: str, entry: Dict[str, Any]) -> None:
+        redis = self._redis()
+        if redis is None:
+            return
+        meta = {k: v for k, v in entry.items() if k != "content"}
+        # Compact JSON metadata never contains a newline, so it can prefix the raw body.
+        data = zlib.compress(dumps(meta) + b"\n" + entry["content"], 1)
+        try:
+            await redis.set(self.PREFIX + key, data, ex=int(entry["lifetime"] + self.stale) + 1)
+        except Exception as e:
+            self._redis_failed(e)
+
+
+_cache: Optional[HTTPCache] = None
+
+
+def get_http_cache() -> Optional[HTTPCache]:
+    global _cache
+    if not settings.HTTP_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = HTTPCache(settings.HTTP_CACHE_MEMORY_SIZE, settings.HTTP_CACHE_MAX_BYTES, settings.HTTP_CACHE_STALE_SECONDS)
+    return _cache
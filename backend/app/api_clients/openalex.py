@@ -1,19 +1,55 @@
 """OpenAlex API client"""
 
 from typing import Dict, Any, Optional, List
-from app.api_clients.base import BaseClient
+from app.api_clients.base import BaseClient, Offset
+
+# Root-level fields read by _extract; everything else (locations, concepts, referenced works...) stays on the server.
+SELECT_FIELDS = "id,doi,title,publication_year,primary_location,authorships,abstract_inverted_index,cited_by_count,type"
 
 
 class OpenAlexClient(BaseClient):
     BASE_URL = "https://api.openalex.org"
+    SOURCE = "openalex"
+    RATE_LIMIT_PER_SECOND = 10
+    RATE_LIMIT_BURST = 5
+    MAX_PER_PAGE = 200
+    MAX_FILTER_VALUES = 50
 
     def __init__(self, api_key: Optional[str] = None, timeout: int = 30):
         super().__init__(api_key, timeout)
         self.headers = {"User-Agent": "Research-Navigator/1.0 (mailto:contact@iibpr.org.br)", "Accept": "application/json"}
         if api_key: self.headers["api_key"] = api_key
 
-    async def search(self, query: str, filters: Dict[str, Any], limit: int) -> Dict[str, Any]:
-        params = {"search": query, "per-page": min(limit, 200)}
+    async def search(self, query: str, filters: Dict[str, Any], limit: int, offset: Offset = 0) -> Dict[str, Any]:
+        """One page of results. First pages and string offsets (a previous `next_offset`) use cursor paging, which
+        unlike page= is not capped at 10,000 results and does not depend on earlier pages having the same size."""
+        per_page = min(limit, self.MAX_PER_PAGE)
+        params = self._params(query, filters, per_page)
+        if isinstance(offset, str) or not offset:
+            params["cursor"] = offset or "*"
+        else:
+            params["page"] = offset // per_page + 1
+
+        try:
+            response = await self._get(f"{self.BASE_URL}/works", params=params, headers=self.headers)
+            data = self._json(response)
+            articles = [self._normalize_article(self._extract(work)) for work in data.get('results', [])]
+            if "cursor" in params:
+                return {'articles': articles, 'next_offset': (data.get('meta') or {}).get('next_cursor')}
+            return {'articles': articles}
+        except Exception as e:
+            print(f"OpenAlex error: {e}")
+            return self._failed(e)
+
+    async def works_by_doi(self, dois: List[str]) -> List[Dict[str, Any]]:
+        """Fetch up to MAX_FILTER_VALUES works in one request with an OR-ed doi filter."""
+        dois = dois[:self.MAX_FILTER_VALUES]
+        params = {"filter": "doi:" + "|".join(dois), "per-page": len(dois), "select": SELECT_FIELDS}
+        response = await self._get(f"{self.BASE_URL}/works", params=params, headers=self.headers)
+        return [self._extract(work) for work in self._json(response).get('results', [])]
+
+    def _params(self, query: str, filters: Dict[str, Any], per_page: int) -> Dict[str, Any]:
+        params = {"search": query, "per-page": per_page, "select": SELECT_FIELDS}
 
         year = filters.get('year')
         if year:
@@ -21,16 +57,7 @@ class OpenAlexClient(BaseClient):
                 params['filter'] = f"from_publication_date:{year[0]}-01-01,to_publication_date:{year[1]}-12-31"
             else:
                 params['filter'] = f"publication_year:{year}"
-
-        try:
-            response = await self.client.get(f"{self.BASE_URL}/works", params=params, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
-            articles = [self._normalize_article(self._extract(work)) for work in data.get('results', [])]
-            return {'articles': articles}
-        except Exception as e:
-            print(f"OpenAlex error: {e}")
-            return {'articles': []}
+        return params
 
     def _extract(self, raw: Dict) -> Dict:
         location = raw.get('primary_location') or {}
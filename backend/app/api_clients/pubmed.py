@@ -1,53 +1,182 @@
 """PubMed API client"""
 
-from typing import Dict, Any, Optional
-from app.api_clients.base import BaseClient
+import re
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
+from xml.etree.ElementTree import Element, XMLPullParser, fromstring
+
+from app.api_clients.base import BaseClient, Offset
+
+YEAR_PATTERN = re.compile(r'\b(\d{4})\b')
+
+
+def _text(element: Optional[Element]) -> str:
+    # itertext keeps inline markup such as <i> or <sup> inside titles and abstracts.
+    return ' '.join(''.join(element.itertext()).split()) if element is not None else ''
+
+
+class PubmedXMLParser:
+    """Incremental efetch XML parser; each PubmedArticle is extracted and dropped as soon as it closes."""
+
+    def __init__(self):
+        self._parser = XMLPullParser(events=('start', 'end'))
+        self._root: Optional[Element] = None
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        self._parser.feed(chunk)
+        records = []
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                if self._root is None:
+                    self._root = element
+            elif element.tag == 'PubmedArticle':
+                records.append(self.extract(element))
+                self._root.clear()
+        return records
+
+    def close(self) -> None:
+        self._parser.close()
+
+    @staticmethod
+    def extract(element: Element) -> Dict[str, Any]:
+        citation = element.find('MedlineCitation')
+        article = citation.find('Article') if citation is not None else None
+        if article is None:
+            return {}
+        pmid = _text(citation.find('PMID'))
+
+        abstract_parts = []
+        for part in article.iterfind('Abstract/AbstractText'):
+            text = _text(part)
+            label = part.get('Label')
+            if text:
+                abstract_parts.append(f"{label}: {text}" if label else text)
+
+        authors = []
+        for author in article.iterfind('AuthorList/Author'):
+            name = ' '.join(filter(None, (_text(author.find('ForeName')), _text(author.find('LastName')))))
+            name = name or _text(author.find('CollectiveName'))
+            if name:
+                authors.append({'name': name})
+
+        ids = {}
+        pubmed_data = element.find('PubmedData')
+        if pubmed_data is not None:
+            ids = {node.get('IdType'): _text(node) for node in pubmed_data.iterfind('ArticleIdList/ArticleId')}
+        doi = ids.get('doi') or next(
+            (_text(node) for node in article.iterfind('ELocationID') if node.get('EIdType') == 'doi'), ''
+        )
+
+        pub_date = article.find('Journal/JournalIssue/PubDate')
+        year_text = (_text(pub_date.find('Year')) or _text(pub_date.find('MedlineDate'))) if pub_date is not None else ''
+        year_text = year_text or _text(article.find('ArticleDate/Year'))
+        year_match = YEAR_PATTERN.search(year_text)
+
+        publication_types = [_text(node) for node in article.iterfind('PublicationTypeList/PublicationType')]
+
+        return {
+            'title': _text(article.find('ArticleTitle')),
+            'authors': authors,
+            'year': int(year_match.group(1)) if year_match else None,
+            'journal': _text(article.find('Journal/Title')),
+            'doi': doi,
+            'pmid': pmid,
+            'abstract': '\n'.join(abstract_parts),
+            'mesh_terms': [_text(node) for node in citation.iterfind('MeshHeadingList/MeshHeading/DescriptorName')],
+            'url': f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" if pmid else '',
+            'type': 'review' if 'Review' in publication_types else 'article',
+            # A PMC id means the full text is freely available there.
+            'open_access': bool(ids.get('pmc')),
+        }
 
 
 class PubMedClient(BaseClient):
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+    SOURCE = "pubmed"
+    RATE_LIMIT_PER_SECOND = 3
+    RATE_LIMIT_BURST = 3
+    EFETCH_BATCH_SIZE = 500
+
+    async def search(self, query: str, filters: Dict[str, Any], limit: int, offset: Offset = 0) -> Dict[str, Any]:
+        """One page of results. `next_offset` carries the history-server result set (WebEnv/query_key) and the
+        next retstart, so later pages are a single efetch; an expired result set falls back to a new esearch."""
+        try:
+            if isinstance(offset, dict):
+                try:
+                    page = await self._page(offset['history'], offset['count'], offset['start'], limit)
+                    if not page['articles']:
+                        raise LookupError("no records for the stored result set")
+                    return page
+                except Exception as e:
+                    print(f"PubMed history expired, searching again: {e}")
+                    offset = offset['start']
+            history, count = await self._esearch(query)
+            return await self._page(history, count, offset, limit)
+        except Exception as e:
+            print(f"PubMed error: {e}")
+            return self._failed(e)
 
-    async def search(self, query: str, filters: Dict[str, Any], limit: int) -> Dict[str, Any]:
-        search_params = {"db": "pubmed", "term": query, "retmode": "json", "retmax": min(limit, 100)}
+    async def _page(self, history: Dict[str, str], count: int, start: int, limit: int) -> Dict[str, Any]:
+        if start >= count:
+            return {'articles': [], 'next_offset': None}
+        articles = await self._efetch(history, start, min(limit, 100))
+        end = start + len(articles)
+        next_offset = {'history': history, 'count': count, 'start': end} if articles and end < count else None
+        return {'articles': articles, 'next_offset': next_offset}
 
+    async def iter_pages(self, query: str, filters: Dict[str, Any], max_results: Optional[int] = None,
+                         batch_size: int = EFETCH_BATCH_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield batches for every match of `query`, fetched from one history-server result set."""
         try:
-            search_response = await self.client.get(f"{self.BASE_URL}/esearch.fcgi", params=search_params)
-            search_response.raise_for_status()
-            search_data = search_response.json()
-            pmids = search_data.get('esearchresult', {}).get('idlist', [])
-            if not pmids: return {'articles': []}
-
-            summary_params = {"db": "pubmed", "id": ','.join(pmids), "retmode": "json"}
-            summary_response = await self.client.get(f"{self.BASE_URL}/esummary.fcgi", params=summary_params)
-            summary_response.raise_for_status()
-            summary_data = summary_response.json()
-
-            articles = []
-            for pmid in pmids:
-                article_data = summary_data.get('result', {}).get(pmid, {})
-                if article_data:
-                    article_data['pmid'] = pmid
-                    articles.append(self._normalize_article(self._extract(article_data)))
-            return {'articles': articles}
+            history, count = await self._esearch(query)
         except Exception as e:
             print(f"PubMed error: {e}")
-            return {'articles': []}
+            return
+        async for batch in self._iter_history(history, min(count, max_results or count), batch_size):
+            yield batch
 
-    def _extract(self, raw: Dict) -> Dict:
-        authors = raw.get('authors', [])
-        normalized_authors = []
-        for author in authors:
-            if isinstance(author, dict):
-                normalized_authors.append({'name': author.get('name', '')})
-            elif isinstance(author, str):
-                normalized_authors.append({'name': author})
+    async def iter_pmids(self, pmids: List[str], batch_size: int = EFETCH_BATCH_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield batches for known PMIDs, posted once with epost instead of sending ids on every request."""
+        if not pmids:
+            return
+        try:
+            response = await self._request("POST", f"{self.BASE_URL}/epost.fcgi", data={"db": "pubmed", "id": ','.join(pmids)})
+            root = fromstring(response.content)
+            history = {"WebEnv": root.findtext('WebEnv', ''), "query_key": root.findtext('QueryKey', '')}
+        except Exception as e:
+            print(f"PubMed error: {e}")
+            return
+        async for batch in self._iter_history(history, len(pmids), batch_size):
+            yield batch
 
-        return {
-            'title': raw.get('title') or '',
-            'authors': normalized_authors,
-            'year': int(raw.get('pubdate', '').split()[0]) if raw.get('pubdate') else None,
-            'journal': raw.get('source') or '',
-            'pmid': raw.get('pmid') or '',
-            'url': f"https://pubmed.ncbi.nlm.nih.gov/{raw.get('pmid')}/" if raw.get('pmid') else '',
-            'open_access': False
-        }
+    async def _iter_history(self, history: Dict[str, str], total: int, batch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        for start in range(0, total, batch_size):
+            try:
+                batch = await self._efetch(history, start, min(batch_size, total - start))
+            except Exception as e:
+                print(f"PubMed error: {e}")
+                return
+            if not batch:
+                return
+            yield batch
+
+    async def _esearch(self, query: str) -> Tuple[Dict[str, str], int]:
+        params = {"db": "pubmed", "term": query, "retmode": "json", "retmax": 0, "usehistory": "y"}
+        response = await self._get(f"{self.BASE_URL}/esearch.fcgi", params=params)
+        result = self._json(response).get('esearchresult', {})
+        history = {"WebEnv": result.get('webenv', ''), "query_key": result.get('querykey', '')}
+        return history, int(result.get('count') or 0)
+
+    async def _efetch(self, history: Dict[str, str], retstart: int, retmax: int) -> List[Dict[str, Any]]:
+        params = {"db": "pubmed", "retmode": "xml", "rettype": "abstract", "retstart": retstart, "retmax": retmax, **history}
+        parser = PubmedXMLParser()
+        articles = []
+        async with self._stream("GET", f"{self.BASE_URL}/efetch.fcgi", params=params) as response:
+            async for chunk in response.aiter_bytes():
+                articles.extend(self._normalize(record) for record in parser.feed(chunk) if record)
+        parser.close()
+        return articles
+
+    def _normalize(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        article = self._normalize_article(record)
+        article['mesh_terms'] = record['mesh_terms']
+        return article
@@ -0,0 +1,166 @@
+"""Rate limiting, retry and circuit breaking for upstream API clients"""
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from app.core.redis import get_redis
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, source: str, retry_in: float):
+        super().__init__(f"{source} circuit open, retry in {retry_in:.0f}s")
+        self.source = source
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """Token bucket shared across workers through Redis, with an in-process fallback."""
+
+    # KEYS[1] bucket key; ARGV: rate, burst, now (ms). Returns ms to wait (0 when a token was taken).
+    LUA = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return wait
+"""
+    REDIS_RETRY_SECONDS = 30
+
+    def __init__(self, source: str, rate: float, burst: int = 1):
+        self.source = source
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._script = None
+        self._redis_down_until = 0.0
+
+    async def acquire(self, max_wait: float = 30.0) -> None:
+        waited = 0.0
+        while True:
+            delay = await self._take()
+            if delay <= 0:
+                return
+            if waited + delay > max_wait:
+                raise TimeoutError(f"{self.source} rate limit wait exceeded {max_wait}s")
+            await asyncio.sleep(delay)
+            waited += delay
+
+    async def _take(self) -> float:
+        redis = get_redis() if time.time() >= self._redis_down_until else None
+        if redis is not None:
+            try:
+                if self._script is None:
+                    self._script = redis.register_script(self.LUA)
+                wait_ms = await self._script(keys=[f"ratelimit:{self.source}"], args=[self.rate, self.burst, int(time.time() * 1000)])
+                return int(wait_ms) / 1000
+            except Exception as e:
+                print(f"{self.source} rate limiter Redis error: {e}")
+                self._redis_down_until = time.time() + self.REDIS_RETRY_SECONDS
+        return await self._take_local()
+
+    async def _take_local(self) -> float:
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets a single probe through once the cool-down elapses."""
+
+    def __init__(self, source: str, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.source = source
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return 'half_open'
+        return 'open'
+
+    def check(self) -> bool:
+        """Raise CircuitOpenError unless the call may go through; True when it is the half-open probe."""
+        state = self.state
+        if state == 'open' or (state == 'half_open' and self._probing):
+            raise CircuitOpenError(self.source, max(self.cooldown - (time.monotonic() - self.opened_at), 0))
+        if state == 'half_open':
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def release(self) -> None:
+        """End a probe that recorded no outcome (cancelled, rate-limit wait exceeded, unexpected error), so it
+        does not keep the circuit shut for good; the next call probes again."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            print(f"{self.source} circuit opened for {self.cooldown:.0f}s after {self.failures} failures")
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except Exception:
+        return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_bucket(source: str, rate: float, burst: int) -> TokenBucket:
+    if source not in _buckets:
+        _buckets[source] = TokenBucket(source, rate, burst)
+    return _buckets[source]
+
+
+def get_breaker(source: str, failure_threshold: int, cooldown: float) -> CircuitBreaker:
+    if source not in _breakers:
+        _breakers[source] = CircuitBreaker(source, failure_threshold, cooldown)
+    return _breakers[source]
@@ -1,32 +1,44 @@
 """Semantic Scholar API client"""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from app.api_clients.base import BaseClient
 
 
 class SemanticScholarClient(BaseClient):
     BASE_URL = "https://api.semanticscholar.org/graph/v1"
+    SOURCE = "semantic_scholar"
+    RATE_LIMIT_PER_SECOND = 1
+    RATE_LIMIT_BURST = 1
+    BATCH_SIZE = 500
+    BATCH_FIELDS = "title,abstract,authors,year,venue,citationCount,openAccessPdf,externalIds,url,tldr"
 
     def __init__(self, api_key: Optional[str] = None, timeout: int = 30):
         super().__init__(api_key, timeout)
         self.headers = {"Accept": "application/json"}
         if api_key: self.headers["x-api-key"] = api_key
 
-    async def search(self, query: str, filters: Dict[str, Any], limit: int) -> Dict[str, Any]:
+    async def search(self, query: str, filters: Dict[str, Any], limit: int, offset: int = 0) -> Dict[str, Any]:
         params = {
-            "query": query, "limit": min(limit, 100),
+            "query": query, "limit": min(limit, 100), "offset": offset,
             "fields": "paperId,title,abstract,authors,year,venue,citationCount,openAccessPdf,externalIds,url,publicationDate"
         }
 
         try:
-            response = await self.client.get(f"{self.BASE_URL}/paper/search", params=params, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
+            response = await self._get(f"{self.BASE_URL}/paper/search", params=params, headers=self.headers)
+            data = self._json(response)
             articles = [self._normalize_article(self._extract(paper)) for paper in data.get('data', [])]
             return {'articles': articles}
         except Exception as e:
             print(f"Semantic Scholar error: {e}")
-            return {'articles': []}
+            return self._failed(e)
+
+    async def batch(self, ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Look up to BATCH_SIZE papers by id ("DOI:...", "PMID:..."); the result is aligned with ids, None where unknown."""
+        response = await self._request(
+            "POST", f"{self.BASE_URL}/paper/batch", params={"fields": self.BATCH_FIELDS},
+            json={"ids": ids[:self.BATCH_SIZE]}, headers=self.headers
+        )
+        return [self._extract(paper) if paper else None for paper in self._json(response)]
 
     def _extract(self, raw: Dict) -> Dict:
         return {
@@ -0,0 +1,81 @@
+"""Shared pooled HTTP transport for academic API clients"""
+
+import asyncio
+from typing import Iterable, Optional
+
+import httpx
+
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency, falls back to HTTP/1.1
+    HTTP2_AVAILABLE = False
+
+_client: Optional[httpx.AsyncClient] = None
+_origins: list = []
+
+
+def _origin(url: str) -> str:
+    parsed = httpx.URL(url)
+    return f"{parsed.scheme}://{parsed.host}"
+
+
+def _host_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_PER_HOST,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+def _build_client(origins: Iterable[str]) -> httpx.AsyncClient:
+    http2 = settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+    # One transport (and therefore one connection pool) per upstream host gives per-host limits.
+    mounts = {origin: httpx.AsyncHTTPTransport(http2=http2, limits=_host_limits()) for origin in origins}
+    return httpx.AsyncClient(
+        timeout=settings.HTTP_TIMEOUT_SECONDS,
+        http2=http2,
+        limits=_host_limits(),
+        mounts=mounts,
+        follow_redirects=True,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = _build_client(_origins)
+    return _client
+
+
+async def init_transport(base_urls: Iterable[str]) -> None:
+    global _client, _origins
+    _origins = sorted({_origin(url) for url in base_urls})
+    if _client is not None:
+        await _client.aclose()
+    _client = _build_client(_origins)
+    if settings.HTTP_WARMUP_ON_STARTUP:
+        await warm_up()
+
+
+async def warm_up() -> None:
+    """Resolve DNS and complete TLS handshakes so the first searches reuse pooled connections."""
+    client = get_http_client()
+
+    async def touch(origin: str):
+        try:
+            await client.head(origin, timeout=settings.HTTP_WARMUP_TIMEOUT_SECONDS)
+        except Exception as e:
+            print(f"HTTP warm-up failed for {origin}: {e}")
+
+    await asyncio.gather(*(touch(origin) for origin in _origins))
+
+
+async def close_transport() -> None:
+    global _client
+    if _client is None:
+        return
+    await _client.aclose()
+    _client = None
@@ -1,7 +1,7 @@
 """Application configuration"""
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 from functools import lru_cache
 from pathlib import Path
 
@@ -19,6 +19,82 @@ class Settings(BaseSettings):
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    
+    # Search cache
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_TTL_SECONDS: int = 900
+    SEARCH_CACHE_STALE_SECONDS: int = 3600
+    SEARCH_CACHE_LRU_SIZE: int = 512
+    SEARCH_SNAPSHOT_TTL_SECONDS: int = 1800
+    SEARCH_SNAPSHOT_MAX_ARTICLES: int = 1000
+    SEARCH_SNAPSHOT_SOURCE_MISSES: int = 2
+    
+    # Search fan-out budget (seconds, 0 disables); per-source overrides e.g. {"core": 1.0}
+    SEARCH_DEADLINE_SECONDS: float = 1.5
+    SEARCH_SOURCE_DEADLINES: Dict[str, float] = {}
+    
+    # Coalescing of identical in-flight searches; the Redis lock extends it across workers
+    SEARCH_COALESCE_ENABLED: bool = True
+    SEARCH_COALESCE_REDIS_LOCK: bool = False
+    SEARCH_COALESCE_LOCK_TTL_SECONDS: float = 10.0
+    SEARCH_COALESCE_WAIT_SECONDS: float = 5.0
+    
+    # Local full-text index (papers table, or in-process when DISABLE_DB)
+    LOCAL_INDEX_ENABLED: bool = True
+    LOCAL_INDEX_MAX_AGE_DAYS: int = 30
+    LOCAL_INDEX_MAX_HITS: int = 200
+    LOCAL_INDEX_MAX_DOCS: int = 50000
+    LOCAL_INDEX_MAX_QUERIES: int = 10000
+    
+    # Enrichment of articles missing an abstract or citation count (batched S2/OpenAlex lookups)
+    ENRICHMENT_ENABLED: bool = True
+    ENRICHMENT_TIMEOUT_SECONDS: float = 1.5
+    ENRICHMENT_CONCURRENCY: int = 4
+    ENRICHMENT_CACHE_SIZE: int = 20000
+    ENRICHMENT_CACHE_TTL_SECONDS: int = 86400
+    
+    # Adaptive per-source fetch sizing from rolling latency, unique-yield and error stats
+    SOURCE_STATS_ADAPTIVE: bool = True
+    SOURCE_STATS_WINDOW: int = 200
+    SOURCE_STATS_MIN_SAMPLES: int = 20
+    SOURCE_STATS_MIN_FETCH: int = 5
+    SOURCE_STATS_TARGET_YIELD: float = 0.3
+    SOURCE_STATS_SKIP_YIELD: float = 0.02
+    SOURCE_STATS_SKIP_ERROR_RATE: float = 0.5
+    SOURCE_STATS_EXPLORE_RATE: float = 0.1
+    
+    # Query autocomplete (logged queries + paper title n-grams)
+    SUGGEST_REBUILD_SECONDS: float = 30.0
+    SUGGEST_MAX_TERMS: int = 200000
+    SUGGEST_MAX_TITLES: int = 100000
+    SUGGEST_QUERY_WEIGHT: float = 5.0
+    
+    # Upstream HTTP transport
+    HTTP2_ENABLED: bool = True
+    HTTP_TIMEOUT_SECONDS: float = 30.0
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 20
+    HTTP_MAX_KEEPALIVE_PER_HOST: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    HTTP_WARMUP_ON_STARTUP: bool = True
+    HTTP_WARMUP_TIMEOUT_SECONDS: float = 3.0
+    
+    # Upstream HTTP response cache; per-source freshness overrides in seconds e.g. {"crossref": 3600}
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_TTLS: Dict[str, float] = {}
+    HTTP_CACHE_STALE_SECONDS: int = 86400
+    HTTP_CACHE_MEMORY_SIZE: int = 128
+    HTTP_CACHE_MAX_BYTES: int = 1_000_000
+    
+    # Upstream resilience; per-source requests/second overrides e.g. {"semantic_scholar": 1.0}
+    UPSTREAM_RATE_LIMITS: Dict[str, float] = {}
+    UPSTREAM_RATE_LIMIT_MAX_WAIT_SECONDS: float = 10.0
+    UPSTREAM_MAX_RETRIES: int = 2
+    UPSTREAM_RETRY_BASE_SECONDS: float = 0.25
+    UPSTREAM_RETRY_MAX_SECONDS: float = 4.0
+    UPSTREAM_MAX_RETRY_AFTER_SECONDS: float = 10.0
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_COOLDOWN_SECONDS: float = 30.0
     
     # LLM
     OPENAI_API_KEY: str = ""
@@ -30,11 +106,42 @@ class Settings(BaseSettings):
     THESYS_MODEL: str = "c1/openai/gpt-5/v-20251230"
     LLM_MODEL: str = "gpt-4-turbo-preview"
     LLM_MAX_TOKENS: int = 4000
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 2592000
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+    LLM_CACHE_LRU_SIZE: int = 256
+    LLM_TOKENIZER_ENCODING: str = "cl100k_base"
+    LLM_TOKENIZER_RETRY_SECONDS: int = 300
+    LLM_PROMPT_MAX_TOKENS: int = 12000
+    LLM_MAP_REDUCE_MIN_ARTICLES: int = 12
+    LLM_MAP_CHUNK_TOKENS: int = 3000
+    LLM_MAP_CONCURRENCY: int = 8
+    LLM_BATCH_CONCURRENCY: int = 4
+    LLM_BATCH_MAX_ARTICLES: int = 25
+    ASK_CACHE_ENABLED: bool = True
+    ASK_CACHE_MODEL: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    ASK_CACHE_SIMILARITY: float = 0.9
+    ASK_CACHE_MAX_PER_ARTICLE: int = 32
+    ASK_CACHE_MAX_ARTICLES: int = 2048
+    ASK_CACHE_TTL_SECONDS: int = 604800
+    ASK_CACHE_MODEL_RETRY_SECONDS: int = 300
     
     # Thesys
     THESYS_API_KEY: str = ""
     THESYS_BASE_URL: str = "https://api.thesys.dev/v1/embed"
     THESYS_MODEL: str = "c1/openai/gpt-5/v-20251230"
+    THESYS_CONTEXT_TOKENS: int = 2000
+    THESYS_CONTEXT_MAX_ARTICLES: int = 20
+    THESYS_SNIPPET_TOKENS: int = 180
+    THESYS_HISTORY_TOKENS: int = 2000
+    THESYS_SNIPPET_CACHE_SIZE: int = 4096
+    
+    # Background jobs
+    JOB_BACKEND: str = "local"
+    JOB_LOCAL_CONCURRENCY: int = 4
+    JOB_TTL_SECONDS: int = 86400
+    JOB_CANCEL_POLL_SECONDS: float = 1.0
+    CELERY_BROKER_URL: str = ""
     
     # API Keys
     OPENALEX_API_KEY: str = ""
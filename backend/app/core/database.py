@@ -2,6 +2,7 @@
 
 from typing import AsyncGenerator, Optional
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
@@ -16,6 +17,12 @@ if not settings.DISABLE_DB:
 
 Base = declarative_base()
 
+# Idempotent column additions for mapped columns newer than existing databases; every Paper query selects them,
+# so they are applied on startup. Slow DDL such as indexes stays in backend/sql.
+SCHEMA_UPDATES = [
+    "ALTER TABLE papers ADD COLUMN IF NOT EXISTS summary_language VARCHAR(10)",
+]
+
 
 async def get_db() -> AsyncGenerator[Optional[AsyncSession], None]:
     if settings.DISABLE_DB or AsyncSessionLocal is None:
@@ -37,6 +44,12 @@ async def init_db():
         return
     async with async_engine.connect() as conn:
         print("✅ Database connected")
+    try:
+        async with async_engine.begin() as conn:
+            for statement in SCHEMA_UPDATES:
+                await conn.execute(text(statement))
+    except Exception as e:
+        print(f"⚠️ Schema update failed: {e}")
 
 
 async def close_db():
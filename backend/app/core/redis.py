@@ -0,0 +1,29 @@
+"""Shared Redis connection"""
+
+from typing import Optional
+
+from app.core.config import settings
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_IMPORT_ERROR = None
+except Exception as exc:  # pragma: no cover - optional dependency in local mode
+    aioredis = None
+    REDIS_IMPORT_ERROR = str(exc)
+
+_redis = None
+
+
+def get_redis() -> Optional["aioredis.Redis"]:
+    global _redis
+    if _redis is None and aioredis and settings.REDIS_URL:
+        _redis = aioredis.from_url(settings.REDIS_URL, socket_timeout=settings.REDIS_SOCKET_TIMEOUT, socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT)
+    return _redis
+
+
+async def close_redis():
+    global _redis
+    if _redis is None:
+        return
+    await _redis.close()
+    _redis = None
@@ -0,0 +1,62 @@
+"""JSON serialization - orjson when available, stdlib json otherwise"""
+
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict
+
+from fastapi.responses import JSONResponse, StreamingResponse
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+    ORJSONResponse = None
+
+DefaultResponse = ORJSONResponse or JSONResponse
+
+# Streamed responses must reach the client as they are written: no caching, no proxy (nginx) buffering.
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# Packed payloads start with this marker; anything else is read as plain JSON.
+PACKED_MARKER = b"\x00z"
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def loads(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def pack(obj: Any, level: int = 1) -> bytes:
+    """Compact binary form for cache storage: compressed JSON behind a two-byte marker."""
+    return PACKED_MARKER + zlib.compress(dumps(obj), level)
+
+
+def unpack(data: bytes) -> Any:
+    if data[:2] == PACKED_MARKER:
+        return loads(zlib.decompress(data[2:]))
+    return loads(data)
+
+
+def sse(event: str, data: Any) -> bytes:
+    """One Server-Sent Events frame; compact JSON never spans lines, so a single data field suffices."""
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def event_stream(events: AsyncIterator[Dict], error_prefix: str) -> StreamingResponse:
+    """SSE response for dict events named by their 'event' key; a failure mid-stream ends it with an 'error' frame."""
+    async def frames():
+        try:
+            async for event in events:
+                yield sse(event.pop("event"), event)
+        except Exception as exc:
+            yield sse("error", {"detail": f"{error_prefix}: {exc}"})
+
+    return StreamingResponse(frames(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -1,7 +1,7 @@
 """Paper model"""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, Index, literal_column
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy import Float
@@ -9,6 +9,13 @@ from sqlalchemy import Float
 from app.core.database import Base
 
 
+def _search_vector(title, abstract):
+    document = func.coalesce(title, literal_column("''")).concat(literal_column("' '")).concat(
+        func.coalesce(abstract, literal_column("''"))
+    )
+    return func.to_tsvector(literal_column("'simple'::regconfig"), document)
+
+
 class Paper(Base):
     __tablename__ = "papers"
 
@@ -35,8 +42,13 @@ class Paper(Base):
     results = Column(Text)
     limitations = Column(Text)
     practical_implications = Column(Text)
+    summary_language = Column(String(10))  # set only when `summary` holds a quick summary (see paper_summaries)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_papers_search_vector", _search_vector(title, abstract), postgresql_using="gin"),
+    )
+
     def to_dict(self, include_abstract=True):
         result = {
             "id": self.id, "doi": self.doi, "pmid": self.pmid,
@@ -48,4 +60,10 @@ class Paper(Base):
         }
         if include_abstract and self.abstract:
             result["abstract"] = self.abstract
-        return result
\ No newline at end of file
+        return result
+
+
+
+def paper_search_vector():
+    """tsvector over title and abstract; queries must use this exact expression to hit the GIN index."""
+    return _search_vector(Paper.title, Paper.abstract)
@@ -38,6 +38,7 @@ class SearchRequest(BaseModel):
     limit: int = Field(default=20, ge=1, le=100)
     offset: int = Field(default=0, ge=0)
     sort_by: Literal['relevance', 'recency', 'citations'] = 'relevance'
+    cursor: Optional[str] = None
 
 
 class SearchResponse(BaseModel):
@@ -45,7 +46,10 @@ class SearchResponse(BaseModel):
     total: int
     results: List[ArticleResponse]
     sources_used: List[str]
+    sources_timed_out: List[str] = []
+    sources_failed: List[str] = []
     cached: bool = False
+    next_cursor: Optional[str] = None
     search_time_ms: Optional[float] = None
 
 
@@ -153,6 +157,11 @@ class LLMQuickSummaryResponse(BaseModel):
     raw: str
 
 
+class LLMBatchQuickSummaryRequest(BaseModel):
+    articles: List[LLMArticleInput]
+    language: str = "pt-BR"
+
+
 class LLMAskArticleRequest(BaseModel):
     article: LLMArticleInput
     question: str
@@ -216,3 +225,25 @@ class ThesysChatRequest(BaseModel):
 class ThesysChatResponse(BaseModel):
     c1_response: str
     model: str
+
+
+class JobSubmitRequest(BaseModel):
+    kind: Literal['llm.synthesize', 'summary.collection', 'export']
+    payload: Dict[str, Any] = {}
+
+
+class JobStatusResponse(BaseModel):
+    id: str
+    kind: str
+    status: Literal['queued', 'running', 'succeeded', 'failed', 'cancelled']
+    progress: float = 0.0
+    message: str = ""
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class JobResultResponse(BaseModel):
+    id: str
+    kind: str
+    result: Any
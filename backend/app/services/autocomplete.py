@@ -0,0 +1,195 @@
+"""Query autocomplete - weighted prefix index over logged queries and paper title n-grams"""
+
+import asyncio
+import heapq
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis import get_redis
+from app.models.paper import Paper
+from app.services.ranking import STOPWORDS, fold
+
+SEED_TERMS = ["machine learning", "artificial intelligence", "psychomotor", "child development", "autism", "motor skills", "sensory integration"]
+MAX_QUERY_LENGTH = 100
+
+
+def normalize_query(text: Optional[str]) -> str:
+    return ' '.join(fold(text).split())
+
+
+def title_ngrams(title: Optional[str], max_words: int = 3) -> Iterable[str]:
+    """Distinct 1..max_words grams that neither start nor end with a stopword or a bare number."""
+    words = fold(title).split()
+    grams = set()
+    for start, word in enumerate(words):
+        if word in STOPWORDS or word.isdigit() or len(word) < 2:
+            continue
+        for end in range(start + 1, min(start + max_words, len(words)) + 1):
+            last = words[end - 1]
+            if last not in STOPWORDS and not last.isdigit():
+                grams.add(' '.join(words[start:end]))
+    return grams
+
+
+class SuggestionIndex:
+    """Immutable snapshot: terms sorted for prefix ranges, with top-k lists precomputed for short prefixes.
+
+    Short prefixes match the most terms, so their answers are looked up directly; longer prefixes select from a
+    narrow bisect range. Both stay well under a millisecond.
+    """
+
+    def __init__(self, weights: Dict[str, float], max_terms: int = 200000, k: int = 10, depth: int = 3):
+        items = weights.items()
+        if len(weights) > max_terms:
+            items = heapq.nlargest(max_terms, items, key=lambda item: item[1])
+        items = sorted(items)
+        self.terms: List[str] = [term for term, _ in items]
+        self.weights = np.fromiter((weight for _, weight in items), dtype=np.float32, count=len(items))
+        self.k = k
+        self.depth = depth
+
+        self.top: Dict[str, List[int]] = {}
+        for index in np.argsort(-self.weights, kind='stable').tolist():
+            term = self.terms[index]
+            for length in range(1, min(depth, len(term)) + 1):
+                best = self.top.setdefault(term[:length], [])
+                if len(best) < k:
+                    best.append(index)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def lookup(self, prefix: str, limit: int = 10) -> List[str]:
+        prefix = normalize_query(prefix)
+        if not prefix or limit <= 0:
+            return []
+        if len(prefix) <= self.depth and limit <= self.k:
+            return [self.terms[i] for i in self.top.get(prefix, ())[:limit]]
+
+        lo = bisect_left(self.terms, prefix)
+        hi = bisect_left(self.terms, prefix + '\uffff', lo)
+        if hi - lo > limit:
+            candidates = lo + np.argpartition(-self.weights[lo:hi], limit - 1)[:limit]
+        else:
+            candidates = np.arange(lo, hi)
+        order = sorted(candidates.tolist(), key=lambda i: (-self.weights[i], self.terms[i]))
+        return [self.terms[i] for i in order]
+
+
+class SuggestionEngine:
+    """Accumulates weights as queries are logged and swaps in a rebuilt SuggestionIndex off the event loop.
+
+    Logged query counts are shared between workers through a Redis hash, re-read on every rebuild tick so queries
+    logged by other workers reach this one's index too; title n-grams come from the papers table.
+    """
+
+    REDIS_KEY = "suggest:queries"
+
+    def __init__(self):
+        self.weights: Counter = Counter({term: 1.0 for term in SEED_TERMS})
+        self.index = SuggestionIndex(self.weights)
+        self._pending: Counter = Counter()
+        # Per-term query counts already reflected in `weights`: the Redis counts last loaded plus our own flushes.
+        self._synced: Counter = Counter()
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        return self.index.lookup(prefix, limit)
+
+    def record_query(self, query: str) -> None:
+        term = normalize_query(query)
+        if 2 <= len(term) <= MAX_QUERY_LENGTH:
+            self.weights[term] += settings.SUGGEST_QUERY_WEIGHT
+            self._pending[term] += 1
+            self._dirty = True
+
+    def add_titles(self, titles: Iterable[Optional[str]]) -> None:
+        for title in titles:
+            self.weights.update(title_ngrams(title))
+        self._dirty = True
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self._flush_queries()
+
+    async def rebuild(self) -> None:
+        self._dirty = False
+        if len(self.weights) > 4 * settings.SUGGEST_MAX_TERMS:
+            self.weights = Counter(dict(self.weights.most_common(2 * settings.SUGGEST_MAX_TERMS)))
+        weights = dict(self.weights)
+        self.index = await asyncio.to_thread(SuggestionIndex, weights, settings.SUGGEST_MAX_TERMS)
+
+    async def _run(self) -> None:
+        await self._load_queries()
+        await self._load_titles()
+        await self.rebuild()
+        while True:
+            await asyncio.sleep(settings.SUGGEST_REBUILD_SECONDS)
+            try:
+                await self._flush_queries()
+                await self._load_queries()
+                if self._dirty:
+                    await self.rebuild()
+            except Exception as e:
+                print(f"Suggestion index error: {e}")
+
+    async def _load_queries(self) -> None:
+        """Add the query counts logged (by any worker) since the last load."""
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            async for term, count in redis.hscan_iter(self.REDIS_KEY, count=1000):
+                term, count = term.decode(), int(count)
+                added = count - self._synced[term]
+                if added:
+                    # A smaller count means the hash was reset; take it as the new baseline.
+                    self._synced[term] = count
+                if added > 0:
+                    self.weights[term] += added * settings.SUGGEST_QUERY_WEIGHT
+                    self._dirty = True
+        except Exception as e:
+            print(f"Suggestion query load error: {e}")
+
+    async def _load_titles(self) -> None:
+        if settings.DISABLE_DB or AsyncSessionLocal is None:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.stream(select(Paper.title).limit(settings.SUGGEST_MAX_TITLES))
+                # Titles arrive in chunks, so the full title list is never held at once.
+                async for rows in result.partitions(1000):
+                    self.add_titles(title for (title,) in rows)
+        except Exception as e:
+            print(f"Suggestion title load error: {e}")
+
+    async def _flush_queries(self) -> None:
+        pending, self._pending = self._pending, Counter()
+        redis = get_redis()
+        if not pending or redis is None:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for term, count in pending.items():
+                    pipe.hincrby(self.REDIS_KEY, term, count)
+                await pipe.execute()
+            # Already in `weights` since record_query, so the next load must not count them again.
+            self._synced.update(pending)
+        except Exception as e:
+            print(f"Suggestion query flush error: {e}")
+
+
+suggestion_engine = SuggestionEngine()
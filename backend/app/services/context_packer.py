@@ -0,0 +1,83 @@
+"""Chat context packing - the articles most relevant to the prompt, within a token budget"""
+
+import hashlib
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.schemas import LLMArticleInput, ThesysChatMessage
+from app.services.ranking import BM25FRanker, fold
+from app.services.search_cache import LRUCache
+from app.services.tokens import count_tokens, truncate_tokens
+
+# Allowance for the "N. " list prefix added when a snippet is rendered.
+PREFIX_TOKENS = 2
+
+
+class ContextPacker:
+    """Ranks results and saved articles together by BM25F against the prompt and packs snippets until the budget is spent.
+
+    Scoring is relevance only, with the given order (the search ranking) breaking ties, so a prompt that matches
+    nothing keeps the original order. Snippets and their token counts are memoized per article content.
+    """
+
+    def __init__(self, budget: Optional[int] = None, max_articles: Optional[int] = None, snippet_tokens: Optional[int] = None):
+        self.budget = budget or settings.THESYS_CONTEXT_TOKENS
+        self.max_articles = max_articles or settings.THESYS_CONTEXT_MAX_ARTICLES
+        self.snippet_tokens = snippet_tokens or settings.THESYS_SNIPPET_TOKENS
+        self.ranker = BM25FRanker(recency_weight=0.0, citation_weight=0.0)
+        self.snippets = LRUCache(settings.THESYS_SNIPPET_CACHE_SIZE)
+
+    def pack(self, query: str, results: List[LLMArticleInput], saved_articles: List[LLMArticleInput]) -> Tuple[List[str], List[str]]:
+        """Snippets chosen from `results` and from `saved_articles`, each list in relevance order."""
+        candidates, seen = [], set()
+        for section, articles in ((0, results), (1, saved_articles)):
+            for article in articles:
+                identity = (article.doi or '').lower() or fold(article.title)
+                if identity not in seen:
+                    seen.add(identity)
+                    candidates.append((section, article))
+        if not candidates:
+            return [], []
+
+        docs = [{'title': article.title, 'abstract': article.abstract, 'index': i} for i, (_, article) in enumerate(candidates)]
+        packed: Tuple[List[str], List[str]] = ([], [])
+        remaining = self.budget
+        for doc in self.ranker.rank(docs, 'relevance', query):
+            section, article = candidates[doc['index']]
+            snippet, tokens = self.snippet(article)
+            if tokens + PREFIX_TOKENS > remaining:
+                continue
+            packed[section].append(snippet)
+            remaining -= tokens + PREFIX_TOKENS
+            if len(packed[0]) + len(packed[1]) >= self.max_articles:
+                break
+        return packed
+
+    def snippet(self, article: LLMArticleInput) -> Tuple[str, int]:
+        key = hashlib.sha1(dumps([article.title, article.authors, article.year, article.journal, article.doi, article.abstract])).hexdigest()
+        cached = self.snippets.get(key)
+        if cached is not None:
+            return cached
+        text = (
+            f"{article.title} | "
+            f"authors={', '.join(article.authors) if article.authors else 'N/A'} | "
+            f"year={article.year or 'N/A'} | "
+            f"journal={article.journal or 'N/A'} | "
+            f"doi={article.doi or 'N/A'} | "
+            f"abstract={truncate_tokens(article.abstract or 'N/A', self.snippet_tokens)}"
+        )
+        entry = (text, count_tokens(text))
+        self.snippets.set(key, entry)
+        return entry
+
+    def history(self, history: List[ThesysChatMessage], budget: Optional[int] = None, max_turns: int = 10) -> List[ThesysChatMessage]:
+        """The most recent turns that fit the history budget, oldest first."""
+        remaining = budget or settings.THESYS_HISTORY_TOKENS
+        kept = []
+        for message in reversed(history[-max_turns:]):
+            remaining -= count_tokens(message.content)
+            if remaining < 0:
+                break
+            kept.append(message)
+        return kept[::-1]
@@ -0,0 +1,132 @@
+"""Metadata enrichment - fills missing abstracts and citation counts with batched lookups"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.record_linkage import article_identifiers, normalize_doi
+from app.services.search_cache import LRUCache
+
+
+class MetadataEnricher:
+    """Resolves deduplicated articles lacking an abstract or citation count by DOI/PMID.
+
+    Lookups go out as a handful of batch requests (Semantic Scholar /paper/batch, OpenAlex doi filter)
+    under a semaphore. Callers pass the time they can spare; lookups still running then finish in the background
+    (up to ENRICHMENT_TIMEOUT_SECONDS) so their results, including misses, are cached for the next request.
+    """
+
+    def __init__(self, semantic_scholar=None, openalex=None):
+        self.semantic_scholar = semantic_scholar
+        self.openalex = openalex
+        self.cache = LRUCache(settings.ENRICHMENT_CACHE_SIZE)
+        self.semaphore = asyncio.Semaphore(settings.ENRICHMENT_CONCURRENCY)
+        self._background = set()
+
+    async def enrich(self, articles: List[Dict[str, Any]], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        if not settings.ENRICHMENT_ENABLED:
+            return articles
+
+        wanted: Dict[str, List[Dict[str, Any]]] = {}
+        for article in articles:
+            if article.get('abstract') and article.get('citation_count'):
+                continue
+            ids = article_identifiers(article)
+            keys = [key for key in (f"doi:{ids['doi']}" if ids['doi'] else '', f"pmid:{ids['pmid']}" if ids['pmid'] else '') if key]
+            meta = next((hit for hit in map(self._cached, keys) if hit is not None), None)
+            if meta is not None:
+                self._apply(article, meta)
+            elif keys:
+                wanted.setdefault(keys[0], []).append(article)
+
+        if wanted:
+            budget = settings.ENRICHMENT_TIMEOUT_SECONDS if timeout is None else min(max(timeout, 0.0), settings.ENRICHMENT_TIMEOUT_SECONDS)
+            found = await self._lookup(list(wanted), budget)
+            for key, group in wanted.items():
+                for article in group:
+                    self._apply(article, found.get(key) or {})
+        return articles
+
+    async def _lookup(self, keys: List[str], budget: float) -> Dict[str, Dict[str, Any]]:
+        found: Dict[str, Dict[str, Any]] = {}
+        jobs = []
+        if self.semantic_scholar:
+            size = self.semantic_scholar.BATCH_SIZE
+            jobs += [self._semantic_scholar_batch(keys[i:i + size], found) for i in range(0, len(keys), size)]
+        dois = [key for key in keys if key.startswith('doi:')]
+        if self.openalex and dois:
+            size = self.openalex.MAX_FILTER_VALUES
+            jobs += [self._openalex_batch(dois[i:i + size], found) for i in range(0, len(dois), size)]
+        if not jobs:
+            return found
+
+        tasks = [asyncio.create_task(job) for job in jobs]
+        _, pending = await asyncio.wait(tasks, timeout=budget) if budget > 0 else (set(), set(tasks))
+        if not pending:
+            self._remember(keys, found, tasks)
+            return found
+
+        task = asyncio.create_task(self._finish(keys, found, tasks, settings.ENRICHMENT_TIMEOUT_SECONDS - budget))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        # Late batches keep writing into `found`; the caller gets what had arrived within its budget.
+        return dict(found)
+
+    async def _finish(self, keys: List[str], found: Dict[str, Dict[str, Any]], tasks: List[asyncio.Task], timeout: float) -> None:
+        _, pending = await asyncio.wait(tasks, timeout=max(timeout, 0.0))
+        for task in pending:
+            task.cancel()
+        self._remember(keys, found, tasks)
+
+    def _remember(self, keys: List[str], found: Dict[str, Dict[str, Any]], tasks: List[asyncio.Task]) -> None:
+        finished = [task for task in tasks if task.done() and not task.cancelled()]
+        failures = [task.exception() for task in finished if task.exception() is not None]
+        for exc in failures:
+            print(f"Enrichment error: {exc}")
+        complete = len(finished) == len(tasks) and not failures
+
+        now = time.time()
+        for key in keys:
+            # Misses are only remembered when every batch answered; otherwise the next search retries them.
+            if key in found or complete:
+                self.cache.set(key, (now, found.get(key, {})))
+
+    async def _semantic_scholar_batch(self, keys: List[str], found: Dict[str, Dict[str, Any]]) -> None:
+        ids = [("DOI:" if key.startswith('doi:') else "PMID:") + key.split(':', 1)[1] for key in keys]
+        async with self.semaphore:
+            papers = await self.semantic_scholar.batch(ids)
+        for key, paper in zip(keys, papers):
+            if paper:
+                self._merge(found, key, paper)
+
+    async def _openalex_batch(self, keys: List[str], found: Dict[str, Dict[str, Any]]) -> None:
+        async with self.semaphore:
+            works = await self.openalex.works_by_doi([key[4:] for key in keys])
+        wanted = set(keys)
+        for work in works:
+            key = f"doi:{normalize_doi(work.get('doi'))}"
+            if key in wanted:
+                self._merge(found, key, work)
+
+    def _merge(self, found: Dict[str, Dict[str, Any]], key: str, record: Dict[str, Any]) -> None:
+        meta = found.setdefault(key, {'abstract': '', 'citation_count': 0, 'open_access': False})
+        abstract = record.get('abstract') or ''
+        # A full abstract beats an AI-generated TLDR from either source.
+        if abstract and (not meta['abstract'] or meta['abstract'].startswith('[AI Summary]')):
+            meta['abstract'] = abstract
+        meta['citation_count'] = max(meta['citation_count'], record.get('citation_count') or 0)
+        meta['open_access'] = meta['open_access'] or bool(record.get('open_access'))
+
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.cache.get(key)
+        if entry is None or time.time() - entry[0] > settings.ENRICHMENT_CACHE_TTL_SECONDS:
+            return None
+        return entry[1]
+
+    def _apply(self, article: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        if meta.get('abstract') and (not article.get('abstract') or article['abstract'].startswith('[AI Summary]')):
+            article['abstract'] = meta['abstract']
+        article['citation_count'] = max(article.get('citation_count') or 0, meta.get('citation_count') or 0)
+        if meta.get('open_access'):
+            article['open_access'] = True
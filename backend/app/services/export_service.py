@@ -6,18 +6,26 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Paper
+from app.services.map_reduce import Progress
+
+# Progress is reported about this many times over a DB export, however many articles it has.
+PROGRESS_STEPS = 20
 
 
 class ExportService:
-    async def export_articles(self, article_ids: List[int], format: str, db: Optional[AsyncSession] = None) -> Optional[str]:
+    async def export_articles(self, article_ids: List[int], format: str, db: Optional[AsyncSession] = None,
+                              progress: Optional[Progress] = None) -> Optional[str]:
         if not db:
             return self._generate_placeholder_citations(article_ids, format)
 
         papers = []
-        for article_id in article_ids:
+        step = max(1, len(article_ids) // PROGRESS_STEPS)
+        for done, article_id in enumerate(article_ids, start=1):
             result = await db.execute(select(Paper).where(Paper.id == article_id))
             paper = result.scalar_one_or_none()
             if paper: papers.append(paper)
+            if progress is not None and (done % step == 0 or done == len(article_ids)):
+                await progress(done / len(article_ids), f"Loaded {done} of {len(article_ids)} articles")
 
         if not papers: return None
 
@@ -0,0 +1,289 @@
+"""Background jobs - long LLM and export work run off the request path, with stored status, progress and results"""
+
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis import get_redis
+from app.core.serialization import dumps, pack, unpack
+from app.schemas import CollectionSummaryRequest, ExportRequest, LLMSynthesisRequest
+from app.services.map_reduce import Progress, scaled
+
+FINISHED = frozenset({'succeeded', 'failed', 'cancelled'})
+# Handlers report their own 0..1 progress; the job shows it between "started" and just short of done.
+STARTED_PROGRESS = 0.1
+WORK_PROGRESS_SHARE = 0.85
+JOB_HANDLERS: Dict[str, Tuple[Type[BaseModel], Callable[[Any, Progress], Awaitable[Any]]]] = {}
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def job_handler(kind: str, request_model: Type[BaseModel]):
+    def register(fn):
+        JOB_HANDLERS[kind] = (request_model, fn)
+        return fn
+    return register
+
+
+_services: Dict[str, Any] = {}
+
+
+def _service(cls):
+    # Each process (API or worker) builds its services on first use, keeping their caches warm across jobs.
+    if cls.__name__ not in _services:
+        _services[cls.__name__] = cls()
+    return _services[cls.__name__]
+
+
+async def close_services() -> None:
+    """Close the HTTP clients held by cached services (worker shutdown, before their event loop goes away)."""
+    for service in _services.values():
+        for client in (getattr(service, 'client', None), getattr(service, 'openai', None)):
+            if client is not None and hasattr(client, 'close'):
+                try:
+                    await client.close()
+                except Exception as e:
+                    print(f"Error closing {type(service).__name__} client: {e}")
+    _services.clear()
+
+
+def _work(progress: Progress) -> Progress:
+    return scaled(progress, WORK_PROGRESS_SHARE, start=STARTED_PROGRESS)
+
+
+@job_handler('llm.synthesize', LLMSynthesisRequest)
+async def _synthesize(request: LLMSynthesisRequest, progress: Progress) -> Any:
+    from app.services.llm_service import LLMService
+
+    service = _service(LLMService)
+    if not service.is_configured:
+        raise RuntimeError(f"OpenRouter is not configured: {service.configuration_issue}")
+    if len(request.articles) < 2:
+        raise ValueError("At least 2 articles are required")
+    await progress(STARTED_PROGRESS, f"Synthesizing {len(request.articles)} articles")
+    response = await service.synthesize(request.articles, request.synthesis_type, request.size, request.language,
+                                        _work(progress))
+    return response.model_dump()
+
+
+@job_handler('summary.collection', CollectionSummaryRequest)
+async def _collection_summary(request: CollectionSummaryRequest, progress: Progress) -> Any:
+    from app.services.summary_service import SummaryService
+
+    if settings.DISABLE_DB or AsyncSessionLocal is None:
+        raise RuntimeError("Database disabled in current environment")
+    await progress(STARTED_PROGRESS, "Summarizing collection")
+    async with AsyncSessionLocal() as db:
+        response = await _service(SummaryService).generate_collection_summary(request, db, _work(progress))
+    if response is None:
+        raise ValueError("Collection not found or empty")
+    return response.model_dump()
+
+
+@job_handler('export', ExportRequest)
+async def _export(request: ExportRequest, progress: Progress) -> Any:
+    from app.services.export_service import ExportService
+
+    await progress(STARTED_PROGRESS, f"Exporting {len(request.article_ids)} articles")
+    if settings.DISABLE_DB or AsyncSessionLocal is None:
+        content = await _service(ExportService).export_articles(request.article_ids, request.format)
+    else:
+        async with AsyncSessionLocal() as db:
+            content = await _service(ExportService).export_articles(request.article_ids, request.format, db, _work(progress))
+    if not content:
+        raise ValueError("Export failed")
+    return {'format': request.format, 'content': content, 'filename': f"references.{request.format}", 'exported_at': time.time()}
+
+
+class MemoryJobStore:
+    def __init__(self, ttl: Optional[int] = None):
+        self.ttl = ttl or settings.JOB_TTL_SECONDS
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+
+    async def create(self, job: Dict[str, Any]) -> None:
+        now = time.time()
+        for job_id in [i for i, j in self.jobs.items() if now - j['updated_at'] > self.ttl]:
+            del self.jobs[job_id]
+        self.jobs[job['id']] = dict(job)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        if job_id in self.jobs:
+            self.jobs[job_id].update(fields)
+
+
+class RedisJobStore:
+    """One hash per job, so the API (cancel) and a worker (progress, result) update separate fields without clobbering."""
+
+    PREFIX = "job:"
+
+    def __init__(self, ttl: Optional[int] = None):
+        self.ttl = ttl or settings.JOB_TTL_SECONDS
+
+    async def create(self, job: Dict[str, Any]) -> None:
+        await self.update(job['id'], **job)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        data = await get_redis().hgetall(self.PREFIX + job_id)
+        return {key.decode(): unpack(value) for key, value in data.items()} or None
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        mapping = {key: pack(value) if key == 'result' else dumps(value) for key, value in fields.items()}
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.hset(self.PREFIX + job_id, mapping=mapping)
+            pipe.expire(self.PREFIX + job_id, self.ttl)
+            await pipe.execute()
+
+
+async def execute_job(store, job_id: str, kind: str, payload: Dict[str, Any], watch_cancel: bool = False) -> None:
+    """Run one job to completion, recording progress and the outcome in `store`.
+
+    A cancelled job stays cancelled: progress updates raise JobCancelled, and with `watch_cancel` (workers, where the
+    API cannot reach the running task) the store is also polled so a job stuck in a long LLM call is interrupted.
+    """
+    job = await store.get(job_id)
+    if job is None or job['status'] in FINISHED:
+        return
+    request_model, handler = JOB_HANDLERS[kind]
+
+    async def progress(fraction: float, message: str = '') -> None:
+        current = await store.get(job_id)
+        if current is None or current['status'] == 'cancelled':
+            raise JobCancelled()
+        await store.update(job_id, progress=round(fraction, 3), message=message, updated_at=time.time())
+
+    async def watch(task: asyncio.Task) -> None:
+        while not task.done():
+            await asyncio.sleep(settings.JOB_CANCEL_POLL_SECONDS)
+            current = await store.get(job_id)
+            if current is None or current['status'] == 'cancelled':
+                task.cancel()
+
+    await store.update(job_id, status='running', updated_at=time.time())
+    task = asyncio.create_task(handler(request_model.model_validate(payload), progress))
+    watcher = asyncio.create_task(watch(task)) if watch_cancel else None
+    try:
+        result = await task
+    except (JobCancelled, asyncio.CancelledError):
+        await store.update(job_id, status='cancelled', updated_at=time.time())
+        # Only propagate when this runner itself was cancelled (local cancel, shutdown), not just the handler.
+        if asyncio.current_task().cancelling():
+            raise
+        return
+    except Exception as e:
+        print(f"Job {kind} {job_id} failed: {e}")
+        await store.update(job_id, status='failed', error=str(e), updated_at=time.time())
+        return
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+    await store.update(job_id, status='succeeded', progress=1.0, message='', result=result, updated_at=time.time())
+
+
+class LocalJobBackend:
+    """Runs jobs as tasks on this process's event loop; state lives in memory. Meant for development and tests."""
+
+    def __init__(self, concurrency: Optional[int] = None):
+        self.store = MemoryJobStore()
+        self.semaphore = asyncio.Semaphore(concurrency or settings.JOB_LOCAL_CONCURRENCY)
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    async def submit(self, job: Dict[str, Any], payload: Dict[str, Any]) -> None:
+        await self.store.create(job)
+        task = asyncio.create_task(self._run(job['id'], job['kind'], payload))
+        self.tasks[job['id']] = task
+        task.add_done_callback(lambda _: self.tasks.pop(job['id'], None))
+
+    async def _run(self, job_id: str, kind: str, payload: Dict[str, Any]) -> None:
+        async with self.semaphore:
+            await execute_job(self.store, job_id, kind, payload)
+
+    async def cancel(self, job_id: str) -> None:
+        task = self.tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+
+    async def close(self) -> None:
+        for task in list(self.tasks.values()):
+            task.cancel()
+
+
+class CeleryJobBackend:
+    """Queues jobs for `celery -A app.worker worker`; state is shared with the workers through Redis."""
+
+    def __init__(self):
+        from app.worker import celery_app
+
+        self.celery = celery_app
+        self.store = RedisJobStore()
+
+    async def submit(self, job: Dict[str, Any], payload: Dict[str, Any]) -> None:
+        await self.store.create(job)
+        await asyncio.to_thread(self.celery.send_task, 'research_navigator.run_job', args=[job['id'], job['kind'], payload], task_id=job['id'])
+
+    async def cancel(self, job_id: str) -> None:
+        # Revoking only stops queued tasks; running ones notice the cancelled status themselves.
+        await asyncio.to_thread(self.celery.control.revoke, job_id)
+
+    async def close(self) -> None:
+        return None
+
+
+class JobManager:
+    def __init__(self, backend=None):
+        self.backend = backend or LocalJobBackend()
+
+    async def submit(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate the payload for `kind` and queue the job; raises KeyError or pydantic.ValidationError."""
+        request_model, _ = JOB_HANDLERS[kind]
+        payload = request_model.model_validate(payload).model_dump(mode='json')
+        now = time.time()
+        job = {'id': uuid.uuid4().hex, 'kind': kind, 'status': 'queued', 'progress': 0.0, 'message': '', 'error': None,
+               'created_at': now, 'updated_at': now}
+        await self.backend.submit(job, payload)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.backend.store.get(job_id)
+
+    async def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = await self.get(job_id)
+        if job is None or job['status'] in FINISHED:
+            return job
+        await self.backend.store.update(job_id, status='cancelled', updated_at=time.time())
+        await self.backend.cancel(job_id)
+        return await self.get(job_id)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    global _manager
+    if _manager is None:
+        backend = None
+        if settings.JOB_BACKEND == 'celery':
+            try:
+                backend = CeleryJobBackend()
+            except Exception as e:
+                print(f"Celery job backend unavailable, running jobs in-process: {e}")
+        _manager = JobManager(backend)
+    return _manager
+
+
+async def close_jobs() -> None:
+    if _manager is not None:
+        await _manager.close()
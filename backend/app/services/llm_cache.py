@@ -0,0 +1,75 @@
+"""LLM response cache - content-addressed completions in Redis with TTL and LRU size bound"""
+
+import hashlib
+import time
+import zlib
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.serialization import dumps
+from app.services.search_cache import LRUCache
+
+
+class LLMResponseCache:
+    PREFIX = "llm:v1:"
+    INDEX_KEY = "llm:v1:index"
+    REDIS_RETRY_SECONDS = 30
+
+    def __init__(self, ttl: Optional[int] = None, max_entries: Optional[int] = None, lru_size: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else settings.LLM_CACHE_TTL_SECONDS
+        self.max_entries = max_entries if max_entries is not None else settings.LLM_CACHE_MAX_ENTRIES
+        self.lru = LRUCache(lru_size if lru_size is not None else settings.LLM_CACHE_LRU_SIZE)
+        self._redis_down_until = 0.0
+
+    @staticmethod
+    def make_key(model: str, messages: Any, **params: Any) -> str:
+        """Hash of everything that determines the completion, so any prompt or parameter change is a new entry."""
+        return hashlib.sha256(dumps({'model': model, 'messages': messages, 'params': params})).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        text = self.lru.get(key)
+        if text is not None:
+            return text
+        redis = self._redis()
+        if redis is None:
+            return None
+        try:
+            data = await redis.get(self.PREFIX + key)
+            if data is None:
+                return None
+            # The index score is the last access time, which drives eviction.
+            await redis.zadd(self.INDEX_KEY, {key: time.time()})
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        text = zlib.decompress(data).decode()
+        self.lru.set(key, text)
+        return text
+
+    async def set(self, key: str, text: str) -> None:
+        self.lru.set(key, text)
+        redis = self._redis()
+        if redis is None:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.set(self.PREFIX + key, zlib.compress(text.encode()), ex=self.ttl)
+                pipe.zadd(self.INDEX_KEY, {key: time.time()})
+                pipe.zcard(self.INDEX_KEY)
+                *_, size = await pipe.execute()
+            if size > self.max_entries:
+                evicted = [member for member, _ in await redis.zpopmin(self.INDEX_KEY, size - self.max_entries)]
+                if evicted:
+                    await redis.delete(*(self.PREFIX + member.decode() for member in evicted))
+        except Exception as e:
+            self._redis_failed(e)
+
+    def _redis(self):
+        if not settings.LLM_CACHE_ENABLED or time.time() < self._redis_down_until:
+            return None
+        return get_redis()
+
+    def _redis_failed(self, exc: Exception) -> None:
+        print(f"LLM cache Redis error: {exc}")
+        self._redis_down_until = time.time() + self.REDIS_RETRY_SECONDS
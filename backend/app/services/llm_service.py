@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import re
-from typing import List
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 from app.core.config import settings
+from app.services.llm_cache import LLMResponseCache
+from app.services.map_reduce import DIGEST_PROGRESS_SHARE, MapReduce, Progress, scaled
+from app.services.paper_summaries import PaperSummaryStore
+from app.services.semantic_cache import SemanticAnswerCache
+from app.services.single_flight import SingleFlight
+from app.services.tokens import count_tokens
 from app.schemas import (
     LLMArticleInput,
     LLMQuickSummaryResponse,
@@ -23,10 +30,48 @@ except Exception as exc:  # pragma: no cover
     AsyncOpenAI = None
     OPENAI_IMPORT_ERROR = str(exc)
 
+QUICK_SUMMARY_SECTIONS = ["OBJETIVO", "METODOLOGIA", "PRINCIPAIS_ACHADOS", "LIMITACOES", "IMPLICACOES_PRATICAS"]
+SYNTHESIS_SECTIONS = ["INTRODUCAO", "CONVERGENCIAS", "DIVERGENCIAS", "LACUNAS", "RECOMENDACOES", "REFERENCIAS_APA"]
+
+
+class SectionStream:
+    """Reports each heading's section as soon as the next heading starts, while tokens are still arriving."""
+
+    def __init__(self, names: List[str], extract: Callable[[str, str], str]):
+        self.names = names
+        self.extract = extract
+        self.heading = re.compile(rf"(?:^|\n)\s*\**({'|'.join(map(re.escape, names))})\**\s*:", re.IGNORECASE)
+        self.text = ""
+        self.emitted = set()
+
+    def feed(self, delta: str) -> List[Tuple[str, str]]:
+        self.text += delta
+        # A heading can only complete on its colon, so deltas without one cannot finish a section.
+        if ":" not in delta:
+            return []
+        started = [match.group(1).upper() for match in self.heading.finditer(self.text)]
+        return self._emit(started[:-1])
+
+    def finish(self) -> List[Tuple[str, str]]:
+        return self._emit(self.names)
+
+    def _emit(self, names: List[str]) -> List[Tuple[str, str]]:
+        sections = []
+        for name in names:
+            if name not in self.emitted:
+                self.emitted.add(name)
+                sections.append((name, self.extract(self.text, name)))
+        return sections
+
 
 class LLMService:
     def __init__(self):
         self.client = None
+        self.cache = LLMResponseCache()
+        self.flights = SingleFlight()
+        self.map_reduce = MapReduce(self._complete)
+        self.summaries = PaperSummaryStore()
+        self.answers = SemanticAnswerCache()
         self._init_client()
 
     def _init_client(self) -> None:
@@ -56,22 +101,152 @@ class LLMService:
             return "missing OPENROUTER_API_KEY"
         return "unknown configuration issue"
 
+    def _messages(self, prompt: str) -> List[dict]:
+        return [
+            {"role": "system", "content": "You are a precise academic assistant. Follow formatting strictly."},
+            {"role": "user", "content": prompt},
+        ]
+
     async def _complete(self, prompt: str) -> str:
         if not self.client:
             raise RuntimeError("OpenRouter not configured")
 
+        messages = self._messages(prompt)
+        temperature = 0.2
+        if not settings.LLM_CACHE_ENABLED:
+            return await self._create(messages, temperature)
+
+        key = LLMResponseCache.make_key(settings.OPENROUTER_MODEL, messages, temperature=temperature)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        async def generate() -> str:
+            text = await self._create(messages, temperature)
+            if text:
+                await self.cache.set(key, text)
+            return text
+
+        # Concurrent requests for the same prompt (a popular paper's summary) share one completion.
+        return await self.flights.do(key, generate)
+
+    async def _create(self, messages: List[dict], temperature: float) -> str:
         response = await self.client.chat.completions.create(
             model=settings.OPENROUTER_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a precise academic assistant. Follow formatting strictly."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
+            messages=messages,
+            temperature=temperature,
         )
         return (response.choices[0].message.content or "").strip()
 
+    async def _stream_complete(self, prompt: str) -> AsyncIterator[str]:
+        """Yield completion deltas as they arrive; a cached completion comes back as a single delta."""
+        if not self.client:
+            raise RuntimeError("OpenRouter not configured")
+
+        messages = self._messages(prompt)
+        temperature = 0.2
+        key = LLMResponseCache.make_key(settings.OPENROUTER_MODEL, messages, temperature=temperature)
+        if settings.LLM_CACHE_ENABLED:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        stream = await self.client.chat.completions.create(
+            model=settings.OPENROUTER_MODEL,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+        )
+        parts = []
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+
+        text = "".join(parts).strip()
+        if text and settings.LLM_CACHE_ENABLED:
+            await self.cache.set(key, text)
+
+    async def _stream_sections(self, prompt: str, names: List[str]) -> AsyncIterator[Dict]:
+        """'token' events for every delta and a 'section' event per heading once its text is complete; ends with the raw text."""
+        sections = SectionStream(names, self._extract_section)
+        async for delta in self._stream_complete(prompt):
+            yield {"event": "token", "text": delta}
+            for name, content in sections.feed(delta):
+                yield {"event": "section", "name": name.lower(), "content": content}
+        for name, content in sections.finish():
+            yield {"event": "section", "name": name.lower(), "content": content}
+        yield {"event": "raw", "text": sections.text.strip()}
+
     async def quick_summary(self, article: LLMArticleInput, language: str) -> LLMQuickSummaryResponse:
-        prompt = f"""
+        """The summary stored on the paper in this language, or a new one, which is then stored."""
+        stored = (await self.summaries.load([article], language)).get(self.summaries.key(article))
+        if stored is not None:
+            return stored
+        response = await self._generate_quick_summary(article, language)
+        await self.summaries.save(article, response, language)
+        return response
+
+    async def _generate_quick_summary(self, article: LLMArticleInput, language: str) -> LLMQuickSummaryResponse:
+        raw = await self._complete(self._quick_summary_prompt(article, language))
+        return self._quick_summary_response(raw)
+
+    async def quick_summary_stream(self, article: LLMArticleInput, language: str) -> AsyncIterator[Dict]:
+        stored = (await self.summaries.load([article], language)).get(self.summaries.key(article))
+        if stored is not None:
+            yield {"event": "done", **stored.model_dump()}
+            return
+        async for event in self._stream_sections(self._quick_summary_prompt(article, language), QUICK_SUMMARY_SECTIONS):
+            if event["event"] == "raw":
+                response = self._quick_summary_response(event["text"])
+                await self.summaries.save(article, response, language)
+                yield {"event": "done", **response.model_dump()}
+            else:
+                yield event
+
+    async def quick_summary_batch(self, articles: List[LLMArticleInput], language: str) -> AsyncIterator[Dict]:
+        """One 'summary' or 'error' event per article as it finishes, then 'done'.
+
+        Summaries already stored on the paper are returned without a completion; new ones are generated at most
+        LLM_BATCH_CONCURRENCY at a time and written back to the paper's summary columns.
+        """
+        stored = await self.summaries.load(articles, language)
+        semaphore = asyncio.Semaphore(settings.LLM_BATCH_CONCURRENCY)
+
+        async def summarize(index: int, article: LLMArticleInput) -> Tuple[int, str, object]:
+            response = stored.get(self.summaries.key(article))
+            if response is not None:
+                return index, "stored", response
+            try:
+                async with semaphore:
+                    response = await self._generate_quick_summary(article, language)
+            except Exception as exc:
+                return index, "failed", exc
+            await self.summaries.save(article, response, language)
+            return index, "generated", response
+
+        tasks = [asyncio.create_task(summarize(index, article)) for index, article in enumerate(articles)]
+        counts = {"stored": 0, "generated": 0, "failed": 0}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, origin, outcome = await next_done
+                counts[origin] += 1
+                article = articles[index]
+                if origin == "failed":
+                    yield {"event": "error", "index": index, "local_id": article.local_id, "detail": f"LLM provider error: {outcome}"}
+                else:
+                    yield {"event": "summary", "index": index, "local_id": article.local_id, "doi": article.doi,
+                           "origin": origin, "summary": outcome.model_dump()}
+        finally:
+            # The client may disconnect mid-batch; unfinished summaries are not worth paying for.
+            for task in tasks:
+                task.cancel()
+        yield {"event": "done", **counts}
+
+    def _quick_summary_prompt(self, article: LLMArticleInput, language: str) -> str:
+        return f"""
 Generate a structured academic summary in {language}.
 
 Article metadata:
@@ -93,8 +268,7 @@ LIMITACOES:
 IMPLICACOES_PRATICAS:
 """.strip()
 
-        raw = await self._complete(prompt)
-
+    def _quick_summary_response(self, raw: str) -> LLMQuickSummaryResponse:
         return LLMQuickSummaryResponse(
             objetivo=self._extract_section(raw, "OBJETIVO"),
             metodologia=self._extract_section(raw, "METODOLOGIA"),
@@ -105,6 +279,12 @@ IMPLICACOES_PRATICAS:
         )
 
     async def ask_article(self, article: LLMArticleInput, question: str, language: str) -> LLMAskArticleResponse:
+        # Paraphrases of an already answered question about this article skip the LLM entirely.
+        embedding = await self.answers.embed(question)
+        cached = self.answers.get(article, language, embedding)
+        if cached is not None:
+            return cached
+
         prompt = f"""
 Answer this question about the article in {language}.
 Question: {question}
@@ -124,12 +304,32 @@ CITATION:
 """.strip()
 
         raw = await self._complete(prompt)
-        return LLMAskArticleResponse(
+        response = LLMAskArticleResponse(
             answer=self._extract_section(raw, "ANSWER"),
             citation=self._extract_section(raw, "CITATION"),
         )
-
-    async def synthesize(self, articles: List[LLMArticleInput], synthesis_type: str, size: str, language: str) -> LLMSynthesisResponse:
+        self.answers.set(article, question, language, embedding, response)
+        return response
+
+    async def synthesize(self, articles: List[LLMArticleInput], synthesis_type: str, size: str, language: str,
+                         progress: Optional[Progress] = None) -> LLMSynthesisResponse:
+        prompt = await self._synthesis_prompt(articles, synthesis_type, size, language, progress)
+        if progress is not None:
+            await progress(DIGEST_PROGRESS_SHARE, "Writing synthesis")
+        return self._synthesis_response(await self._complete(prompt))
+
+    async def synthesize_stream(self, articles: List[LLMArticleInput], synthesis_type: str, size: str, language: str) -> AsyncIterator[Dict]:
+        prompt = await self._synthesis_prompt(articles, synthesis_type, size, language)
+        async for event in self._stream_sections(prompt, SYNTHESIS_SECTIONS):
+            if event["event"] == "raw":
+                yield {"event": "done", **self._synthesis_response(event["text"]).model_dump()}
+            elif event["event"] == "section" and event["name"] == "referencias_apa":
+                yield {**event, "content": self._references(event["content"])}
+            else:
+                yield event
+
+    async def _synthesis_prompt(self, articles: List[LLMArticleInput], synthesis_type: str, size: str, language: str,
+                                progress: Optional[Progress] = None) -> str:
         papers_text = []
         for idx, article in enumerate(articles, start=1):
             papers_text.append(
@@ -140,13 +340,58 @@ CITATION:
                 f"Abstract: {article.abstract or 'N/A'}"
             )
 
-        prompt = f"""
+        prompt = self._synthesis_template(f"Articles:\n{chr(10).join(papers_text)}", synthesis_type, size, language)
+        if len(articles) < settings.LLM_MAP_REDUCE_MIN_ARTICLES and count_tokens(prompt) <= settings.LLM_PROMPT_MAX_TOKENS:
+            return prompt
+
+        # Large sets: digest the papers concurrently, then synthesize from the digests plus a compact reference list.
+        references = "\n".join(
+            f"[P{idx}] {', '.join(article.authors) if article.authors else 'N/A'} ({article.year or 'n.d.'}). "
+            f"{article.title}. {article.journal or 'N/A'}. DOI: {article.doi or 'N/A'}"
+            for idx, article in enumerate(articles, start=1)
+        )
+        papers = [
+            f"[P{idx}] {article.title} ({article.year or 'N/A'})\nAbstract: {article.abstract or 'N/A'}"
+            for idx, article in enumerate(articles, start=1)
+        ]
+        budget = settings.LLM_PROMPT_MAX_TOKENS - count_tokens(references) - count_tokens(self._synthesis_template("", synthesis_type, size, language))
+        digests = await self.map_reduce.digest(
+            papers,
+            map_prompt=lambda chunk: self._digest_prompt(chunk, synthesis_type, language),
+            merge_prompt=self._merge_digests_prompt,
+            reduce_tokens=budget,
+            progress=scaled(progress, DIGEST_PROGRESS_SHARE),
+        )
+        return self._synthesis_template(
+            f"Paper digests ({len(articles)} papers, cite them by [Pn] label):\n{digests}\n\nReferences:\n{references}",
+            synthesis_type, size, language,
+        )
+
+    def _digest_prompt(self, papers: str, synthesis_type: str, language: str) -> str:
+        return f"""
+Condense each paper below into a digest for a later {synthesis_type} synthesis written in {language}.
+For every paper write one paragraph starting with its label (e.g. [P3]) covering objective, method and sample,
+main findings and limitations, in at most 80 words. Keep papers separate and do not add information.
+
+Papers:
+{papers}
+""".strip()
+
+    def _merge_digests_prompt(self, digests: str) -> str:
+        return f"""
+Shorten these paper digests to at most 40 words each. Keep every [Pn] label with its own findings,
+methods and limitations; do not merge papers or add information.
+
+{digests}
+""".strip()
+
+    def _synthesis_template(self, material: str, synthesis_type: str, size: str, language: str) -> str:
+        return f"""
 Create an academic synthesis in {language}.
 Synthesis type: {synthesis_type}
 Size: {size}
 
-Articles:
-{chr(10).join(papers_text)}
+{material}
 
 Return exactly with these headings:
 INTRODUCAO:
@@ -159,17 +404,14 @@ REFERENCIAS_APA:
 - reference 2
 """.strip()
 
-        raw = await self._complete(prompt)
-        refs_raw = self._extract_section(raw, "REFERENCIAS_APA")
-        refs = [line.strip().lstrip("- ").strip() for line in refs_raw.splitlines() if line.strip()]
-
+    def _synthesis_response(self, raw: str) -> LLMSynthesisResponse:
         return LLMSynthesisResponse(
             introducao=self._extract_section(raw, "INTRODUCAO"),
             convergencias=self._extract_section(raw, "CONVERGENCIAS"),
             divergencias=self._extract_section(raw, "DIVERGENCIAS"),
             lacunas=self._extract_section(raw, "LACUNAS"),
             recomendacoes=self._extract_section(raw, "RECOMENDACOES"),
-            referencias_apa=refs,
+            referencias_apa=self._references(self._extract_section(raw, "REFERENCIAS_APA")),
             raw=raw,
         )
 
@@ -235,6 +477,9 @@ Rules:
             raw=raw,
         )
 
+    def _references(self, section: str) -> List[str]:
+        return [line.strip().lstrip("- ").strip() for line in section.splitlines() if line.strip()]
+
     def _extract_section(self, text: str, name: str) -> str:
         pattern = rf"(?:^|\n)\s*\**{re.escape(name)}\**\s*:\s*(.*?)(?=(?:\n\s*\**[A-Z_]+\**\s*:)|\Z)"
         match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
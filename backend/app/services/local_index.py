@@ -0,0 +1,177 @@
+"""Local full-text index over known papers, consulted before the upstream fan-out
+
+Local hits are always merged into results, but they only replace the fan-out for a query the index is known to
+cover: the same terms and filters answered completely by the sources earlier, within LOCAL_INDEX_MAX_AGE_DAYS.
+A broad term that happens to match many stored papers proves nothing about what the sources would return.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.paper import Paper, paper_search_vector
+from app.services.ranking import BM25FRanker, tokenize
+from app.services.record_linkage import article_identifiers, normalize_title
+from app.services.search_cache import LRUCache, SearchCache
+
+
+def _matches_filters(article: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    year = filters.get('year')
+    article_year = article.get('year')
+    if year:
+        if not isinstance(article_year, int):
+            return False
+        if isinstance(year, (tuple, list)) and len(year) == 2:
+            if not int(year[0]) <= article_year <= int(year[1]):
+                return False
+        elif article_year != int(year):
+            return False
+    if filters.get('open_access') and not article.get('open_access'):
+        return False
+    if filters.get('type') and (article.get('type') or '').lower() != filters['type'].lower():
+        return False
+    return True
+
+
+class EmbeddedIndex:
+    """In-process inverted index fed from upstream results, used when the database is disabled."""
+
+    def __init__(self, max_docs: int = 50000):
+        self.max_docs = max_docs
+        self.docs: "OrderedDict[str, Tuple[Dict[str, Any], float, Set[str]]]" = OrderedDict()
+        self.postings: Dict[str, Set[str]] = {}
+        self.ranker = BM25FRanker()
+
+    def add(self, articles: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        for article in articles:
+            key = self._doc_key(article)
+            if not key:
+                continue
+            self._remove(key)
+            terms = set(tokenize(f"{article.get('title') or ''} {article.get('abstract') or ''}"))
+            stored = {k: v for k, v in article.items() if k not in ('raw', 'id')}
+            self.docs[key] = (stored, now, terms)
+            for term in terms:
+                self.postings.setdefault(term, set()).add(key)
+        while len(self.docs) > self.max_docs:
+            self._remove(next(iter(self.docs)))
+
+    def search(self, query: str, filters: Dict[str, Any], limit: int) -> List[Tuple[Dict[str, Any], float]]:
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        postings = sorted((self.postings.get(term, set()) for term in terms), key=len)
+        keys = set(postings[0]).intersection(*postings[1:])
+        matches = [self.docs[key][:2] for key in keys if _matches_filters(self.docs[key][0], filters)]
+        # Best `limit` by relevance, not whichever matches the set happens to yield first.
+        indexed_at = {id(article): at for article, at in matches}
+        ranked = self.ranker.rank([article for article, _ in matches], 'relevance', query, top_k=limit)
+        return [(dict(article), indexed_at[id(article)]) for article in ranked]
+
+    def _doc_key(self, article: Dict[str, Any]) -> str:
+        ids = article_identifiers(article)
+        if ids['doi']:
+            return f"doi:{ids['doi']}"
+        if ids['pmid']:
+            return f"pmid:{ids['pmid']}"
+        if ids['arxiv']:
+            return f"arxiv:{ids['arxiv']}"
+        title = normalize_title(article.get('title'))
+        return f"title:{title}:{article.get('year') or ''}" if title else ''
+
+    def _remove(self, key: str) -> None:
+        entry = self.docs.pop(key, None)
+        if entry is None:
+            return
+        for term in entry[2]:
+            keys = self.postings.get(term)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.postings[term]
+
+
+class LocalSearchIndex:
+    """Postgres tsvector/GIN search over the papers table, or the embedded index when DISABLE_DB is set."""
+
+    def __init__(self):
+        self.embedded = EmbeddedIndex(settings.LOCAL_INDEX_MAX_DOCS)
+        # Coverage key -> (harvested at, upstream records); only kept for the embedded index, the one fed here.
+        self.harvested = LRUCache(settings.LOCAL_INDEX_MAX_QUERIES)
+
+    @property
+    def max_age_seconds(self) -> float:
+        return settings.LOCAL_INDEX_MAX_AGE_DAYS * 86400
+
+    async def search(self, query: str, filters: Dict[str, Any], db: Optional[AsyncSession]) -> Tuple[List[Dict[str, Any]], int]:
+        """Return (fresh hits, stale hit count)."""
+        if not settings.LOCAL_INDEX_ENABLED or filters.get('sources'):
+            return [], 0
+
+        limit = settings.LOCAL_INDEX_MAX_HITS
+        if settings.DISABLE_DB:
+            hits = self.embedded.search(query, filters, limit)
+        elif db is not None:
+            try:
+                hits = await self._search_db(query, filters, limit, db)
+            except Exception as e:
+                print(f"Local index error: {e}")
+                return [], 0
+        else:
+            return [], 0
+
+        cutoff = time.time() - self.max_age_seconds
+        fresh = [article for article, indexed_at in hits if indexed_at >= cutoff]
+        for article in fresh:
+            article['sources'] = list(dict.fromkeys([*(article.get('sources') or []), 'local']))
+        return fresh, len(hits) - len(fresh)
+
+    def add(self, articles: List[Dict[str, Any]]) -> None:
+        if settings.LOCAL_INDEX_ENABLED and settings.DISABLE_DB:
+            self.embedded.add(articles)
+
+    def mark_harvested(self, query: str, filters: Dict[str, Any], count: int) -> None:
+        """Record that every source answered `query` in full and its `count` records were added to the index."""
+        if settings.LOCAL_INDEX_ENABLED and settings.DISABLE_DB:
+            self.harvested.set(self._coverage_key(query, filters), (time.time(), count))
+
+    def covers(self, query: str, filters: Dict[str, Any], needed: int) -> bool:
+        """Whether local hits can stand in for the fan-out: this exact query was harvested recently with at least
+        `needed` records. The papers table is not fed from upstream results, so it never qualifies."""
+        entry = self.harvested.get(self._coverage_key(query, filters))
+        if entry is None:
+            return False
+        harvested_at, count = entry
+        return count >= needed and harvested_at >= time.time() - self.max_age_seconds
+
+    def _coverage_key(self, query: str, filters: Dict[str, Any]) -> str:
+        return SearchCache.make_key(' '.join(sorted(set(tokenize(query)))), filters, '', 0)
+
+    async def _search_db(self, query: str, filters: Dict[str, Any], limit: int, db: AsyncSession) -> List[Tuple[Dict[str, Any], float]]:
+        vector = paper_search_vector()
+        tsquery = func.plainto_tsquery(literal_column("'simple'::regconfig"), query)
+        stmt = select(Paper).where(vector.op('@@')(tsquery))
+
+        year = filters.get('year')
+        if year:
+            if isinstance(year, (tuple, list)) and len(year) == 2:
+                stmt = stmt.where(Paper.year.between(int(year[0]), int(year[1])))
+            else:
+                stmt = stmt.where(Paper.year == int(year))
+        if filters.get('open_access'):
+            stmt = stmt.where(Paper.open_access.is_(True))
+        if filters.get('type'):
+            stmt = stmt.where(func.lower(Paper.paper_type) == filters['type'].lower())
+
+        result = await db.execute(stmt.order_by(func.ts_rank(vector, tsquery).desc()).limit(limit))
+        hits = []
+        for paper in result.scalars().all():
+            article = paper.to_dict()
+            article['type'] = paper.paper_type or 'article'
+            hits.append((article, paper.created_at.timestamp() if paper.created_at else 0.0))
+        return hits
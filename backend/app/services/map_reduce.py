@@ -0,0 +1,83 @@
+"""Hierarchical map-reduce - condenses inputs too large for one prompt with concurrent digest calls"""
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional
+
+from app.core.config import settings
+from app.services.tokens import chunk_by_tokens, count_tokens
+
+# Reports a completed fraction (0..1) of some work with a short status message.
+Progress = Callable[[float, str], Awaitable[None]]
+# Share of the progress range taken by the map level; each merge level then takes half of what is left.
+MAP_PROGRESS_SHARE = 0.8
+# Share of a digest-then-complete task's progress given to the digest; the final completion takes the rest.
+DIGEST_PROGRESS_SHARE = 0.8
+
+
+def scaled(progress: Optional[Progress], share: float, start: float = 0.0) -> Optional[Progress]:
+    """Map a sub-task's 0..1 progress onto [start, start + share] of its caller's."""
+    if progress is None:
+        return None
+
+    async def report(fraction: float, message: str = '') -> None:
+        await progress(start + share * fraction, message)
+    return report
+
+
+class MapReduce:
+    """Digests token-budgeted chunks concurrently, then merges digests level by level until they fit `reduce_tokens`.
+
+    `complete` does the actual LLM call; passing a cached completion makes every chunk digest cached on its own,
+    so re-running a synthesis over a mostly unchanged article set only pays for the new chunks.
+    """
+
+    def __init__(self, complete: Callable[[str], Awaitable[str]], chunk_tokens: Optional[int] = None,
+                 concurrency: Optional[int] = None):
+        self.complete = complete
+        self.chunk_tokens = chunk_tokens or settings.LLM_MAP_CHUNK_TOKENS
+        self.semaphore = asyncio.Semaphore(concurrency or settings.LLM_MAP_CONCURRENCY)
+
+    async def digest(self, texts: List[str], map_prompt: Callable[[str], str], merge_prompt: Callable[[str], str],
+                     reduce_tokens: int, progress: Optional[Progress] = None) -> str:
+        """Condense `texts`, calling `progress` as each chunk digest completes."""
+        digests = await self._run(texts, map_prompt, progress, 0.0, MAP_PROGRESS_SHARE, "Digested")
+        done = MAP_PROGRESS_SHARE
+        while len(digests) > 1 and count_tokens("\n\n".join(digests)) > reduce_tokens:
+            share = (1.0 - done) / 2
+            merged = await self._run(digests, merge_prompt, progress, done, share, "Merged")
+            done += share
+            if len(merged) >= len(digests):
+                # Every digest already fills a chunk on its own; merging further cannot shrink the level.
+                break
+            digests = merged
+        return "\n\n".join(digests)
+
+    async def _run(self, texts: List[str], prompt: Callable[[str], str], progress: Optional[Progress] = None,
+                   start: float = 0.0, share: float = 1.0, verb: str = "Digested") -> List[str]:
+        chunks = chunk_by_tokens(texts, self.chunk_tokens)
+        finished, failed = 0, False
+
+        async def one(chunk: List[str]) -> str:
+            nonlocal finished, failed
+            async with self.semaphore:
+                if failed:
+                    return ""
+                try:
+                    digest = await self.complete(prompt("\n\n".join(chunk)))
+                    finished += 1
+                    if progress is not None:
+                        await progress(start + share * finished / len(chunks), f"{verb} {finished} of {len(chunks)} chunks")
+                except BaseException:
+                    failed = True
+                    raise
+            return digest
+
+        tasks = [asyncio.ensure_future(one(chunk)) for chunk in chunks]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            # A failed chunk or a cancelled job (raised by `progress`) stops the chunks still in flight or waiting
+            # for a slot; the level's result is discarded anyway.
+            for task in tasks:
+                task.cancel()
+            raise
@@ -0,0 +1,92 @@
+"""Persisted quick summaries - parsed sections stored on the matching Paper row, tagged with their language"""
+
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.paper import Paper
+from app.schemas import LLMArticleInput, LLMQuickSummaryResponse
+
+# Quick-summary fields and the Paper columns they are stored in.
+SECTION_COLUMNS = {
+    'objetivo': 'objectives',
+    'metodologia': 'methodology',
+    'principais_achados': 'results',
+    'limitacoes': 'limitations',
+    'implicacoes_praticas': 'practical_implications',
+}
+
+
+def _match_key(doi: Optional[str], title: Optional[str], year: Optional[int]) -> Tuple:
+    """Papers are matched by DOI, or by exact title and year when there is none."""
+    if doi:
+        return ('doi', doi.strip().lower())
+    return ('title', (title or '').strip().lower(), year)
+
+
+def _condition(article: LLMArticleInput):
+    if article.doi:
+        return func.lower(Paper.doi) == article.doi.strip().lower()
+    return and_(func.lower(Paper.title) == article.title.strip().lower(), Paper.year == article.year)
+
+
+class PaperSummaryStore:
+    @property
+    def enabled(self) -> bool:
+        return not settings.DISABLE_DB and AsyncSessionLocal is not None
+
+    async def load(self, articles: List[LLMArticleInput], language: str) -> Dict[Tuple, LLMQuickSummaryResponse]:
+        """Stored quick summaries in `language` for the given articles, keyed by match key; one query for the batch.
+
+        Only rows written by save() qualify: summary_language marks `summary` as a quick summary, so free-form
+        summaries from SummaryService (which clear it) are never parsed as one.
+        """
+        if not self.enabled or not articles:
+            return {}
+        dois = {article.doi.strip().lower() for article in articles if article.doi}
+        titles = [_condition(article) for article in articles if not article.doi]
+        conditions = ([func.lower(Paper.doi).in_(dois)] if dois else []) + titles
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(select(Paper).where(or_(*conditions), Paper.summary_language == language))
+                papers = result.scalars().all()
+        except Exception as e:
+            print(f"Summary load error: {e}")
+            return {}
+
+        stored = {}
+        for paper in papers:
+            response = LLMQuickSummaryResponse(
+                raw=paper.summary, **{field: getattr(paper, column) or '' for field, column in SECTION_COLUMNS.items()}
+            )
+            stored[_match_key(paper.doi, paper.title, paper.year)] = response
+            if paper.doi:
+                stored.setdefault(_match_key(None, paper.title, paper.year), response)
+        return stored
+
+    def key(self, article: LLMArticleInput) -> Tuple:
+        return _match_key(article.doi, article.title, article.year)
+
+    async def save(self, article: LLMArticleInput, response: LLMQuickSummaryResponse, language: str) -> None:
+        """Write the sections onto the article's Paper row, creating the row if the paper was never stored."""
+        if not self.enabled or not response.raw:
+            return
+        values = {column: getattr(response, field) for field, column in SECTION_COLUMNS.items()}
+        try:
+            async with AsyncSessionLocal() as session:
+                paper = (await session.execute(select(Paper).where(_condition(article)).limit(1))).scalar_one_or_none()
+                if paper is None:
+                    paper = Paper(
+                        title=article.title, abstract=article.abstract, year=article.year, journal=article.journal,
+                        doi=article.doi, authors=[{'name': name} for name in article.authors], sources=[],
+                    )
+                    session.add(paper)
+                paper.summary = response.raw
+                paper.summary_language = language
+                for column, value in values.items():
+                    setattr(paper, column, value)
+                await session.commit()
+        except Exception as e:
+            print(f"Summary save error: {e}")
@@ -0,0 +1,127 @@
+"""Relevance ranking - BM25F over title and abstract with recency and citation priors"""
+
+import math
+import string
+import unicodedata
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.search_cache import LRUCache
+
+PUNCTUATION_TABLE = str.maketrans({char: ' ' for char in string.punctuation})
+STOPWORDS = frozenset(
+    "a an and are as at be by de do da das dos e em for from in is na no o of on or os para por the to with".split()
+)
+
+
+def fold(text: Optional[str]) -> str:
+    if not text:
+        return ''
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+    return text.lower().translate(PUNCTUATION_TABLE)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [token for token in fold(text).split() if token not in STOPWORDS]
+
+
+# Tokenized fields by hash of their text: a sorted int64 array of token hashes (a few KB per abstract,
+# and the text itself is not kept), so re-ranking the same articles (stream updates, snapshot tails,
+# refreshes) tokenizes each field once whatever the query.
+_field_tokens = LRUCache(maxsize=8192)
+
+
+def field_tokens(text: str) -> np.ndarray:
+    key = hash(text)
+    tokens = _field_tokens.get(key)
+    if tokens is None:
+        tokens = np.sort(np.fromiter((hash(token) for token in fold(text).split()), dtype=np.int64))
+        _field_tokens.set(key, tokens)
+    return tokens
+
+
+def term_stats(text: str, term_hashes: np.ndarray) -> Tuple[int, np.ndarray]:
+    """Token count of a field and the occurrences of each query term (given as hash(term), see field_tokens)."""
+    tokens = field_tokens(text)
+    return len(tokens), np.searchsorted(tokens, term_hashes, 'right') - np.searchsorted(tokens, term_hashes, 'left')
+
+
+class BM25FRanker:
+    FIELDS = ('title', 'abstract')
+
+    def __init__(self, field_weights: Optional[Dict[str, float]] = None, field_b: Optional[Dict[str, float]] = None,
+                 k1: float = 1.2, recency_weight: float = 0.1, recency_half_life: float = 5.0, citation_weight: float = 0.15):
+        self.field_weights = field_weights or {'title': 3.0, 'abstract': 1.0}
+        self.field_b = field_b or {'title': 0.5, 'abstract': 0.75}
+        self.k1 = k1
+        self.recency_weight = recency_weight
+        self.recency_half_life = recency_half_life
+        self.citation_weight = citation_weight
+
+    def rank(self, articles: List[Dict], sort_by: str, query: str, top_k: Optional[int] = None) -> List[Dict]:
+        if not articles:
+            return articles
+
+        if sort_by == 'recency':
+            scores = self._numeric(articles, 'year')
+        elif sort_by == 'citations':
+            scores = self._numeric(articles, 'citation_count')
+        else:
+            scores = self.score(articles, query)
+        return [articles[i] for i in self._top(scores, top_k)]
+
+    def score(self, articles: List[Dict], query: str) -> np.ndarray:
+        terms = tuple(dict.fromkeys(tokenize(query)))
+        term_hashes = np.array([hash(term) for term in terms], dtype=np.int64)
+        n = len(articles)
+        bm25 = np.zeros(n)
+
+        if terms:
+            pseudo_tf = np.zeros((n, len(terms)))
+            for field in self.FIELDS:
+                tf = np.zeros((n, len(terms)))
+                lengths = np.zeros(n)
+                for row, article in enumerate(articles):
+                    lengths[row], tf[row] = term_stats(article.get(field) or '', term_hashes)
+                avg_length = lengths.mean() or 1.0
+                norm = 1 - self.field_b[field] + self.field_b[field] * lengths / avg_length
+                pseudo_tf += self.field_weights[field] * tf / norm[:, None]
+
+            df = (pseudo_tf > 0).sum(axis=0)
+            idf = np.log1p((n - df + 0.5) / (df + 0.5))
+            bm25 = (idf * pseudo_tf / (self.k1 + pseudo_tf)).sum(axis=1)
+            if bm25.max() > 0:
+                bm25 /= bm25.max()
+
+        return bm25 + self.recency_weight * self._recency(articles) + self.citation_weight * self._citations(articles)
+
+    def _recency(self, articles: List[Dict]) -> np.ndarray:
+        years = self._numeric(articles, 'year')
+        age = np.clip(datetime.utcnow().year - years, 0, None)
+        return np.where(years > 0, np.exp2(-age / self.recency_half_life), 0.0)
+
+    def _citations(self, articles: List[Dict]) -> np.ndarray:
+        citations = np.log1p(np.clip(self._numeric(articles, 'citation_count'), 0, None))
+        top = citations.max()
+        return citations / top if top > 0 else citations
+
+    def _numeric(self, articles: List[Dict], field: str) -> np.ndarray:
+        return np.fromiter(
+            (value if isinstance(value, (int, float)) and math.isfinite(value) else 0 for value in (a.get(field) for a in articles)),
+            dtype=float, count=len(articles)
+        )
+
+    def _top(self, scores: np.ndarray, top_k: Optional[int]) -> np.ndarray:
+        """Indexes by descending score, ties in input order; only the best top_k are fully sorted."""
+        candidates = np.arange(len(scores))
+        if top_k is not None and top_k < len(scores):
+            if top_k <= 0:
+                return candidates[:0]
+            # argpartition picks arbitrarily among scores tied at the cut; keep the earliest of those instead.
+            threshold = -np.partition(-scores, top_k - 1)[top_k - 1]
+            above = np.flatnonzero(scores > threshold)
+            candidates = np.concatenate((above, np.flatnonzero(scores == threshold)[:top_k - len(above)]))
+        return candidates[np.lexsort((candidates, -scores[candidates]))]
@@ -0,0 +1,243 @@
+"""Record linkage - merges duplicate articles returned by different sources"""
+
+import html
+import re
+import unicodedata
+import zlib
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+DOI_PATTERN = re.compile(r'10\.\d{4,9}/[^\s"<>]+', re.IGNORECASE)
+PMID_URL_PATTERN = re.compile(r'pubmed\.ncbi\.nlm\.nih\.gov/(\d+)')
+ARXIV_NEW_PATTERN = re.compile(r'(\d{4}\.\d{4,5})(?:v\d+)?', re.IGNORECASE)
+ARXIV_OLD_PATTERN = re.compile(r'([a-z\-]+(?:\.[a-z]{2})?/\d{7})(?:v\d+)?', re.IGNORECASE)
+ARXIV_DOI_PREFIX = '10.48550/arxiv.'
+TAG_PATTERN = re.compile(r'<[^>]+>')
+NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_doi(value: Optional[str]) -> str:
+    """'https://doi.org/10.1000/ABC.' and 'doi:10.1000/abc' both become '10.1000/abc'."""
+    if not value:
+        return ''
+    match = DOI_PATTERN.search(str(value))
+    return match.group(0).rstrip('.,;)').lower() if match else ''
+
+
+def normalize_pmid(value: Optional[str]) -> str:
+    if not value:
+        return ''
+    value = str(value).strip()
+    match = PMID_URL_PATTERN.search(value)
+    if match:
+        return match.group(1)
+    return value if value.isdigit() else ''
+
+
+def normalize_arxiv_id(value: Optional[str]) -> str:
+    """Accepts bare ids, abs/pdf URLs and arXiv DOIs; drops the version suffix."""
+    if not value:
+        return ''
+    value = str(value).strip().lower()
+    if value.startswith(ARXIV_DOI_PREFIX):
+        value = value[len(ARXIV_DOI_PREFIX):]
+    elif 'arxiv.org/' in value:
+        value = value.split('arxiv.org/', 1)[1].split('/', 1)[-1]
+    for pattern in (ARXIV_NEW_PATTERN, ARXIV_OLD_PATTERN):
+        match = pattern.fullmatch(value.removesuffix('.pdf'))
+        if match:
+            return match.group(1)
+    return ''
+
+
+def normalize_title(title: Optional[str]) -> str:
+    if not title:
+        return ''
+    title = TAG_PATTERN.sub(' ', html.unescape(str(title)))
+    title = unicodedata.normalize('NFKD', title).encode('ascii', 'ignore').decode()
+    return NON_ALNUM_PATTERN.sub(' ', title.lower()).strip()
+
+
+def article_identifiers(article: Dict) -> Dict[str, str]:
+    doi = normalize_doi(article.get('doi')) or normalize_doi(article.get('url'))
+    arxiv_id = normalize_arxiv_id(article.get('arxiv_id'))
+    if not arxiv_id and doi.startswith(ARXIV_DOI_PREFIX):
+        arxiv_id = normalize_arxiv_id(doi)
+    if not arxiv_id and 'arxiv.org/' in (article.get('url') or ''):
+        arxiv_id = normalize_arxiv_id(article.get('url'))
+    return {
+        'doi': doi,
+        'pmid': normalize_pmid(article.get('pmid')) or normalize_pmid(article.get('url')),
+        'arxiv': arxiv_id,
+    }
+
+
+class UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> int:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
+
+
+class MinHasher:
+    """MinHash signatures over title word shingles, vectorized across permutations and records."""
+
+    PRIME = 4294967311  # smallest prime above 2**32, so crc32 token hashes stay below it
+
+    def __init__(self, num_perm: int = 32, seed: int = 7):
+        rng = np.random.default_rng(seed)
+        # Coefficients below 2**31 keep a * hash + b inside uint64.
+        self.a = rng.integers(1, 2 ** 31, size=(num_perm, 1), dtype=np.uint64)
+        self.b = rng.integers(0, 2 ** 31, size=(num_perm, 1), dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signatures(self, shingle_sets: List[Set[str]]) -> np.ndarray:
+        """Return an (n, num_perm) matrix; every set must be non-empty."""
+        lengths = [len(shingles) for shingles in shingle_sets]
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode()) for shingles in shingle_sets for s in shingles), dtype=np.uint64, count=sum(lengths)
+        )
+        values = (self.a * hashes + self.b) % np.uint64(self.PRIME)
+        starts = np.concatenate(([0], np.cumsum(lengths[:-1]))).astype(np.intp)
+        return np.minimum.reduceat(values, starts, axis=1).T
+
+
+def title_shingles(normalized_title: str) -> Set[str]:
+    words = normalized_title.split()
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+class RecordLinker:
+    """Groups records sharing a DOI, PMID or arXiv id, or whose titles are near-identical, and merges each group.
+
+    Output keeps the order of each group's first record, so an already-deduplicated prefix stays in place.
+    """
+
+    def __init__(self, num_perm: int = 32, bands: int = 8, title_threshold: float = 0.8, min_title_words: int = 3):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.band_weights = np.random.default_rng(11).integers(1, 2 ** 63, size=self.rows, dtype=np.uint64)
+        self.title_threshold = title_threshold
+        self.min_title_words = min_title_words
+
+    def link(self, articles: List[Dict]) -> List[Dict]:
+        if len(articles) < 2:
+            return list(articles)
+
+        ids = [article_identifiers(article) for article in articles]
+        uf = UnionFind(len(articles))
+
+        first_seen: Dict[tuple, int] = {}
+        for index, record_ids in enumerate(ids):
+            for kind, value in record_ids.items():
+                if not value:
+                    continue
+                key = (kind, value)
+                if key in first_seen:
+                    uf.union(first_seen[key], index)
+                else:
+                    first_seen[key] = index
+
+        self._link_titles(articles, ids, uf)
+
+        groups: Dict[int, List[int]] = {}
+        for index in range(len(articles)):
+            groups.setdefault(uf.find(index), []).append(index)
+        ordered = sorted(groups.values(), key=lambda members: members[0])
+        return [self._merge([articles[i] for i in members], [ids[i] for i in members]) for members in ordered]
+
+    def _link_titles(self, articles: List[Dict], ids: List[Dict[str, str]], uf: UnionFind) -> None:
+        shingles: Dict[int, Set[str]] = {}
+        for index, article in enumerate(articles):
+            title = normalize_title(article.get('title'))
+            if len(title.split()) >= self.min_title_words:
+                shingles[index] = title_shingles(title)
+        if len(shingles) < 2:
+            return
+
+        indexes = np.fromiter(shingles, dtype=np.intp, count=len(shingles))
+        signatures = self.hasher.signatures(list(shingles.values())).reshape(len(indexes), self.bands, self.rows)
+        # Collapse each band to one uint64 (wrapping arithmetic); collisions are re-checked by Jaccard below.
+        band_keys = (signatures * self.band_weights).sum(axis=2)
+        candidates = set()
+        for band in range(self.bands):
+            order = np.argsort(band_keys[:, band], kind='stable')
+            keys = band_keys[order, band]
+            # Runs of equal keys in sorted order are the LSH buckets; only buckets with 2+ members matter.
+            run_starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1], [True])))
+            for start, end in zip(run_starts[:-1], run_starts[1:]):
+                if end - start > 1:
+                    members = sorted(indexes[order[start:end]].tolist())
+                    candidates.update((x, y) for pos, x in enumerate(members) for y in members[pos + 1:])
+
+        group_dois: Dict[int, Set[str]] = {}
+        for index, record_ids in enumerate(ids):
+            if record_ids['doi']:
+                group_dois.setdefault(uf.find(index), set()).add(record_ids['doi'])
+
+        for a, b in sorted(candidates):
+            root_a, root_b = uf.find(a), uf.find(b)
+            if root_a == root_b or not self._titles_match(articles[a], articles[b], shingles[a], shingles[b]):
+                continue
+            dois_a, dois_b = group_dois.get(root_a, set()), group_dois.get(root_b, set())
+            # Distinct DOIs on both sides mean distinct works (e.g. an erratum), even with equal titles.
+            if dois_a and dois_b and not dois_a & dois_b:
+                continue
+            root = uf.union(a, b)
+            group_dois[root] = dois_a | dois_b
+
+    def _titles_match(self, a: Dict, b: Dict, shingles_a: Set[str], shingles_b: Set[str]) -> bool:
+        year_a, year_b = a.get('year'), b.get('year')
+        if isinstance(year_a, int) and isinstance(year_b, int) and abs(year_a - year_b) > 1:
+            return False
+        return len(shingles_a & shingles_b) / len(shingles_a | shingles_b) >= self.title_threshold
+
+    def _merge(self, records: List[Dict], ids: List[Dict[str, str]]) -> Dict:
+        if len(records) == 1:
+            record = records[0]
+            return dict(record, doi=ids[0]['doi']) if ids[0]['doi'] and record.get('doi') != ids[0]['doi'] else record
+
+        merged = dict(records[0])
+        merged['title'] = next((r['title'] for r in records if r.get('title')), '')
+        merged['authors'] = max((r.get('authors') or [] for r in records), key=len)
+        merged['year'] = next((r['year'] for r in records if r.get('year')), None)
+        merged['journal'] = next((r['journal'] for r in records if r.get('journal') and r['journal'] != 'arXiv'),
+                                 next((r['journal'] for r in records if r.get('journal')), ''))
+        merged['doi'] = next((i['doi'] for i in ids if i['doi']), '')
+        merged['pmid'] = next((i['pmid'] for i in ids if i['pmid']), '')
+        arxiv_id = next((i['arxiv'] for i in ids if i['arxiv']), '')
+        if arxiv_id:
+            merged['arxiv_id'] = arxiv_id
+        abstracts = [r['abstract'] for r in records if r.get('abstract')]
+        full_abstracts = [a for a in abstracts if not a.startswith('[AI Summary]')]
+        merged['abstract'] = max(full_abstracts or abstracts, key=len) if abstracts else ''
+        merged['citation_count'] = max((r.get('citation_count') or 0) for r in records)
+        merged['url'] = next((r['url'] for r in records if r.get('url')), '')
+        merged['type'] = next((r['type'] for r in records if r.get('type') and r['type'] != 'article'), merged.get('type', 'article'))
+        merged['open_access'] = any(r.get('open_access') for r in records)
+        sources = []
+        for record in records:
+            for source in record.get('sources', []):
+                if source not in sources:
+                    sources.append(source)
+        merged['sources'] = sources
+        return merged
@@ -0,0 +1,127 @@
+"""Search result cache - in-process LRU tier in front of Redis with stale-while-revalidate"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.serialization import pack, unpack
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SearchCache:
+    PREFIX = "search:v1:"
+    REDIS_RETRY_SECONDS = 30
+
+    def __init__(self, ttl: Optional[int] = None, stale: Optional[int] = None, lru_size: Optional[int] = None,
+                 prefix: Optional[str] = None):
+        self.prefix = prefix or self.PREFIX
+        self.ttl = ttl if ttl is not None else settings.SEARCH_CACHE_TTL_SECONDS
+        self.stale = stale if stale is not None else settings.SEARCH_CACHE_STALE_SECONDS
+        self.lru = LRUCache(lru_size if lru_size is not None else settings.SEARCH_CACHE_LRU_SIZE)
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._redis_down_until = 0.0
+
+    @staticmethod
+    def make_key(query: str, filters: Dict[str, Any], sort_by: str, limit: int) -> str:
+        normalized_filters = {k: v for k, v in (filters or {}).items() if v not in (None, [], '')}
+        if isinstance(normalized_filters.get('sources'), list):
+            normalized_filters['sources'] = sorted(normalized_filters['sources'])
+        raw = json.dumps({
+            'q': ' '.join(query.lower().split()),
+            'f': normalized_filters,
+            's': sort_by,
+            'l': limit,
+        }, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """Return (payload, is_fresh) or None when missing or past the stale window."""
+        entry = self.lru.get(key)
+        if entry is None:
+            entry = await self._redis_get(key)
+            if entry is not None:
+                self.lru.set(key, entry)
+        if entry is None:
+            return None
+
+        age = time.time() - entry['stored_at']
+        if age > self.ttl + self.stale:
+            self.lru.delete(key)
+            return None
+        return entry['payload'], age <= self.ttl
+
+    async def set(self, key: str, payload: Dict[str, Any]) -> None:
+        entry = {'stored_at': time.time(), 'payload': self.strip(payload)}
+        self.lru.set(key, entry)
+        await self._redis_set(key, entry)
+
+    def schedule_refresh(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(refresh())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    @staticmethod
+    def strip(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """The payload as it is stored: raw upstream records are large, not always JSON-serializable and never used
+        by responses."""
+        articles = [{k: v for k, v in article.items() if k != 'raw'} for article in payload.get('articles', [])]
+        return {**payload, 'articles': articles}
+
+    def _redis(self):
+        if time.time() < self._redis_down_until:
+            return None
+        return get_redis()
+
+    def _redis_failed(self, exc: Exception) -> None:
+        print(f"Search cache Redis error: {exc}")
+        self._redis_down_until = time.time() + self.REDIS_RETRY_SECONDS
+
+    async def _redis_get(self, key: str) -> Optional[Dict[str, Any]]:
+        redis = self._redis()
+        if redis is None:
+            return None
+        try:
+            data = await redis.get(self.prefix + key)
+            return unpack(data) if data else None
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+    async def _redis_set(self, key: str, entry: Dict[str, Any]) -> None:
+        redis = self._redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(self.prefix + key, pack(entry), ex=self.ttl + self.stale)
+        except Exception as e:
+            self._redis_failed(e)
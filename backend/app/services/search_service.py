@@ -1,8 +1,8 @@
 """Search service - orchestrates parallel search across multiple academic APIs"""
 
 import asyncio
-from typing import List, Dict, Any, Optional
-import hashlib
+import time
+from typing import List, Dict, Any, Optional, AsyncIterator
 
 from app.api_clients.openalex import OpenAlexClient
 from app.api_clients.semantic_scholar import SemanticScholarClient
@@ -10,7 +10,16 @@ from app.api_clients.core import CoreClient
 from app.api_clients.pubmed import PubMedClient
 from app.api_clients.crossref import CrossRefClient
 from app.api_clients.arxiv import ArxivClient
+from app.api_clients.base import Offset
 from app.core.config import settings
+from app.services.autocomplete import suggestion_engine
+from app.services.enrichment import MetadataEnricher
+from app.services.local_index import LocalSearchIndex
+from app.services.ranking import BM25FRanker
+from app.services.record_linkage import RecordLinker
+from app.services.search_cache import SearchCache
+from app.services.single_flight import SingleFlight
+from app.services.source_stats import SourceStatsTracker, query_class
 
 
 class SearchService:
@@ -23,102 +32,414 @@ class SearchService:
             'crossref': CrossRefClient(),
             'arxiv': ArxivClient(),
         }
+        self.cache = SearchCache()
+        self.snapshots = SearchCache(prefix="search:snapshot:", ttl=settings.SEARCH_SNAPSHOT_TTL_SECONDS, stale=0)
+        self.linker = RecordLinker()
+        self.ranker = BM25FRanker()
+        self.local_index = LocalSearchIndex()
+        self.enricher = MetadataEnricher(self.clients['semantic_scholar'], self.clients['openalex'])
+        self.source_stats = SourceStatsTracker()
+        self.flights = SingleFlight(
+            use_redis=settings.SEARCH_COALESCE_REDIS_LOCK,
+            lock_ttl=settings.SEARCH_COALESCE_LOCK_TTL_SECONDS,
+            wait=settings.SEARCH_COALESCE_WAIT_SECONDS,
+        )
+        self._background = set()
 
-    async def search(self, query: str, filters: Optional[Dict] = None, limit: int = 20, offset: int = 0, sort_by: str = 'relevance') -> Dict:
+    async def search(self, query: str, filters: Optional[Dict] = None, limit: int = 20, offset: int = 0,
+                     sort_by: str = 'relevance', cursor: Optional[str] = None, db=None) -> Dict:
         filters = filters or {}
-        sources_to_query = filters.get('sources')
+        if cursor:
+            page = await self._page_from_snapshot(cursor, query, filters, limit, sort_by)
+            if page is not None:
+                return page
+            # Unknown or expired cursor: fall back to an offset search from the cursor's position.
+            position = cursor.rpartition(':')[2]
+            offset = int(position) if position.isdigit() else offset
+        if offset == 0:
+            suggestion_engine.record_query(query)
+
+        payload, cached = await self._search_payload(query, filters, limit, sort_by, offset + limit, db)
+        page = self._paginate(payload, offset, limit, cached=cached)
+        page['next_cursor'] = await self._create_snapshot(payload, query, filters, limit, sort_by, offset + limit, store=not cached)
+        return page
+
+    async def _search_payload(self, query: str, filters: Dict, limit: int, sort_by: str, needed: int, db=None):
+        cache_key = SearchCache.make_key(query, filters, sort_by, limit) if settings.SEARCH_CACHE_ENABLED else None
+
+        if cache_key:
+            hit = await self.cache.get(cache_key)
+            if hit:
+                payload, fresh = hit
+                if not fresh:
+                    self.cache.schedule_refresh(cache_key, lambda: self._refresh(cache_key, query, filters, limit, sort_by))
+                return payload, True
+
+        if not settings.SEARCH_COALESCE_ENABLED:
+            return await self._compute_payload(query, filters, limit, sort_by, needed, db, cache_key)
+
+        # Identical concurrent searches share one fan-out; other workers get the leader's payload, even an uncacheable one.
+        flight_key = f"{cache_key or SearchCache.make_key(query, filters, sort_by, limit)}:{needed}"
+        return await self.flights.do(
+            flight_key,
+            lambda: self._compute_payload(query, filters, limit, sort_by, needed, db, cache_key),
+            lookup=(lambda: self._cached_payload(cache_key)) if cache_key else None,
+            share=lambda result: (SearchCache.strip(result[0]), result[1]),
+        )
+
+    async def _cached_payload(self, cache_key: str):
+        hit = await self.cache.get(cache_key)
+        return (hit[0], True) if hit else None
+
+    async def _compute_payload(self, query: str, filters: Dict, limit: int, sort_by: str, needed: int, db,
+                               cache_key: Optional[str]):
+        # Papers we already know answer the query on their own when there are enough fresh hits.
+        local_hits, stale_hits = await self.local_index.search(query, filters, db)
+        local = {'local': {'articles': local_hits}} if local_hits else {}
+        if len(local_hits) >= needed and not stale_hits and self.local_index.covers(query, filters, needed):
+            payload = self._merge_results(local, query, sort_by)
+            payload['sources_timed_out'] = []
+            return payload, False
+
+        payload = await self._fetch_ranked(query, filters, limit, sort_by, cache_key=cache_key,
+                                           deadline=settings.SEARCH_DEADLINE_SECONDS, extra=local)
+        if self._is_complete(payload):
+            upstream = sum(1 for article in payload['articles'] if set(article.get('sources') or []) - {'local'})
+            self.local_index.mark_harvested(query, filters, upstream)
+            if cache_key:
+                await self.cache.set(cache_key, payload)
+        return payload, False
+
+    def _build_snapshot(self, payload: Dict, query: str, filters: Dict, limit: int, sort_by: str) -> Dict:
+        counts = payload.get('source_counts', {})
+        next_offsets = payload.get('source_next_offsets', {})
+        source_offsets = {}
+        for name in self._select_clients(filters):
+            # Sources that timed out, failed or were skipped in favour of local hits start from their first page.
+            if name not in counts:
+                source_offsets[name] = 0
+            elif counts[name] < payload.get('source_limits', {}).get(name, limit):
+                source_offsets[name] = None
+            else:
+                # Cursor-paged sources (OpenAlex) hand back where to resume; the rest resume at the record count.
+                source_offsets[name] = next_offsets.get(name, counts[name])
+        return {
+            'query': query, 'filters': filters, 'limit': limit, 'sort_by': sort_by,
+            'articles': payload['articles'], 'sources_used': list(payload['sources_used']),
+            'source_offsets': source_offsets,
+            'source_misses': {name: 1 for name in payload.get('sources_timed_out', []) if name in source_offsets},
+        }
+
+    async def _create_snapshot(self, payload: Dict, query: str, filters: Dict, limit: int, sort_by: str, position: int,
+                               store: bool = True) -> Optional[str]:
+        """Cursor for the next page, or None when there is none.
+
+        Snapshots are keyed on the search cache key, so identical searches share one. Only a freshly computed payload
+        is stored, and never over an existing snapshot that someone may be paging through; a cache hit stores
+        nothing, and its snapshot is rebuilt from the cache if the next page is actually requested.
+        """
+        snapshot = self._build_snapshot(payload, query, filters, limit, sort_by)
+        if not self._has_more(snapshot, position):
+            return None
+        key = SearchCache.make_key(query, filters, sort_by, limit)
+        if store and not await self.snapshots.get(key):
+            await self.snapshots.set(key, snapshot)
+        return f"{key}:{position}"
+
+    async def _page_from_snapshot(self, cursor: str, query: str, filters: Dict, limit: int, sort_by: str) -> Optional[Dict]:
+        key, _, position = cursor.rpartition(':')
+        if not position.isdigit() or key != SearchCache.make_key(query, filters, sort_by, limit):
+            return None
+        position = int(position)
+
+        hit = await self.snapshots.get(key)
+        if hit:
+            snapshot, _ = hit
+        else:
+            cached = await self.cache.get(key) if settings.SEARCH_CACHE_ENABLED else None
+            if not cached:
+                return None
+            snapshot = self._build_snapshot(cached[0], query, filters, limit, sort_by)
+
+        if position + limit > len(snapshot['articles']) and self._has_more(snapshot, position):
+            await self._extend_snapshot(snapshot)
+            await self.snapshots.set(key, snapshot)
+        elif not hit:
+            await self.snapshots.set(key, snapshot)
+
+        page = self._paginate(snapshot, position, limit, cached=True)
+        more = bool(page['articles']) and self._has_more(snapshot, position + limit)
+        page['next_cursor'] = f"{key}:{position + limit}" if more else None
+        return page
+
+    def _has_more(self, snapshot: Dict, position: int) -> bool:
+        if position < len(snapshot['articles']):
+            return True
+        if len(snapshot['articles']) >= settings.SEARCH_SNAPSHOT_MAX_ARTICLES:
+            return False
+        return any(offset is not None for offset in snapshot['source_offsets'].values())
+
+    async def _extend_snapshot(self, snapshot: Dict) -> None:
+        """Fetch the next upstream page of every non-exhausted source and append the new records, ranked."""
+        offsets = {name: offset for name, offset in snapshot['source_offsets'].items() if offset is not None}
+        started = time.monotonic()
+        tasks = self._start_sources(snapshot['query'], snapshot['filters'], snapshot['limit'], offsets)
+        results = {name: tasks[name].result() async for name in self._as_completed(tasks, settings.SEARCH_DEADLINE_SECONDS)}
+        for task in tasks.values():
+            task.cancel()
+
+        misses = snapshot.setdefault('source_misses', {})
+        new_articles = []
+        for name in offsets:
+            result = results.get(name)
+            if not result or result.get('error'):
+                # Timed out or failed: retry the same offset next time, but give up after repeated misses.
+                misses[name] = misses.get(name, 0) + 1
+                if misses[name] >= settings.SEARCH_SNAPSHOT_SOURCE_MISSES:
+                    snapshot['source_offsets'][name] = None
+                continue
+            misses.pop(name, None)
+            articles = result.get('articles', [])
+            next_offset = result['next_offset'] if 'next_offset' in result else offsets[name] + len(articles)
+            snapshot['source_offsets'][name] = next_offset if len(articles) >= snapshot['limit'] else None
+            new_articles.extend(self._tag_source(articles, name))
+            if articles and name not in snapshot['sources_used']:
+                snapshot['sources_used'].append(name)
+
+        # Snapshots are shared by everyone paging the same search, so existing rows keep their place; they come
+        # first and are already unique, so deduplication leaves them in order and only new records are ranked.
+        existing = snapshot['articles']
+        combined = self._deduplicate_articles(existing + new_articles)
+        added = await self.enricher.enrich(combined[len(existing):], self._time_left(started, settings.SEARCH_DEADLINE_SECONDS))
+        tail = self._rank_articles(added, snapshot['sort_by'], snapshot['query'])
+        snapshot['articles'] = (existing + tail)[:settings.SEARCH_SNAPSHOT_MAX_ARTICLES]
+
+    async def _refresh(self, cache_key: str, query: str, filters: Dict, limit: int, sort_by: str) -> None:
+        try:
+            payload = await self._fetch_ranked(query, filters, limit, sort_by)
+            if self._is_complete(payload):
+                await self.cache.set(cache_key, payload)
+        except Exception as e:
+            print(f"Search cache refresh error: {e}")
+
+    def _paginate(self, payload: Dict, offset: int, limit: int, cached: bool) -> Dict:
+        # Copy the page so callers can annotate articles without mutating cached entries.
+        page = [dict(article) for article in payload['articles'][offset:offset + limit]]
+        return {
+            'total': payload.get('total', len(payload['articles'])), 'articles': page, 'sources_used': payload['sources_used'],
+            'sources_timed_out': payload.get('sources_timed_out', []), 'sources_failed': payload.get('sources_failed', []),
+            'cached': cached
+        }
 
+    def _select_clients(self, filters: Dict) -> Dict:
+        sources_to_query = filters.get('sources')
         if sources_to_query:
-            clients_to_query = {k: v for k, v in self.clients.items() if k in sources_to_query}
+            return {k: v for k, v in self.clients.items() if k in sources_to_query}
+        return self.clients
+
+    def _start_sources(self, query: str, filters: Dict, limit: int, offsets: Optional[Dict[str, Offset]] = None) -> Dict[str, asyncio.Task]:
+        clients = self._select_clients(filters)
+        if offsets is not None:
+            clients = {name: client for name, client in clients.items() if name in offsets}
+            sizes = {name: limit for name in clients}
         else:
-            clients_to_query = self.clients
+            # First pages are sized from each source's recent latency and unique yield; explicit source picks are never skipped.
+            sizes = self.source_stats.plan(clients, limit, query_class(filters), deadline=settings.SEARCH_DEADLINE_SECONDS,
+                                           allow_skip=not filters.get('sources'))
+        return {
+            name: asyncio.create_task(self._search_single_api(client, name, query, filters, sizes[name], (offsets or {}).get(name, 0)))
+            for name, client in clients.items() if sizes[name]
+        }
+
+    def _schedule_late_sources(self, results: Dict[str, Any], tasks: Dict[str, asyncio.Task],
+                               query: str, sort_by: str, cache_key: Optional[str]) -> List[str]:
+        late = {name: task for name, task in tasks.items() if name not in results}
+        if late:
+            task = asyncio.create_task(self._complete_late_sources(results, late, query, sort_by, cache_key))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return list(late)
+
+    async def _fetch_ranked(self, query: str, filters: Dict, limit: int, sort_by: str,
+                            cache_key: Optional[str] = None, deadline: Optional[float] = None,
+                            extra: Optional[Dict[str, Any]] = None) -> Dict:
+        started = time.monotonic()
+        tasks = self._start_sources(query, filters, limit)
+        results = dict(extra or {})
+        results.update({name: tasks[name].result() async for name in self._as_completed(tasks, deadline)})
+        timed_out = self._schedule_late_sources(results, tasks, query, sort_by, cache_key)
+
+        payload = await self._merge_enriched(results, query, sort_by, self._time_left(started, deadline))
+        payload['sources_timed_out'] = timed_out
+        self._record_yields(payload, filters)
+        return payload
+
+    async def search_stream(self, query: str, filters: Optional[Dict] = None, limit: int = 20, offset: int = 0,
+                            sort_by: str = 'relevance') -> AsyncIterator[Dict]:
+        """Yield 'source' events as each client resolves, an 'update' with the re-ranked page after each, then 'done'."""
+        filters = filters or {}
+        if offset == 0:
+            suggestion_engine.record_query(query)
+        cache_key = SearchCache.make_key(query, filters, sort_by, limit) if settings.SEARCH_CACHE_ENABLED else None
+
+        if cache_key:
+            hit = await self.cache.get(cache_key)
+            if hit:
+                payload, fresh = hit
+                if not fresh:
+                    self.cache.schedule_refresh(cache_key, lambda: self._refresh(cache_key, query, filters, limit, sort_by))
+                page = self._paginate(payload, offset, limit, cached=True)
+                page['next_cursor'] = await self._create_snapshot(payload, query, filters, limit, sort_by, offset + limit, store=False)
+                yield {'event': 'done', **page}
+                return
+
+        started = time.monotonic()
+        tasks = self._start_sources(query, filters, limit)
+        results = {}
+        try:
+            async for name in self._as_completed(tasks, settings.SEARCH_DEADLINE_SECONDS):
+                results[name] = tasks[name].result()
+                articles = (results[name] or {}).get('articles', [])
+                yield {'event': 'source', 'source': name, 'articles': [dict(article) for article in articles]}
+                payload = self._merge_results(results, query, sort_by, top_k=offset + limit)
+                yield {'event': 'update', **self._paginate(payload, offset, limit, cached=False)}
+        finally:
+            timed_out = self._schedule_late_sources(results, tasks, query, sort_by, cache_key)
+
+        payload = await self._merge_enriched(results, query, sort_by, self._time_left(started, settings.SEARCH_DEADLINE_SECONDS))
+        payload['sources_timed_out'] = timed_out
+        self._record_yields(payload, filters)
+        if cache_key and self._is_complete(payload):
+            await self.cache.set(cache_key, payload)
+        page = self._paginate(payload, offset, limit, cached=False)
+        page['next_cursor'] = await self._create_snapshot(payload, query, filters, limit, sort_by, offset + limit)
+        yield {'event': 'done', **page}
+
+    async def _as_completed(self, tasks: Dict[str, asyncio.Task], deadline: Optional[float]) -> AsyncIterator[str]:
+        """Yield source names as they finish, until every source's deadline (overall or per-source) passes."""
+        if not tasks:
+            return
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadlines = {}
+        for name in tasks:
+            budgets = [b for b in (deadline, settings.SEARCH_SOURCE_DEADLINES.get(name)) if b]
+            deadlines[name] = start + min(budgets) if budgets else None
+
+        pending = dict(tasks)
+        while pending:
+            now = loop.time()
+            waiting = {name: task for name, task in pending.items() if deadlines[name] is None or deadlines[name] > now}
+            if not waiting:
+                break
+            bounded = [deadlines[name] for name in waiting if deadlines[name] is not None]
+            timeout = min(bounded) - now if bounded else None
+            done, _ = await asyncio.wait(waiting.values(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for name in [name for name, task in waiting.items() if task in done]:
+                del pending[name]
+                yield name
 
-        tasks = [self._search_single_api(client, name, query, filters, limit) for name, client in clients_to_query.items()]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def _complete_late_sources(self, results: Dict[str, Any], late: Dict[str, asyncio.Task],
+                                     query: str, sort_by: str, cache_key: Optional[str]) -> None:
+        late_results = await asyncio.gather(*late.values(), return_exceptions=True)
+        if not cache_key:
+            return
+        merged = dict(results)
+        merged.update(zip(late.keys(), late_results))
+        payload = await self._merge_enriched(merged, query, sort_by)
+        if self._is_complete(payload):
+            await self.cache.set(cache_key, payload)
 
+    def _merge_results(self, results: Dict[str, Any], query: str, sort_by: str, top_k: Optional[int] = None) -> Dict:
+        payload = self._combine_results(results)
+        payload['articles'] = self._rank_articles(payload['articles'], sort_by, query, top_k)
+        return payload
+
+    async def _merge_enriched(self, results: Dict[str, Any], query: str, sort_by: str, timeout: Optional[float] = None) -> Dict:
+        """Like _merge_results, with missing abstracts and citation counts filled in (within `timeout`) before ranking."""
+        payload = self._combine_results(results)
+        await self.enricher.enrich(payload['articles'], timeout)
+        payload['articles'] = self._rank_articles(payload['articles'], sort_by, query)
+        return payload
+
+    def _time_left(self, started: float, deadline: Optional[float]) -> Optional[float]:
+        """What remains of the search budget; enrichment gets only this, so it never extends a response past it."""
+        return None if deadline is None else deadline - (time.monotonic() - started)
+
+    def _combine_results(self, results: Dict[str, Any]) -> Dict:
         all_articles = []
         sources_used = []
+        source_counts = {}
+        source_limits = {}
+        source_next_offsets = {}
+        sources_failed = []
 
-        for name, result in zip(clients_to_query.keys(), results):
-            if isinstance(result, Exception) or not result:
+        for name, result in results.items():
+            # Failed sources are left out entirely, so snapshots retry them instead of treating them as exhausted.
+            if isinstance(result, Exception) or not result or result.get('error'):
+                sources_failed.append(name)
                 continue
+            source_counts[name] = len(result.get('articles') or [])
+            if 'requested' in result:
+                source_limits[name] = result['requested']
+            if 'next_offset' in result:
+                source_next_offsets[name] = result['next_offset']
             if result.get('articles'):
-                for article in result['articles']:
-                    article['sources'] = article.get('sources', [])
-                    if name not in article['sources']:
-                        article['sources'].append(name)
-                all_articles.extend(result['articles'])
+                all_articles.extend(self._tag_source(result['articles'], name))
                 sources_used.append(name)
 
         deduplicated = self._deduplicate_articles(all_articles)
-        ranked = self._rank_articles(deduplicated, sort_by, query)
-        paginated = ranked[offset:offset + limit]
+        return {'articles': deduplicated, 'total': len(deduplicated), 'sources_used': sources_used,
+                'source_counts': source_counts, 'source_limits': source_limits, 'source_next_offsets': source_next_offsets,
+                'sources_failed': sources_failed}
+
+    def _is_complete(self, payload: Dict) -> bool:
+        """Whether every queried source answered; only then is a payload cached for the full TTL."""
+        return bool(payload['sources_used']) and not payload.get('sources_timed_out') and not payload.get('sources_failed')
 
-        return {'total': len(ranked), 'articles': paginated, 'sources_used': sources_used}
+    def _record_yields(self, payload: Dict, filters: Dict) -> None:
+        """Credit each source with the merged records only it returned."""
+        unique = dict.fromkeys(payload.get('source_counts', {}), 0)
+        for article in payload['articles']:
+            upstream = [source for source in article.get('sources', []) if source != 'local']
+            if len(upstream) == 1 and upstream[0] in unique:
+                unique[upstream[0]] += 1
+        cls = query_class(filters)
+        for name, count in unique.items():
+            if name != 'local':
+                self.source_stats.record_yield(name, cls, payload['source_counts'][name], count)
 
-    async def _search_single_api(self, client, name: str, query: str, filters: Dict, limit: int):
+    def _tag_source(self, articles: List[Dict], name: str) -> List[Dict]:
+        for article in articles:
+            article['sources'] = article.get('sources', [])
+            if name not in article['sources']:
+                article['sources'].append(name)
+        return articles
+
+    async def _search_single_api(self, client, name: str, query: str, filters: Dict, limit: int, offset: Offset = 0):
+        started = time.monotonic()
         try:
-            return await client.search(query, filters, limit)
+            result = await client.search(query, filters, limit, offset)
+            if result is not None:
+                result['requested'] = limit
+            if result and result.get('articles'):
+                self.local_index.add(result['articles'])
+            failed = result is None or bool(result.get('error'))
+            # An open circuit answers instantly without contacting the source, so it says nothing about latency.
+            seconds = None if result and result.get('circuit_open') else time.monotonic() - started
+            self.source_stats.record_call(name, seconds, ok=not failed)
+            return result
         except Exception as e:
             print(f"Error in {name}: {e}")
+            self.source_stats.record_call(name, time.monotonic() - started, ok=False)
             return None
 
     def _deduplicate_articles(self, articles: List[Dict]) -> List[Dict]:
-        seen_dois = set()
-        seen_signatures = set()
-        deduplicated = []
+        return self.linker.link(articles)
 
-        for article in articles:
-            doi = article.get('doi')
-            if doi and doi.lower() in seen_dois:
-                continue
-            if doi:
-                seen_dois.add(doi.lower())
-
-            title = article.get('title', '').lower().strip()
-            authors = article.get('authors', [])
-            year = article.get('year')
-
-            if title and authors and year:
-                author_names = ','.join([a.get('name', '') for a in authors if isinstance(a, dict)])
-                signature = hashlib.md5(f"{title}{author_names}{year}".encode()).hexdigest()
-                if signature in seen_signatures:
-                    continue
-                seen_signatures.add(signature)
-
-            deduplicated.append(article)
-
-        return deduplicated
-
-    def _rank_articles(self, articles: List[Dict], sort_by: str, query: str) -> List[Dict]:
-        if not articles:
-            return articles
-
-        if sort_by == 'recency':
-            return sorted(articles, key=lambda x: (x.get('year') or 0), reverse=True)
-        elif sort_by == 'citations':
-            return sorted(articles, key=lambda x: (x.get('citation_count') or 0), reverse=True)
-        else:
-            query_terms = set(query.lower().split())
-            def calc_score(article):
-                score = 0
-                title = article.get('title', '').lower()
-                abstract = article.get('abstract', '').lower()
-                year = article.get('year') or 0
-                citations = article.get('citation_count') or 0
-                for term in query_terms:
-                    if term in title: score += 10
-                    if term in abstract: score += 5
-                if isinstance(year, int) and year >= 2020: score += 2
-                if isinstance(citations, int) and citations >= 100: score += 3
-                return score
-            return sorted(articles, key=calc_score, reverse=True)
+    def _rank_articles(self, articles: List[Dict], sort_by: str, query: str, top_k: Optional[int] = None) -> List[Dict]:
+        return self.ranker.rank(articles, sort_by, query, top_k)
 
     async def get_suggestions(self, query: str, limit: int = 10) -> List[str]:
-        suggestions = []
-        common_terms = ["machine learning", "artificial intelligence", "psychomotor", "child development", "autism", "motor skills", "sensory integration"]
-        for term in common_terms:
-            if query.lower() in term.lower():
-                suggestions.append(term)
-                if len(suggestions) >= limit: break
-        return suggestions
+        return suggestion_engine.suggest(query, limit)
@@ -0,0 +1,177 @@
+"""Semantic answer cache - paraphrased questions about the same article share one answer"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.schemas import LLMArticleInput, LLMAskArticleResponse
+from app.services.ranking import fold
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_IMPORT_ERROR = None
+except Exception as exc:  # pragma: no cover - optional dependency
+    SentenceTransformer = None
+    SENTENCE_TRANSFORMERS_IMPORT_ERROR = str(exc)
+
+
+class ArticleAnswers:
+    """Question embeddings (unit rows) and their answers for one article, with last-use times for eviction."""
+
+    def __init__(self, dim: int):
+        self.embeddings = np.empty((0, dim), dtype=np.float32)
+        self.questions: List[str] = []
+        self.answers: List[LLMAskArticleResponse] = []
+        self.used_at: List[float] = []
+        self.stored_at: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def best(self, embedding: np.ndarray) -> Optional[tuple]:
+        if not self.answers:
+            return None
+        scores = self.embeddings @ embedding
+        index = int(scores.argmax())
+        return index, float(scores[index])
+
+    def add(self, question: str, embedding: np.ndarray, answer: LLMAskArticleResponse, max_entries: int) -> None:
+        if len(self) >= max_entries:
+            self.remove(int(np.argmin(self.used_at)))
+        now = time.time()
+        self.embeddings = np.vstack([self.embeddings, embedding[None, :]])
+        self.questions.append(question)
+        self.answers.append(answer)
+        self.used_at.append(now)
+        self.stored_at.append(now)
+
+    def remove(self, index: int) -> None:
+        self.embeddings = np.delete(self.embeddings, index, axis=0)
+        for values in (self.questions, self.answers, self.used_at, self.stored_at):
+            del values[index]
+
+
+class SemanticAnswerCache:
+    """ask_article answers keyed by article identity and language, looked up by question embedding similarity.
+
+    A question whose cosine similarity to a cached one reaches ASK_CACHE_SIMILARITY reuses its answer without an
+    LLM call. Each article keeps at most ASK_CACHE_MAX_PER_ARTICLE questions (least recently used go first), and
+    the least recently asked-about articles are dropped beyond ASK_CACHE_MAX_ARTICLES. The embedding model is
+    loaded (downloaded on first run) in the background from startup; until it is ready questions bypass the cache
+    rather than wait, and a failed load is retried after ASK_CACHE_MODEL_RETRY_SECONDS. Without
+    sentence-transformers the cache stays disabled.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, max_per_article: Optional[int] = None, max_articles: Optional[int] = None):
+        self.threshold = threshold if threshold is not None else settings.ASK_CACHE_SIMILARITY
+        self.max_per_article = max_per_article or settings.ASK_CACHE_MAX_PER_ARTICLE
+        self.max_articles = max_articles or settings.ASK_CACHE_MAX_ARTICLES
+        self.articles: "OrderedDict[str, ArticleAnswers]" = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'embed_errors': 0}
+        self._model = None
+        self._model_error: Optional[str] = None
+        self._loading: Optional[asyncio.Task] = None
+        self._retry_at = 0.0
+
+    @staticmethod
+    def article_key(article: LLMArticleInput, language: str) -> str:
+        if article.doi:
+            identity = f"doi:{article.doi.strip().lower()}"
+        else:
+            identity = "title:" + hashlib.sha1(f"{fold(article.title).strip()}|{article.year or ''}".encode()).hexdigest()
+        return f"{language.lower()}|{identity}"
+
+    @property
+    def enabled(self) -> bool:
+        return settings.ASK_CACHE_ENABLED and SentenceTransformer is not None
+
+    def get(self, article: LLMArticleInput, language: str, embedding: Optional[np.ndarray]) -> Optional[LLMAskArticleResponse]:
+        if embedding is None:
+            return None
+        key = self.article_key(article, language)
+        entries = self.articles.get(key)
+        match = entries.best(embedding) if entries is not None else None
+        if match is not None:
+            index, score = match
+            if score >= self.threshold and time.time() - entries.stored_at[index] <= settings.ASK_CACHE_TTL_SECONDS:
+                entries.used_at[index] = time.time()
+                self.articles.move_to_end(key)
+                self.stats['hits'] += 1
+                return entries.answers[index]
+        self.stats['misses'] += 1
+        return None
+
+    def set(self, article: LLMArticleInput, question: str, language: str, embedding: Optional[np.ndarray], answer: LLMAskArticleResponse) -> None:
+        if embedding is None or not answer.answer:
+            return
+        key = self.article_key(article, language)
+        entries = self.articles.get(key)
+        if entries is None:
+            entries = self.articles[key] = ArticleAnswers(embedding.shape[0])
+        else:
+            self.articles.move_to_end(key)
+        if len(entries) >= self.max_per_article:
+            self.stats['evictions'] += 1
+        entries.add(question, embedding, answer, self.max_per_article)
+        while len(self.articles) > self.max_articles:
+            _, dropped = self.articles.popitem(last=False)
+            self.stats['evictions'] += len(dropped)
+
+    async def embed(self, question: str) -> Optional[np.ndarray]:
+        """Unit-length embedding of the question, or None when the cache is disabled or the model is not loaded yet."""
+        if not self.enabled:
+            return None
+        model = self._model
+        if model is None:
+            self.start_loading()
+            return None
+        try:
+            vector = await asyncio.to_thread(model.encode, ' '.join(question.split()), normalize_embeddings=True)
+            return np.asarray(vector, dtype=np.float32)
+        except Exception as e:
+            self.stats['embed_errors'] += 1
+            print(f"Question embedding error: {e}")
+            return None
+
+    def start_loading(self) -> None:
+        """Begin loading the model in the background unless it is loaded, loading or waiting out a failure."""
+        if not self.enabled or self._model is not None or (self._loading and not self._loading.done()):
+            return
+        if time.monotonic() < self._retry_at:
+            return
+        try:
+            self._loading = asyncio.get_running_loop().create_task(self._load())
+        except RuntimeError:
+            pass  # no event loop yet; the next question starts it
+
+    async def _load(self) -> None:
+        try:
+            self._model = await asyncio.to_thread(SentenceTransformer, settings.ASK_CACHE_MODEL)
+            self._model_error = None
+        except Exception as e:
+            self._model_error = str(e)
+            self._retry_at = time.monotonic() + settings.ASK_CACHE_MODEL_RETRY_SECONDS
+            print(f"Semantic answer cache model unavailable, retrying in {settings.ASK_CACHE_MODEL_RETRY_SECONDS}s: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['misses']
+        if not self.enabled:
+            issue = SENTENCE_TRANSFORMERS_IMPORT_ERROR if settings.ASK_CACHE_ENABLED else 'disabled by ASK_CACHE_ENABLED'
+        else:
+            issue = None if self._model is not None else (self._model_error or 'model loading')
+        return {
+            'enabled': self.enabled,
+            'ready': self._model is not None,
+            'issue': issue,
+            'model': settings.ASK_CACHE_MODEL,
+            'threshold': self.threshold,
+            **self.stats,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+            'articles': len(self.articles),
+            'entries': sum(len(entries) for entries in self.articles.values()),
+        }
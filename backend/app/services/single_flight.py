@@ -0,0 +1,103 @@
+"""Single-flight - concurrent callers with the same key share one execution"""
+
+import asyncio
+import secrets
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.redis import get_redis
+from app.core.serialization import pack, unpack
+
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """Coalesces identical in-flight work within the process and, optionally, across workers.
+
+    Across workers the first caller takes a Redis lock and publishes its result (passed through `share`, which
+    should trim it to what followers need) under the flight key for `wait` seconds, so results that are never
+    cached (e.g. partial ones) still reach the others. Followers
+    poll that key, and `lookup` (usually a shared cache read) if given, until a result appears, the lock is
+    released, or `wait` runs out. Results are shared as JSON, so tuples come back as lists.
+    """
+
+    PREFIX = "singleflight:"
+    POLL_SECONDS = 0.05
+
+    def __init__(self, use_redis: bool = False, lock_ttl: float = 10.0, wait: float = 5.0):
+        self.use_redis = use_redis
+        self.lock_ttl = lock_ttl
+        self.wait = wait
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]],
+                 lookup: Optional[Callable[[], Awaitable[Any]]] = None,
+                 share: Optional[Callable[[Any], Any]] = None) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run(key, fn, lookup, share))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller going away does not cancel the work the others are waiting on.
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]], lookup: Optional[Callable[[], Awaitable[Any]]],
+                   share: Optional[Callable[[Any], Any]]) -> Any:
+        redis = get_redis() if self.use_redis else None
+        if redis is None:
+            return await fn()
+
+        lock_key = self.PREFIX + key
+        result_key = self.PREFIX + "result:" + key
+        token = secrets.token_hex(8)
+        try:
+            acquired = await redis.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+        except Exception as e:
+            print(f"Single-flight lock error: {e}")
+            return await fn()
+
+        if acquired:
+            try:
+                result = await fn()
+                try:
+                    await redis.set(result_key, pack(share(result) if share else result), px=int(self.wait * 1000))
+                except Exception as e:
+                    print(f"Single-flight publish error: {e}")
+                return result
+            finally:
+                try:
+                    await redis.eval(RELEASE_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    print(f"Single-flight unlock error: {e}")
+
+        deadline = time.monotonic() + self.wait
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.POLL_SECONDS)
+            result = await self._shared(redis, result_key, lookup)
+            if result is not None:
+                return result
+            try:
+                if not await redis.exists(lock_key):
+                    break
+            except Exception:
+                break
+        # The leader failed or is taking too long; do the work ourselves.
+        result = await self._shared(redis, result_key, lookup)
+        return result if result is not None else await fn()
+
+    async def _shared(self, redis, result_key: str, lookup: Optional[Callable[[], Awaitable[Any]]]) -> Any:
+        try:
+            data = await redis.get(result_key)
+        except Exception:
+            data = None
+        if data is not None:
+            return unpack(data)
+        return await lookup() if lookup else None
@@ -0,0 +1,93 @@
+"""Rolling per-source statistics used to size (or skip) each upstream request"""
+
+import random
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+FILTER_KEYS = ('year', 'open_access', 'type')
+
+
+def query_class(filters: Dict) -> str:
+    """Coarse query class: the active filters, since sources differ mostly in which ones they honour."""
+    active = [key for key in FILTER_KEYS if filters.get(key)]
+    return '+'.join(active) or 'default'
+
+
+class SourceStats:
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.errors = deque(maxlen=window)
+        self.yields: Dict[str, deque] = {}
+        self.window = window
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        return float(np.percentile(self.latencies, q)) if self.latencies else None
+
+    def error_rate(self) -> float:
+        return sum(self.errors) / len(self.errors) if self.errors else 0.0
+
+    def unique_yield(self, cls: str) -> Optional[float]:
+        """Share of returned records that no other source also returned, over the recent window."""
+        samples = self.yields.get(cls)
+        if not samples:
+            return None
+        returned = sum(r for r, _ in samples)
+        return sum(u for _, u in samples) / returned if returned else 0.0
+
+    def samples(self, cls: str) -> int:
+        return len(self.yields.get(cls, ()))
+
+
+class SourceStatsTracker:
+    def __init__(self, window: Optional[int] = None):
+        self.window = window or settings.SOURCE_STATS_WINDOW
+        self.stats: Dict[str, SourceStats] = {}
+
+    def get(self, name: str) -> SourceStats:
+        if name not in self.stats:
+            self.stats[name] = SourceStats(self.window)
+        return self.stats[name]
+
+    def record_call(self, name: str, seconds: Optional[float], ok: bool) -> None:
+        """Record one call; `seconds` is None when the source was never contacted (open circuit)."""
+        stats = self.get(name)
+        if seconds is not None:
+            stats.latencies.append(seconds)
+        stats.errors.append(not ok)
+
+    def record_yield(self, name: str, cls: str, returned: int, unique: int) -> None:
+        if returned:
+            self.get(name).yields.setdefault(cls, deque(maxlen=self.window)).append((returned, unique))
+
+    def plan(self, names: Iterable[str], limit: int, cls: str, deadline: Optional[float] = None,
+             allow_skip: bool = True) -> Dict[str, int]:
+        """Request size per source; 0 means skip it for this query.
+
+        Sources whose unique yield falls below SOURCE_STATS_TARGET_YIELD are asked for proportionally fewer
+        records, slow ones (p90 beyond the deadline) for smaller pages. Skipped sources are still tried now
+        and then so their statistics can recover.
+        """
+        sizes = {}
+        floor = max(settings.SOURCE_STATS_MIN_FETCH, 1)
+        for name in names:
+            stats = self.get(name)
+            if not settings.SOURCE_STATS_ADAPTIVE or stats.samples(cls) < settings.SOURCE_STATS_MIN_SAMPLES:
+                sizes[name] = limit
+                continue
+
+            unique_yield = stats.unique_yield(cls) or 0.0
+            low_value = unique_yield < settings.SOURCE_STATS_SKIP_YIELD or stats.error_rate() > settings.SOURCE_STATS_SKIP_ERROR_RATE
+            if allow_skip and low_value and random.random() >= settings.SOURCE_STATS_EXPLORE_RATE:
+                sizes[name] = 0
+                continue
+
+            scale = min(1.0, unique_yield / settings.SOURCE_STATS_TARGET_YIELD)
+            p90 = stats.latency_percentile(90)
+            if deadline and p90 and p90 > deadline:
+                scale *= deadline / p90
+            sizes[name] = min(limit, max(floor, int(round(limit * scale))))
+        return sizes
@@ -8,6 +8,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Paper, Collection, SavedPaper
 from app.schemas import SummaryRequest, SummaryResponse, CollectionSummaryRequest, CollectionSummaryResponse
 from app.core.config import settings
+from app.services.llm_cache import LLMResponseCache
+from app.services.jobs import JobCancelled
+from app.services.map_reduce import DIGEST_PROGRESS_SHARE, MapReduce, Progress, scaled
+from app.services.tokens import count_tokens
 
 try:
     from openai import AsyncOpenAI
@@ -18,6 +22,22 @@ except Exception:  # pragma: no cover - optional dependency in local no-DB mode
 class SummaryService:
     def __init__(self):
         self.openai = AsyncOpenAI(api_key=settings.OPENAI_API_KEY) if (settings.OPENAI_API_KEY and AsyncOpenAI) else None
+        self.cache = LLMResponseCache()
+        self.map_reduce = MapReduce(self._digest)
+
+    async def _digest(self, prompt: str) -> str:
+        messages = [{"role": "user", "content": prompt}]
+        key = LLMResponseCache.make_key(settings.LLM_MODEL, messages, temperature=0.2)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+        response = await self.openai.chat.completions.create(
+            model=settings.LLM_MODEL, messages=messages, temperature=0.2, max_tokens=settings.LLM_MAX_TOKENS
+        )
+        content = (response.choices[0].message.content or "").strip()
+        if content:
+            await self.cache.set(key, content)
+        return content
 
     async def generate_article_summary(self, request: SummaryRequest, db: AsyncSession) -> Optional[SummaryResponse]:
         result = await db.execute(select(Paper).where(Paper.id == request.article_id))
@@ -54,6 +74,7 @@ Provide:
             content = response.choices[0].message.content
 
             paper.summary = content
+            paper.summary_language = None  # free-form text, no longer the stored quick summary
             await db.commit()
 
             return SummaryResponse(article_id=request.article_id, summary=content, generated_at=datetime.utcnow())
@@ -61,7 +82,8 @@ Provide:
             print(f"Error generating summary: {e}")
             return None
 
-    async def generate_collection_summary(self, request: CollectionSummaryRequest, db: AsyncSession) -> Optional[CollectionSummaryResponse]:
+    async def generate_collection_summary(self, request: CollectionSummaryRequest, db: AsyncSession,
+                                          progress: Optional[Progress] = None) -> Optional[CollectionSummaryResponse]:
         result = await db.execute(select(Collection).where(Collection.id == request.collection_id))
         collection = result.scalar_one_or_none()
         if not collection: return None
@@ -88,7 +110,22 @@ Provide:
             for i, p in enumerate(papers)
         ])
 
-        prompt = f"""Synthesize these {len(papers)} academic articles in {request.language}:
+        try:
+            if len(papers) >= settings.LLM_MAP_REDUCE_MIN_ARTICLES or count_tokens(papers_info) > settings.LLM_PROMPT_MAX_TOKENS:
+                # Large collections are digested chunk by chunk in parallel before the final synthesis call.
+                papers_info = await self.map_reduce.digest(
+                    [f"Paper {i+1}: {p.title} ({p.year or 'Unknown'})\n{p.abstract or 'No abstract'}" for i, p in enumerate(papers)],
+                    map_prompt=lambda chunk: f"""Condense each paper below into one paragraph of at most 80 words in {request.language}, starting with its "Paper N" label: objective, method, main findings, limitations. Do not merge papers or add information.
+
+{chunk}""",
+                    merge_prompt=lambda chunk: f"""Shorten these paper digests to at most 40 words each, keeping every "Paper N" label and its own findings. Do not merge papers.
+
+{chunk}""",
+                    reduce_tokens=settings.LLM_PROMPT_MAX_TOKENS,
+                    progress=scaled(progress, DIGEST_PROGRESS_SHARE),
+                )
+
+            prompt = f"""Synthesize these {len(papers)} academic articles in {request.language}:
 
 {papers_info}
 
@@ -99,7 +136,8 @@ Provide:
 4. NEXT STEPS: Suggested future research directions
 """
 
-        try:
+            if progress is not None:
+                await progress(DIGEST_PROGRESS_SHARE, "Writing synthesis")
             response = await self.openai.chat.completions.create(
                 model=settings.LLM_MODEL,
                 messages=[{"role": "user", "content": prompt}],
@@ -113,6 +151,8 @@ Provide:
                 article_count=len(papers), synthesis=content,
                 comparisons=[], gaps=[], next_steps=[], generated_at=datetime.utcnow()
             )
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"Error generating collection summary: {e}")
             return None
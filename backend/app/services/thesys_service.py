@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import AsyncIterator, List
 
 from app.core.config import settings
 from app.schemas import LLMArticleInput, ThesysChatMessage
+from app.services.context_packer import ContextPacker
 
 try:
     from openai import AsyncOpenAI
@@ -18,6 +19,7 @@ except Exception as exc:  # pragma: no cover
 class ThesysService:
     def __init__(self) -> None:
         self.client = None
+        self.packer = ContextPacker()
         self._init_client()
 
     def _init_client(self) -> None:
@@ -59,10 +61,48 @@ class ThesysService:
         if not self.client:
             raise RuntimeError("Thesys is not configured")
 
+        response = await self.client.chat.completions.create(
+            model=settings.THESYS_MODEL,
+            messages=self._build_messages(prompt, language, search_query, history, results, saved_articles),
+        )
+        return (response.choices[0].message.content or "").strip()
+
+    async def chat_stream(
+        self,
+        prompt: str,
+        language: str,
+        search_query: str | None,
+        history: List[ThesysChatMessage],
+        results: List[LLMArticleInput],
+        saved_articles: List[LLMArticleInput],
+    ) -> AsyncIterator[str]:
+        if not self.client:
+            raise RuntimeError("Thesys is not configured")
+
+        stream = await self.client.chat.completions.create(
+            model=settings.THESYS_MODEL,
+            messages=self._build_messages(prompt, language, search_query, history, results, saved_articles),
+            stream=True,
+        )
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+    def _build_messages(
+        self,
+        prompt: str,
+        language: str,
+        search_query: str | None,
+        history: List[ThesysChatMessage],
+        results: List[LLMArticleInput],
+        saved_articles: List[LLMArticleInput],
+    ) -> List[dict]:
         messages = [
             {
                 "role": "system",
                 "content": self._build_system_prompt(
+                    prompt=prompt,
                     language=language,
                     search_query=search_query,
                     results=results,
@@ -71,26 +111,23 @@ class ThesysService:
             }
         ]
 
-        for message in history[-10:]:
+        for message in self.packer.history(history):
             messages.append({"role": message.role, "content": message.content})
 
         messages.append({"role": "user", "content": prompt})
-
-        response = await self.client.chat.completions.create(
-            model=settings.THESYS_MODEL,
-            messages=messages,
-        )
-        return (response.choices[0].message.content or "").strip()
+        return messages
 
     def _build_system_prompt(
         self,
+        prompt: str,
         language: str,
         search_query: str | None,
         results: List[LLMArticleInput],
         saved_articles: List[LLMArticleInput],
     ) -> str:
-        result_context = self._serialize_articles(results[:10])
-        saved_context = self._serialize_articles(saved_articles[:10])
+        packed_results, packed_saved = self.packer.pack(f"{prompt} {search_query or ''}", results, saved_articles)
+        result_context = self._serialize_articles(packed_results)
+        saved_context = self._serialize_articles(packed_saved)
 
         return (
             f"You are an expert scientific research copilot for the Research Navigator app. "
@@ -105,18 +142,7 @@ class ThesysService:
             f"Do not invent studies. If the user asks for recommendations, rank them explicitly."
         )
 
-    def _serialize_articles(self, articles: List[LLMArticleInput]) -> str:
-        if not articles:
+    def _serialize_articles(self, snippets: List[str]) -> str:
+        if not snippets:
             return "No articles available."
-
-        lines = []
-        for index, article in enumerate(articles, start=1):
-            lines.append(
-                f"{index}. {article.title} | "
-                f"authors={', '.join(article.authors) if article.authors else 'N/A'} | "
-                f"year={article.year or 'N/A'} | "
-                f"journal={article.journal or 'N/A'} | "
-                f"doi={article.doi or 'N/A'} | "
-                f"abstract={(article.abstract or 'N/A')[:700]}"
-            )
-        return "\n".join(lines)
+        return "\n".join(f"{index}. {snippet}" for index, snippet in enumerate(snippets, start=1))
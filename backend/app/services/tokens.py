@@ -0,0 +1,88 @@
+"""Token counting and token-budgeted chunking for LLM prompts"""
+
+import asyncio
+import time
+from typing import List, Optional
+
+from app.core.config import settings
+
+try:
+    import tiktoken
+except Exception:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+# Rough characters per token for English and Portuguese prose, used when no tokenizer is available.
+CHARS_PER_TOKEN = 4
+
+
+# The BPE file is downloaded on first load, so loading runs in a thread off the request path (started at
+# startup); until it succeeds, counts fall back to the estimate and failed loads are retried after a pause.
+_loaded = None
+_loading: Optional[asyncio.Task] = None
+_retry_at = 0.0
+
+
+async def load_tokenizer() -> bool:
+    global _loaded, _retry_at
+    if _loaded is not None:
+        return True
+    if tiktoken is None or time.monotonic() < _retry_at:
+        return False
+    try:
+        _loaded = await asyncio.to_thread(tiktoken.get_encoding, settings.LLM_TOKENIZER_ENCODING)
+        return True
+    except Exception as e:
+        _retry_at = time.monotonic() + settings.LLM_TOKENIZER_RETRY_SECONDS
+        print(f"Tokenizer unavailable, estimating token counts: {e}")
+        return False
+
+
+def start_tokenizer_load() -> None:
+    """Begin loading in the background if it is not loaded, loading or waiting out a failure; never blocks."""
+    global _loading
+    if _loaded is not None or tiktoken is None or (_loading and not _loading.done()) or time.monotonic() < _retry_at:
+        return
+    try:
+        _loading = asyncio.get_running_loop().create_task(load_tokenizer())
+    except RuntimeError:
+        pass  # no event loop (scripts, tests): stay on the estimate
+
+
+def _encoding():
+    if _loaded is None:
+        start_tokenizer_load()
+    return _loaded
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, budget: int) -> str:
+    encoding = _encoding()
+    if encoding is None:
+        return text[:budget * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= budget else encoding.decode(tokens[:budget])
+
+
+def chunk_by_tokens(texts: List[str], budget: int) -> List[List[str]]:
+    """Greedy in-order grouping under `budget` tokens per group; a text over budget is truncated into its own group."""
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for text in texts:
+        size = count_tokens(text)
+        if size > budget:
+            text, size = truncate_tokens(text, budget), budget
+        if current and used + size > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(text)
+        used += size
+    if current:
+        chunks.append(current)
+    return chunks
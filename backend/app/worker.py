@@ -0,0 +1,60 @@
+"""Celery worker for background jobs - run with `celery -A app.worker worker`"""
+
+import asyncio
+from typing import Optional
+
+from celery import Celery
+from celery.signals import worker_process_shutdown
+
+from app.core.config import settings
+from app.core.database import async_engine
+from app.core.redis import close_redis
+
+celery_app = Celery("research_navigator", broker=settings.CELERY_BROKER_URL or settings.REDIS_URL)
+celery_app.conf.update(
+    task_acks_late=True,
+    task_ignore_result=True,
+    worker_prefetch_multiplier=1,
+)
+
+# One event loop per worker process: the cached services, Redis and the DB engine hold connections bound to
+# the loop they were first used on, so every task has to run on that same loop.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+@celery_app.task(name="research_navigator.run_job")
+def run_job(job_id: str, kind: str, payload: dict) -> None:
+    _event_loop().run_until_complete(_run_job(job_id, kind, payload))
+
+
+async def _run_job(job_id: str, kind: str, payload: dict) -> None:
+    from app.services.jobs import RedisJobStore, execute_job
+
+    await execute_job(RedisJobStore(), job_id, kind, payload, watch_cancel=True)
+
+
+@worker_process_shutdown.connect
+def _close_loop(**kwargs) -> None:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        return
+    _loop.run_until_complete(_close_connections())
+    _loop.close()
+    _loop = None
+
+
+async def _close_connections() -> None:
+    from app.services.jobs import close_services
+
+    await close_services()
+    await close_redis()
+    if async_engine is not None:
+        await async_engine.dispose()
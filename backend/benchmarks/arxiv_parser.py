@@ -0,0 +1,97 @@
+"""Compare the incremental arXiv Atom parser with feedparser.
+
+Usage (from backend/): python -m benchmarks.arxiv_parser [feed.xml] [--runs N]
+Without a file, a synthetic 100-entry feed shaped like export.arxiv.org responses is used.
+"""
+
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.api_clients.arxiv import ArxivAtomParser
+
+try:
+    import feedparser
+except ImportError:
+    feedparser = None
+
+CHUNK_SIZE = 64 * 1024
+
+ENTRY = """  <entry>
+    <id>http://arxiv.org/abs/2401.{n:05d}v2</id>
+    <updated>2024-01-{day:02d}T12:00:00Z</updated>
+    <published>2024-01-{day:02d}T12:00:00Z</published>
+    <title>Scaling laws for sparse mixture-of-experts models, part {n}</title>
+    <summary>{summary}</summary>
+{authors}
+    <arxiv:doi xmlns:arxiv="http://arxiv.org/schemas/atom">10.1234/example.{n}</arxiv:doi>
+    <link href="http://arxiv.org/abs/2401.{n:05d}v2" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.{n:05d}v2" rel="related" type="application/pdf"/>
+    <arxiv:primary_category xmlns:arxiv="http://arxiv.org/schemas/atom" term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+"""
+
+
+def synthetic_feed(entries: int = 100) -> bytes:
+    summary = " ".join(["We study how model quality scales with parameters, data and compute."] * 20)
+    body = "".join(
+        ENTRY.format(
+            n=n, day=n % 28 + 1, summary=summary,
+            authors="\n".join(f"    <author><name>Author {n}-{i}</name></author>" for i in range(8)),
+        )
+        for n in range(entries)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+        '  <title type="html">ArXiv Query: search_query=all:scaling</title>\n'
+        f'{body}</feed>\n'
+    ).encode()
+
+
+def parse_incremental(data: bytes) -> int:
+    parser = ArxivAtomParser()
+    count = 0
+    for start in range(0, len(data), CHUNK_SIZE):
+        count += len(parser.feed(data[start:start + CHUNK_SIZE]))
+    parser.close()
+    return count
+
+
+def parse_feedparser(data: bytes) -> int:
+    return len(feedparser.parse(data).entries)
+
+
+def measure(name: str, parse, data: bytes, runs: int) -> None:
+    count = parse(data)
+    started = time.perf_counter()
+    for _ in range(runs):
+        parse(data)
+    elapsed_ms = (time.perf_counter() - started) / runs * 1000
+
+    tracemalloc.start()
+    parse(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} {count:>4} entries  {elapsed_ms:8.2f} ms/feed  peak {peak / 1024:8.0f} KiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("feed", nargs="?", type=Path, help="saved arXiv API response")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    data = args.feed.read_bytes() if args.feed else synthetic_feed()
+    print(f"feed size {len(data) / 1024:.0f} KiB, {args.runs} runs")
+    measure("incremental", parse_incremental, data, args.runs)
+    if feedparser is None:
+        print("feedparser   not installed, skipped")
+    else:
+        measure("feedparser", parse_feedparser, data, args.runs)
+
+
+if __name__ == "__main__":
+    main()
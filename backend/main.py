@@ -13,14 +13,30 @@ load_dotenv()
 
 from app.core.config import settings, get_cors_origins
 from app.core.database import init_db, close_db
+from app.core.redis import close_redis
+from app.core.serialization import DefaultResponse
+from app.api_clients import UPSTREAM_CLIENTS
+from app.api_clients.transport import init_transport, close_transport
+from app.services.autocomplete import suggestion_engine
+from app.services.jobs import close_jobs
+from app.services.tokens import start_tokenizer_load
 from app.api.v1 import api_router
+from app.api.v1.endpoints.llm import llm_service
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await init_transport(client.BASE_URL for client in UPSTREAM_CLIENTS)
+    await suggestion_engine.start()
+    start_tokenizer_load()
+    llm_service.answers.start_loading()
     print("🚀 Research Navigator API started")
     yield
+    await suggestion_engine.stop()
+    await close_jobs()
+    await close_transport()
+    await close_redis()
     await close_db()
     print("👋 Research Navigator API stopped")
 
@@ -30,6 +46,7 @@ app = FastAPI(
     description="LLM-powered scientific research assistant",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=DefaultResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
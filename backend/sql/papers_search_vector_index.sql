@@ -0,0 +1,6 @@
+-- GIN index behind the local full-text search (app/models/paper.py, paper_search_vector()).
+-- The expression must stay identical to _search_vector() or the planner will not use the index.
+-- CONCURRENTLY avoids locking writes on a populated table; run outside a transaction (psql's default):
+--   psql "$DATABASE_URL_SYNC" -f backend/sql/papers_search_vector_index.sql
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_papers_search_vector ON papers
+    USING gin (to_tsvector('simple'::regconfig, coalesce(title, '') || ' ' || coalesce(abstract, '')));
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Run without Postgres, Redis or outbound enrichment calls; must be set before app settings are imported.
+os.environ.setdefault("DISABLE_DB", "true")
+os.environ.setdefault("REDIS_URL", "")
+os.environ.setdefault("ENRICHMENT_ENABLED", "false")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,64 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from app.api_clients.arxiv import ArxivAtomParser, ArxivClient
+
+ENTRY = """<entry>
+<id>http://arxiv.org/abs/{id}v2</id>
+<published>2021-03-04T00:00:00Z</published>
+<title>Attention   is all
+ you need, again</title>
+<summary>We revisit
+  transformers.</summary>
+<author><name>Ada Lovelace</name></author><author><name>Alan Turing</name></author>
+<arxiv:doi>10.1000/{id}</arxiv:doi>
+<link href="http://arxiv.org/abs/{id}v2" rel="alternate" type="text/html"/>
+<link href="http://arxiv.org/pdf/{id}v2" rel="related" type="application/pdf"/>
+</entry>"""
+FEED = ('<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">'
+        '<title>query</title>' + ENTRY.format(id='2103.00001') + ENTRY.format(id='2103.00002') + '</feed>').encode()
+
+
+def chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_entries_are_extracted_across_chunk_boundaries():
+    parser = ArxivAtomParser()
+    entries = [entry for chunk in chunks(FEED, 29) for entry in parser.feed(chunk)]
+    parser.close()
+
+    assert [e['arxiv_id'] for e in entries] == ['2103.00001', '2103.00002']
+    first = entries[0]
+    assert first['title'] == 'Attention is all you need, again'
+    assert first['abstract'] == 'We revisit transformers.'
+    assert first['authors'] == [{'name': 'Ada Lovelace'}, {'name': 'Alan Turing'}]
+    assert (first['year'], first['doi'], first['url']) == (2021, '10.1000/2103.00001', 'http://arxiv.org/abs/2103.00001v2')
+
+
+def test_closed_entries_are_dropped_from_the_tree():
+    parser = ArxivAtomParser()
+    parser.feed(FEED)
+
+    assert len(parser._root) == 1  # only the feed <title> is left
+
+
+def test_search_streams_the_feed_into_normalized_articles():
+    class StreamedArxiv(ArxivClient):
+        @asynccontextmanager
+        async def _stream(self, method, url, **kwargs):
+            self.params = kwargs['params']
+
+            class Response:
+                async def aiter_bytes(self):
+                    for chunk in chunks(FEED, 64):
+                        yield chunk
+
+            yield Response()
+
+    client = StreamedArxiv()
+    result = asyncio.run(client.search('transformers', {}, limit=250, offset=40))
+
+    assert client.params == {"search_query": "all:transformers", "start": 40, "max_results": 100}
+    assert [a['arxiv_id'] for a in result['articles']] == ['2103.00001', '2103.00002']
+    assert result['articles'][0]['journal'] == 'arXiv' and result['articles'][0]['open_access']
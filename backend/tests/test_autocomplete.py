@@ -0,0 +1,83 @@
+import asyncio
+
+from app.core.config import settings
+from app.services import autocomplete
+from app.services.autocomplete import SuggestionEngine
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def hincrby(self, key, field, amount):
+        self.ops.append((key, field, amount))
+
+    async def execute(self):
+        for key, field, amount in self.ops:
+            hash_ = self.redis.hashes.setdefault(key, {})
+            hash_[field] = hash_.get(field, 0) + amount
+
+
+class FakeRedis:
+    """Returns bytes like redis.asyncio does."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def hscan_iter(self, key, count=None):
+        for field, value in list(self.hashes.get(key, {}).items()):
+            yield field.encode(), str(value).encode()
+
+
+def test_queries_logged_by_another_worker_reach_this_index_on_the_next_tick(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(autocomplete, "get_redis", lambda: redis)
+    logging_worker, other_worker = SuggestionEngine(), SuggestionEngine()
+
+    async def tick(engine):
+        # One iteration of the rebuild loop.
+        await engine._flush_queries()
+        await engine._load_queries()
+        if engine._dirty:
+            await engine.rebuild()
+
+    async def run():
+        for _ in range(3):
+            logging_worker.record_query("Graph neural networks")
+        await tick(logging_worker)
+        await tick(other_worker)
+        await tick(logging_worker)
+
+    asyncio.run(run())
+
+    assert other_worker.suggest("graph") == ["graph neural networks"]
+    assert other_worker.weights["graph neural networks"] == 3 * settings.SUGGEST_QUERY_WEIGHT
+    # Its own flushed counts are not added a second time when the worker reloads the shared hash.
+    assert logging_worker.weights["graph neural networks"] == 3 * settings.SUGGEST_QUERY_WEIGHT
+
+
+def test_reload_adds_only_counts_logged_since_the_last_load(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(autocomplete, "get_redis", lambda: redis)
+    engine = SuggestionEngine()
+    redis.hashes[SuggestionEngine.REDIS_KEY] = {"autism screening": 2}
+
+    async def run():
+        await engine._load_queries()
+        await engine._load_queries()
+        redis.hashes[SuggestionEngine.REDIS_KEY]["autism screening"] += 1
+        await engine._load_queries()
+
+    asyncio.run(run())
+
+    assert engine.weights["autism screening"] == 3 * settings.SUGGEST_QUERY_WEIGHT
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from app.api_clients import http_cache
+from app.api_clients.base import BaseClient
+from app.api_clients.http_cache import HTTPCache, freshness_lifetime
+
+
+class ScriptedTransport:
+    """Stands in for the shared httpx client; records each request and answers with the next scripted response."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def build_request(self, method, url, **kwargs):
+        kwargs.pop("timeout", None)
+        return httpx.Request(method, url, **kwargs)
+
+    async def send(self, request, stream=False):
+        self.requests.append(request)
+        status, headers, content = self.responses.pop(0)
+        if stream:
+            return httpx.Response(status, headers=headers, stream=httpx.ByteStream(content), request=request)
+        return httpx.Response(status, headers=headers, content=content, request=request)
+
+
+class CachedClient(BaseClient):
+    SOURCE = "http-cache-test"
+
+    def __init__(self, transport):
+        super().__init__()
+        self.transport = transport
+
+    @property
+    def client(self):
+        return self.transport
+
+    async def search(self, query, filters, limit, offset=0):
+        return {'articles': []}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = HTTPCache()
+    monkeypatch.setattr(http_cache, '_cache', cache)
+    return cache
+
+
+def lifetime(**headers):
+    return freshness_lifetime(httpx.Response(200, headers={k.replace('_', '-'): v for k, v in headers.items()}))
+
+
+def test_freshness_follows_cache_control_then_expires_then_heuristic():
+    now = time.time()
+    assert lifetime(cache_control="public, max-age=60") == 60.0
+    assert lifetime(cache_control="max-age=60, s-maxage=600") == 600.0
+    assert lifetime(cache_control="max-age=60", expires=formatdate(now + 3600, usegmt=True)) == 60.0
+    assert lifetime(date=formatdate(now, usegmt=True), expires=formatdate(now + 120, usegmt=True)) == pytest.approx(120, abs=1)
+    assert lifetime(date=formatdate(now, usegmt=True), last_modified=formatdate(now - 1000, usegmt=True)) == pytest.approx(100, abs=1)
+    assert lifetime(cache_control="no-cache, max-age=60") == 0.0
+    assert lifetime() == 0.0
+
+
+def test_no_store_and_vary_star_are_never_stored_even_with_an_override():
+    assert lifetime(cache_control="no-store") is None
+    assert lifetime(vary="*") is None
+    assert freshness_lifetime(httpx.Response(200, headers={"cache-control": "no-store"}), override=300) is None
+    assert freshness_lifetime(httpx.Response(200, headers={"cache-control": "max-age=5"}), override=300) == 300
+
+
+def test_fresh_hit_is_served_without_contacting_the_upstream(cache):
+    transport = ScriptedTransport((200, {"cache-control": "max-age=60"}, b"body"))
+    client = CachedClient(transport)
+
+    async def run():
+        first = await client._get("https://api.example.org/works?q=x")
+        second = await client._get("https://api.example.org/works?q=x")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert len(transport.requests) == 1
+    assert first.content == second.content == b"body"
+
+
+def test_stale_entry_is_revalidated_with_validators_and_a_304_reuses_the_body(cache):
+    transport = ScriptedTransport(
+        (200, {"cache-control": "no-cache", "etag": '"v1"', "last-modified": "Tue, 01 Oct 2024 00:00:00 GMT"}, b"body"),
+        (304, {"cache-control": "max-age=60"}, b""),
+    )
+    client = CachedClient(transport)
+
+    async def run():
+        await client._get("https://api.example.org/works/1")
+        revalidated = await client._get("https://api.example.org/works/1")
+        fresh = await client._get("https://api.example.org/works/1")
+        return revalidated, fresh
+
+    revalidated, fresh = asyncio.run(run())
+
+    conditional = transport.requests[1]
+    assert conditional.headers["if-none-match"] == '"v1"'
+    assert conditional.headers["if-modified-since"] == "Tue, 01 Oct 2024 00:00:00 GMT"
+    assert revalidated.status_code == 200 and revalidated.content == b"body"
+    # The 304's max-age restarted the freshness clock, so the third call never left the process.
+    assert len(transport.requests) == 2 and fresh.content == b"body"
+
+
+def test_no_store_and_errors_bypass_the_cache(cache):
+    transport = ScriptedTransport(
+        (200, {"cache-control": "no-store"}, b"secret"),
+        (200, {"cache-control": "no-store"}, b"secret"),
+        (404, {"cache-control": "max-age=60"}, b"missing"),
+    )
+    client = CachedClient(transport)
+
+    async def run():
+        await client._get("https://api.example.org/private")
+        await client._get("https://api.example.org/private")
+        with pytest.raises(httpx.HTTPStatusError):
+            await client._get("https://api.example.org/gone")
+
+    asyncio.run(run())
+
+    assert len(transport.requests) == 3
+    assert not cache._memory
+
+
+def test_streamed_body_is_stored_once_fully_read(cache):
+    transport = ScriptedTransport((200, {"cache-control": "max-age=60"}, b"streamed body"))
+    client = CachedClient(transport)
+
+    async def run():
+        async with client._stream("GET", "https://api.example.org/feed") as response:
+            assert not cache._memory
+            streamed = b"".join([chunk async for chunk in response.aiter_bytes()])
+        cached = await client._get("https://api.example.org/feed")
+        return streamed, cached
+
+    streamed, cached = asyncio.run(run())
+
+    assert streamed == cached.content == b"streamed body"
+    assert len(transport.requests) == 1
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.schemas import LLMArticleInput
+from app.services import jobs
+from app.services.jobs import MemoryJobStore, execute_job
+from app.services.llm_service import LLMService
+from app.services.map_reduce import MapReduce
+
+SYNTHESIS = "INTRODUCAO: a.\nCONVERGENCIAS: b.\nDIVERGENCIAS: c.\nLACUNAS: d.\nRECOMENDACOES: e.\nREFERENCIAS_APA: f."
+
+
+class RecordingStore(MemoryJobStore):
+    def __init__(self):
+        super().__init__()
+        self.progress = []
+
+    async def update(self, job_id, **fields):
+        if 'progress' in fields and fields.get('status') != 'succeeded':
+            self.progress.append(fields['progress'])
+        await super().update(job_id, **fields)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, 'LLM_MAP_REDUCE_MIN_ARTICLES', 4)
+    service = LLMService()
+    service.client = object()
+    service.digests = []
+
+    async def complete(prompt):
+        if prompt.lstrip().startswith("Condense"):
+            await asyncio.sleep(0)
+            service.digests.append(prompt)
+            return f"[P{len(service.digests)}] digest"
+        return SYNTHESIS
+
+    service._complete = complete
+    # One paper per chunk, one chunk at a time, so every digest is its own progress step.
+    service.map_reduce = MapReduce(complete, chunk_tokens=1, concurrency=1)
+    monkeypatch.setitem(jobs._services, 'LLMService', service)
+    return service
+
+
+def payload(count):
+    articles = [LLMArticleInput(title=f"Paper {i}", abstract="Findings.").model_dump() for i in range(count)]
+    return {'articles': articles, 'synthesis_type': 'narrative', 'size': 'short', 'language': 'en'}
+
+
+def test_synthesis_job_reports_progress_per_digested_chunk(service):
+    store = RecordingStore()
+
+    async def run():
+        await store.create({'id': 'j', 'kind': 'llm.synthesize', 'status': 'queued', 'progress': 0.0})
+        await execute_job(store, 'j', 'llm.synthesize', payload(5))
+        return await store.get('j')
+
+    job = asyncio.run(run())
+
+    assert job['status'] == 'succeeded' and job['progress'] == 1.0
+    assert len(service.digests) == 5
+    # Started, one step per chunk, then the final synthesis call: strictly rising and short of done until it is.
+    assert len(store.progress) == 1 + 5 + 1
+    assert store.progress == sorted(set(store.progress))
+    assert store.progress[0] == jobs.STARTED_PROGRESS and store.progress[-1] < 1.0
+
+
+def test_cancelling_mid_digest_stops_the_remaining_chunks(service):
+    store = RecordingStore()
+    complete = service.map_reduce.complete
+
+    async def cancel_after_first(prompt):
+        text = await complete(prompt)
+        await MemoryJobStore.update(store, 'j', status='cancelled')
+        return text
+
+    service.map_reduce.complete = cancel_after_first
+
+    async def run():
+        await store.create({'id': 'j', 'kind': 'llm.synthesize', 'status': 'queued', 'progress': 0.0})
+        await execute_job(store, 'j', 'llm.synthesize', payload(5))
+        await asyncio.sleep(0.01)
+        return await store.get('j')
+
+    job = asyncio.run(run())
+
+    assert job['status'] == 'cancelled'
+    assert len(service.digests) == 1
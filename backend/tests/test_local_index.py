@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.local_index import EmbeddedIndex
+from app.services.search_service import SearchService
+
+
+class CountingClient:
+    def __init__(self, titles):
+        self.titles = titles
+        self.queries = []
+
+    async def search(self, query, filters, limit, offset=0):
+        self.queries.append(query)
+        terms = query.lower().split()
+        matching = [title for title in self.titles if all(term in title.lower().split() for term in terms)]
+        return {'articles': [
+            {'title': title, 'doi': f'10.1/{i}', 'year': 2020, 'authors': [], 'abstract': ''}
+            for i, title in enumerate(matching[offset:offset + limit], start=offset)
+        ]}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, 'SEARCH_CACHE_ENABLED', False)
+    monkeypatch.setattr(settings, 'LOCAL_INDEX_ENABLED', True)
+    monkeypatch.setattr(settings, 'SOURCE_STATS_ADAPTIVE', False)
+    monkeypatch.setattr(settings, 'SEARCH_DEADLINE_SECONDS', 1.0)
+    service = SearchService()
+    titles = [f'neural nets study {i}' for i in range(30)] + [f'fishing nets survey {i}' for i in range(30)]
+    service.clients = {'fake': CountingClient(titles)}
+    return service
+
+
+def test_broad_query_still_fans_out_after_a_narrower_one(service):
+    async def run():
+        await service.search('neural nets', {}, limit=10)
+        return await service.search('nets', {}, limit=10)
+
+    page = asyncio.run(run())
+
+    assert service.clients['fake'].queries == ['neural nets', 'nets']
+    assert 'fake' in page['sources_used']
+
+
+def test_repeated_fully_harvested_query_is_served_locally(service):
+    async def run():
+        await service.search('neural nets', {}, limit=10)
+        return await service.search('Neural  nets', {}, limit=10)
+
+    page = asyncio.run(run())
+
+    assert service.clients['fake'].queries == ['neural nets']
+    assert page['sources_used'] == ['local'] and len(page['articles']) == 10
+
+
+def test_embedded_hits_are_the_most_relevant_matches():
+    index = EmbeddedIndex()
+    filler = ' '.join(f'word{j}' for j in range(40))
+    index.add([{'title': f'nets {i}', 'doi': f'10.1/other.{i}', 'abstract': f'neural {filler}'} for i in range(50)])
+    index.add([{'title': 'graph neural nets', 'doi': '10.1/best', 'abstract': 'neural nets for graphs, neural nets'}])
+
+    hits = index.search('neural nets', {}, limit=1)
+
+    assert [article['doi'] for article, _ in hits] == ['10.1/best']
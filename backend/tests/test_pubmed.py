@@ -0,0 +1,115 @@
+import asyncio
+
+from app.api_clients.pubmed import PubMedClient, PubmedXMLParser
+
+ARTICLE = """<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>
+<Journal><Title>Trials</Title><JournalIssue><PubDate><Year>2021</Year></PubDate></JournalIssue></Journal>
+<ArticleTitle>Effect of <i>X</i> on Y</ArticleTitle>
+<Abstract><AbstractText Label="BACKGROUND">Why.</AbstractText><AbstractText Label="RESULTS">It works.</AbstractText></Abstract>
+<AuthorList><Author><LastName>Silva</LastName><ForeName>Ana</ForeName></Author><Author><CollectiveName>Trial Group</CollectiveName></Author></AuthorList>
+<PublicationTypeList><PublicationType>Review</PublicationType></PublicationTypeList>
+</Article><MeshHeadingList><MeshHeading><DescriptorName>Humans</DescriptorName></MeshHeading></MeshHeadingList></MedlineCitation>
+<PubmedData><ArticleIdList><ArticleId IdType="doi">10.1/{pmid}</ArticleId><ArticleId IdType="pmc">PMC1</ArticleId></ArticleIdList></PubmedData>
+</PubmedArticle>"""
+
+
+class HistoryPubMed(PubMedClient):
+    """Records esearch/efetch calls instead of hitting E-utilities; the result set has `count` records."""
+
+    def __init__(self, count, expired=False):
+        super().__init__()
+        self.count = count
+        self.expired = expired
+        self.esearches = 0
+        self.efetches = []
+
+    async def _esearch(self, query):
+        self.esearches += 1
+        return {"WebEnv": f"env{self.esearches}", "query_key": "1"}, self.count
+
+    async def _efetch(self, history, retstart, retmax):
+        self.efetches.append((history["WebEnv"], retstart, retmax))
+        if self.expired and history["WebEnv"] == "env1" and retstart:
+            return []
+        return [{'pmid': str(i)} for i in range(retstart, min(retstart + retmax, self.count))]
+
+
+def test_parser_extracts_records_across_chunk_boundaries():
+    xml = ("<PubmedArticleSet>" + ARTICLE.format(pmid=1) + ARTICLE.format(pmid=2) + "</PubmedArticleSet>").encode()
+    parser = PubmedXMLParser()
+    records = []
+    for i in range(0, len(xml), 37):
+        records.extend(parser.feed(xml[i:i + 37]))
+    parser.close()
+
+    assert [r['pmid'] for r in records] == ['1', '2']
+    first = records[0]
+    assert first['title'] == 'Effect of X on Y'
+    assert first['abstract'] == 'BACKGROUND: Why.\nRESULTS: It works.'
+    assert first['authors'] == [{'name': 'Ana Silva'}, {'name': 'Trial Group'}]
+    assert (first['year'], first['doi'], first['type'], first['open_access']) == (2021, '10.1/1', 'review', True)
+    assert first['mesh_terms'] == ['Humans']
+
+
+def test_later_pages_reuse_the_history_server_result_set():
+    client = HistoryPubMed(count=45)
+
+    async def run():
+        pages = [await client.search('q', {}, 20)]
+        while pages[-1]['next_offset']:
+            pages.append(await client.search('q', {}, 20, pages[-1]['next_offset']))
+        return pages
+
+    pages = asyncio.run(run())
+
+    assert client.esearches == 1
+    assert client.efetches == [('env1', 0, 20), ('env1', 20, 20), ('env1', 40, 20)]
+    assert [len(page['articles']) for page in pages] == [20, 20, 5]
+
+
+def test_expired_result_set_falls_back_to_a_new_search():
+    client = HistoryPubMed(count=45, expired=True)
+
+    async def run():
+        first = await client.search('q', {}, 20)
+        return await client.search('q', {}, 20, first['next_offset'])
+
+    page = asyncio.run(run())
+
+    assert client.esearches == 2
+    assert client.efetches[-1] == ('env2', 20, 20)
+    assert len(page['articles']) == 20
+
+
+def test_harvest_fetches_batches_from_one_search():
+    client = HistoryPubMed(count=5000)
+
+    async def run():
+        return [len(batch) async for batch in client.iter_pages('q', {}, max_results=1200)]
+
+    assert asyncio.run(run()) == [500, 500, 200]
+    assert client.esearches == 1
+    assert [retstart for _, retstart, _ in client.efetches] == [0, 500, 1000]
+
+
+def test_known_pmids_are_posted_once_and_fetched_in_batches():
+    client = HistoryPubMed(count=0)
+    posts = []
+
+    class Posted:
+        content = b"<ePostResult><QueryKey>1</QueryKey><WebEnv>posted</WebEnv></ePostResult>"
+
+    async def request(method, url, **kwargs):
+        posts.append((method, url.rsplit('/', 1)[-1], kwargs['data']['id'].count(',') + 1))
+        return Posted()
+
+    client._request = request
+    client.count = 1200
+    pmids = [str(i) for i in range(1200)]
+
+    async def run():
+        return [len(batch) async for batch in client.iter_pmids(pmids)]
+
+    assert asyncio.run(run()) == [500, 500, 200]
+    assert posts == [('POST', 'epost.fcgi', 1200)]
+    assert {env for env, _, _ in client.efetches} == {'posted'}
@@ -0,0 +1,47 @@
+import asyncio
+
+from app.schemas import LLMArticleInput
+from app.services.llm_service import LLMService
+from app.services.paper_summaries import _match_key
+
+RAW = "OBJETIVO: estudar X.\nMETODOLOGIA: RCT.\nPRINCIPAIS_ACHADOS: melhora.\nLIMITACOES: amostra.\nIMPLICACOES_PRATICAS: usar."
+
+
+class MemoryStore:
+    """PaperSummaryStore stand-in keyed like the real one, including the language."""
+
+    def __init__(self):
+        self.rows = {}
+
+    async def load(self, articles, language):
+        return {self.key(a): self.rows[(self.key(a), language)] for a in articles if (self.key(a), language) in self.rows}
+
+    def key(self, article):
+        return _match_key(article.doi, article.title, article.year)
+
+    async def save(self, article, response, language):
+        self.rows[(self.key(article), language)] = response
+
+
+def test_single_quick_summary_reads_and_writes_the_stored_sections():
+    service = LLMService()
+    service.summaries = MemoryStore()
+    completions = []
+
+    async def complete(prompt, *args, **kwargs):
+        completions.append(prompt)
+        return RAW
+
+    service._complete = complete
+    article = LLMArticleInput(title='A trial', year=2020, doi='10.1/trial')
+
+    async def run():
+        first = await service.quick_summary(article, 'pt-BR')
+        again = await service.quick_summary(article, 'pt-BR')
+        other_language = await service.quick_summary(article, 'en')
+        return first, again, other_language
+
+    first, again, _ = asyncio.run(run())
+
+    assert first.objetivo == 'estudar X.' and again == first
+    assert len(completions) == 2
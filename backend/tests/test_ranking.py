@@ -0,0 +1,60 @@
+import numpy as np
+
+from app.services import ranking
+from app.services.ranking import BM25FRanker, term_stats, tokenize
+
+
+def article(title, abstract='', year=None, citations=0):
+    return {'title': title, 'abstract': abstract, 'year': year, 'citation_count': citations}
+
+
+def test_tokenize_folds_accents_punctuation_and_stopwords():
+    assert tokenize('Eficácia da Vacina, em Crianças!') == ['eficacia', 'vacina', 'criancas']
+
+
+def test_term_stats_counts_terms_and_tokenizes_each_text_once(monkeypatch):
+    folded = []
+    fold = ranking.fold
+    monkeypatch.setattr(ranking, 'fold', lambda text: folded.append(text) or fold(text))
+    text = 'Cat and dog; the cat sat.'
+    ranking._field_tokens.delete(hash(text))
+
+    length, counts = term_stats(text, np.array([hash('cat'), hash('dog'), hash('bird')], dtype=np.int64))
+    term_stats(text, np.array([hash('sat')], dtype=np.int64))
+
+    assert length == 6 and counts.tolist() == [2, 1, 0]
+    assert folded == [text]
+
+
+def test_title_matches_outrank_abstract_matches():
+    ranker = BM25FRanker(recency_weight=0.0, citation_weight=0.0)
+    articles = [
+        article('Soil erosion in river basins', 'A note on vaccine supply chains.'),
+        article('Vaccine hesitancy among parents', 'Survey of parents.'),
+        article('Unrelated work', 'Nothing relevant.'),
+    ]
+
+    ranked = ranker.rank(articles, 'relevance', 'vaccine')
+
+    assert [a['title'] for a in ranked] == ['Vaccine hesitancy among parents', 'Soil erosion in river basins', 'Unrelated work']
+
+
+def test_top_k_matches_the_head_of_a_full_sort_with_ties_in_input_order():
+    ranker = BM25FRanker()
+    rng = np.random.default_rng(3)
+    articles = [article(f'paper {i}', year=int(rng.integers(2000, 2024)), citations=int(rng.integers(0, 50)))
+                for i in range(200)]
+    articles += [article('tie', year=2020, citations=10), article('tie again', year=2020, citations=10)]
+
+    for sort_by in ('relevance', 'recency', 'citations'):
+        full = ranker.rank(articles, sort_by, 'paper')
+        for k in (0, 1, 10, 150, 500):
+            assert ranker.rank(articles, sort_by, 'paper', top_k=k) == full[:k]
+
+
+def test_recency_and_citation_sorts_use_the_raw_fields():
+    ranker = BM25FRanker()
+    articles = [article('a', year=2001, citations=100), article('b', year=2023, citations=1), article('c', year=None, citations=7)]
+
+    assert [a['title'] for a in ranker.rank(articles, 'recency', '')] == ['b', 'a', 'c']
+    assert [a['title'] for a in ranker.rank(articles, 'citations', '')] == ['a', 'c', 'b']
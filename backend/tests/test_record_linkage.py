@@ -0,0 +1,70 @@
+from app.services.record_linkage import RecordLinker, article_identifiers, normalize_arxiv_id, normalize_doi, normalize_title
+
+
+def record(title, source, **fields):
+    return {'title': title, 'sources': [source], 'authors': [], 'abstract': '', **fields}
+
+
+def test_identifiers_are_normalized_across_sources():
+    assert normalize_doi('https://doi.org/10.1000/ABC.') == '10.1000/abc'
+    assert normalize_doi('doi:10.1000/abc') == '10.1000/abc'
+    assert normalize_arxiv_id('https://arxiv.org/pdf/2101.00001v2.pdf') == '2101.00001'
+    assert normalize_arxiv_id('10.48550/arXiv.2101.00001') == '2101.00001'
+    assert normalize_title('<i>Café</i> &amp; Society!') == 'cafe society'
+    assert article_identifiers({'url': 'https://pubmed.ncbi.nlm.nih.gov/12345/'})['pmid'] == '12345'
+
+
+def test_records_sharing_an_identifier_merge_with_the_best_fields():
+    linker = RecordLinker()
+    articles = [
+        record('Deep learning for protein folding', 'crossref', doi='10.1000/x', year=2021, citation_count=5),
+        record('Other work entirely about rivers', 'openalex', doi='10.1000/y', year=2020),
+        record('Deep learning for protein folding', 'semantic_scholar', doi='https://doi.org/10.1000/X',
+               abstract='A longer abstract.', citation_count=12, open_access=True),
+    ]
+
+    linked = linker.link(articles)
+
+    assert [a['doi'] for a in linked] == ['10.1000/x', '10.1000/y']
+    merged = linked[0]
+    assert merged['sources'] == ['crossref', 'semantic_scholar']
+    assert merged['abstract'] == 'A longer abstract.'
+    assert merged['citation_count'] == 12 and merged['open_access']
+
+
+def test_near_identical_titles_link_without_identifiers():
+    linker = RecordLinker()
+    articles = [
+        record('A randomized trial of vitamin D in older adults', 'pubmed', year=2019, pmid='111'),
+        record('A Randomized Trial of Vitamin-D in Older Adults.', 'arxiv', year=2019),
+        record('A randomized trial of vitamin D in children', 'core', year=2019),
+    ]
+
+    linked = linker.link(articles)
+
+    assert len(linked) == 2
+    assert linked[0]['sources'] == ['pubmed', 'arxiv'] and linked[0]['pmid'] == '111'
+
+
+def test_equal_titles_with_different_dois_or_distant_years_stay_apart():
+    linker = RecordLinker()
+    articles = [
+        record('Correction to effects of exercise on sleep quality', 'crossref', doi='10.1000/a', year=2020),
+        record('Correction to effects of exercise on sleep quality', 'crossref', doi='10.1000/b', year=2020),
+        record('Annual report of the cardiology society meeting', 'core', year=2010),
+        record('Annual report of the cardiology society meeting', 'core', year=2015),
+    ]
+
+    assert len(linker.link(articles)) == 4
+
+
+def test_deduplicated_prefix_keeps_its_order():
+    linker = RecordLinker()
+    prefix = [record(f'Distinct study number {word} on topic', 'openalex', doi=f'10.1000/{i}')
+              for i, word in enumerate(['one', 'two', 'three'])]
+    tail = [record('Distinct study number two on topic', 'pubmed', doi='10.1000/1'), record('Brand new paper here', 'core')]
+
+    linked = linker.link(prefix + tail)
+
+    assert [a['title'] for a in linked[:3]] == [a['title'] for a in prefix]
+    assert linked[1]['sources'] == ['openalex', 'pubmed'] and len(linked) == 4
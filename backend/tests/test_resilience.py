@@ -0,0 +1,119 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.api_clients import resilience
+from app.api_clients.base import BaseClient
+from app.api_clients.resilience import CircuitBreaker, CircuitOpenError
+from app.core.config import settings
+
+
+class FakeTransport:
+    """Stands in for the shared httpx client; each send runs the next scripted behaviour."""
+
+    def __init__(self, *behaviours):
+        self.behaviours = list(behaviours)
+        self.calls = 0
+
+    async def send(self, request, stream=False):
+        self.calls += 1
+        return await self.behaviours.pop(0)(request)
+
+
+class FlakyClient(BaseClient):
+    SOURCE = "breaker-test"
+
+    def __init__(self, transport):
+        super().__init__()
+        self.transport = transport
+
+    @property
+    def client(self):
+        return self.transport
+
+    async def search(self, query, filters, limit, offset=0):
+        return {'articles': []}
+
+
+async def refuse(request):
+    raise httpx.ConnectError("refused", request=request)
+
+
+async def hang(request):
+    await asyncio.sleep(60)
+
+
+async def garble(request):
+    raise ValueError("unexpected payload")
+
+
+async def ok(request):
+    return httpx.Response(200, request=request)
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    monkeypatch.setattr(settings, 'CIRCUIT_FAILURE_THRESHOLD', 1)
+    monkeypatch.setattr(settings, 'CIRCUIT_COOLDOWN_SECONDS', 0.0)
+    monkeypatch.setattr(settings, 'UPSTREAM_MAX_RETRIES', 0)
+    monkeypatch.setattr(resilience, '_breakers', {})
+    return lambda: resilience._breakers[FlakyClient.SOURCE]
+
+
+def send(client):
+    return client._send(httpx.Request("GET", "https://example.org/works"), stream=False)
+
+
+def test_cancelled_probe_does_not_leave_the_circuit_shut(breaker):
+    client = FlakyClient(FakeTransport(refuse, hang, ok))
+
+    async def run():
+        with pytest.raises(httpx.ConnectError):
+            await send(client)
+        probe = asyncio.create_task(send(client))
+        await asyncio.sleep(0.01)
+        assert breaker()._probing
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        return await send(client)
+
+    assert asyncio.run(run()).status_code == 200
+    assert breaker().state == 'closed' and client.transport.calls == 3
+
+
+def test_probe_failing_with_a_non_transport_error_lets_the_next_call_probe(breaker):
+    client = FlakyClient(FakeTransport(refuse, garble, ok))
+
+    async def run():
+        with pytest.raises(httpx.ConnectError):
+            await send(client)
+        with pytest.raises(ValueError):
+            await send(client)
+        return await send(client)
+
+    assert asyncio.run(run()).status_code == 200
+    assert breaker().state == 'closed'
+
+
+def test_only_one_probe_while_half_open():
+    breaker = CircuitBreaker("probe-test", failure_threshold=1, cooldown=0.0)
+    breaker.record_failure()
+
+    assert breaker.check() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.release()
+    assert breaker.check() is True
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("open-test", failure_threshold=2, cooldown=30.0)
+    breaker.record_failure()
+    assert breaker.check() is False
+    breaker.record_failure()
+
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
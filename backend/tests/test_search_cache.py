@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.search_service import SearchService
+
+
+class Source:
+    def __init__(self, name, error=None):
+        self.name = name
+        self.error = error
+        self.calls = 0
+
+    async def search(self, query, filters, limit, offset=0):
+        self.calls += 1
+        if self.error:
+            return {'articles': [], 'error': self.error, 'circuit_open': False}
+        return {'articles': [
+            {'title': f'{self.name} paper {i}', 'doi': f'10.1/{self.name}.{i}', 'year': 2020, 'authors': [], 'abstract': ''}
+            for i in range(limit)
+        ]}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, 'SEARCH_CACHE_ENABLED', True)
+    monkeypatch.setattr(settings, 'LOCAL_INDEX_ENABLED', False)
+    monkeypatch.setattr(settings, 'SOURCE_STATS_ADAPTIVE', False)
+    monkeypatch.setattr(settings, 'SEARCH_DEADLINE_SECONDS', 1.0)
+    return SearchService()
+
+
+def test_payload_with_a_failed_source_is_not_cached(service):
+    service.clients = {'good': Source('good'), 'throttled': Source('throttled', error='429 Too Many Requests')}
+
+    async def run():
+        first = await service.search('failing', {}, limit=5)
+        service.clients['throttled'].error = None
+        second = await service.search('failing', {}, limit=5)
+        third = await service.search('failing', {}, limit=5)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+
+    assert first['sources_failed'] == ['throttled'] and not first['cached']
+    assert not second['cached'] and second['sources_failed'] == []
+    assert sorted(second['sources_used']) == ['good', 'throttled']
+    assert third['cached']
+    assert service.clients['throttled'].calls == 2
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.search_service import SearchService
+
+
+class FakeClient:
+    def __init__(self, name, delay=0.0, total=100):
+        self.name = name
+        self.delay = delay
+        self.total = total
+        self.offsets = []
+
+    async def search(self, query, filters, limit, offset=0):
+        self.offsets.append(offset)
+        await asyncio.sleep(self.delay)
+        return {'articles': [
+            {'title': f'{self.name} {query} paper {i}', 'doi': f'10.1/{self.name}.{i}', 'year': 2020, 'authors': [], 'abstract': ''}
+            for i in range(offset, min(offset + limit, self.total))
+        ]}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, 'SEARCH_CACHE_ENABLED', False)
+    monkeypatch.setattr(settings, 'LOCAL_INDEX_ENABLED', False)
+    monkeypatch.setattr(settings, 'SOURCE_STATS_ADAPTIVE', False)
+    monkeypatch.setattr(settings, 'SEARCH_DEADLINE_SECONDS', 0.05)
+    service = SearchService()
+    service.clients = {'fast': FakeClient('fast', total=25), 'slow': FakeClient('slow', delay=0.5)}
+    return service
+
+
+def test_cursor_ends_when_a_source_keeps_missing_the_deadline(service):
+    async def run():
+        page = await service.search('sleep', {}, limit=10)
+        pages = 1
+        while page['next_cursor'] and pages < 20:
+            page = await service.search('sleep', {}, limit=10, cursor=page['next_cursor'])
+            pages += 1
+        return pages
+
+    pages = asyncio.run(run())
+
+    assert pages < 20
+    # The first search and SEARCH_SNAPSHOT_SOURCE_MISSES - 1 retries at offset 0, then the source is dropped.
+    assert service.clients['slow'].offsets == [0] * settings.SEARCH_SNAPSHOT_SOURCE_MISSES
+    assert service.clients['fast'].offsets == [0, 10, 20]
+
+
+def test_empty_snapshot_page_has_no_cursor(service):
+    async def run():
+        first = await service.search('sleep', {}, limit=30)
+        return await service.search('sleep', {}, limit=30, cursor=first['next_cursor'])
+
+    page = asyncio.run(run())
+
+    assert page['articles'] == []
+    assert page['next_cursor'] is None
+
+
+def test_cache_hit_cursor_builds_snapshot_lazily(service, monkeypatch):
+    monkeypatch.setattr(settings, 'SEARCH_CACHE_ENABLED', True)
+    monkeypatch.setattr(settings, 'SEARCH_DEADLINE_SECONDS', 1.0)
+    service.clients = {'fast': FakeClient('fast', total=25)}
+    writes = []
+    original_set = service.snapshots.set
+
+    async def counting_set(key, value):
+        writes.append(key)
+        await original_set(key, value)
+
+    monkeypatch.setattr(service.snapshots, 'set', counting_set)
+
+    async def run():
+        await service.search('sleep', {}, limit=10)
+        service.snapshots.lru.delete(writes[0])
+        hit = await service.search('sleep', {}, limit=10)
+        assert hit['cached'] and len(writes) == 1
+        return await service.search('sleep', {}, limit=10, cursor=hit['next_cursor'])
+
+    page = asyncio.run(run())
+
+    assert [a['title'] for a in page['articles']] == [f'fast sleep paper {i}' for i in range(10, 20)]
+    assert len(writes) == 2
+
+
+
+class CursorClient(FakeClient):
+    """Pages like OpenAlex: string offsets are cursors and each page says where the next one starts."""
+
+    async def search(self, query, filters, limit, offset=0):
+        self.offsets.append(offset)
+        start = int(offset[1:]) if isinstance(offset, str) else offset
+        articles = [{'title': f'cursor paper {i}', 'doi': f'10.1/cursor.{i}', 'year': 2020, 'authors': [], 'abstract': ''}
+                    for i in range(start, start + limit)]
+        return {'articles': articles, 'next_offset': f"c{start + limit}"}
+
+
+def test_cursor_paged_source_resumes_from_its_next_offset(service):
+    client = CursorClient('openalex')
+    service.clients = {'openalex': client}
+
+    async def run():
+        pages = [await service.search('cursor', {}, limit=5)]
+        for _ in range(2):
+            pages.append(await service.search('cursor', {}, limit=5, cursor=pages[-1]['next_cursor']))
+        return pages
+
+    pages = asyncio.run(run())
+
+    assert client.offsets == [0, 'c5', 'c10']
+    assert len({a['title'] for page in pages for a in page['articles']}) == 15
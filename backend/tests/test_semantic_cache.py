@@ -0,0 +1,46 @@
+import asyncio
+
+import numpy as np
+
+from app.core.config import settings
+from app.schemas import LLMArticleInput, LLMAskArticleResponse
+from app.services import semantic_cache
+from app.services.semantic_cache import SemanticAnswerCache
+
+
+class FlakyModel:
+    """Fails to load once (offline), then embeds every question as the same unit vector."""
+
+    loads = 0
+
+    def __init__(self, name):
+        FlakyModel.loads += 1
+        if FlakyModel.loads == 1:
+            raise OSError("download failed")
+
+    def encode(self, text, normalize_embeddings=True):
+        return np.array([1.0, 0.0], dtype=np.float32)
+
+
+def test_questions_bypass_the_cache_until_the_model_loads_and_failures_retry(monkeypatch):
+    FlakyModel.loads = 0
+    monkeypatch.setattr(semantic_cache, 'SentenceTransformer', FlakyModel)
+    monkeypatch.setattr(settings, 'ASK_CACHE_ENABLED', True)
+    monkeypatch.setattr(settings, 'ASK_CACHE_MODEL_RETRY_SECONDS', 0)
+    cache = SemanticAnswerCache()
+    article = LLMArticleInput(title='A trial', authors=[], year=2020)
+
+    async def run():
+        results = [await cache.embed('what was measured?')]  # never waits: first load starts
+        await cache._loading
+        results.append(await cache.embed('what was measured?'))  # load failed: still bypassed, retry starts
+        await cache._loading
+        embedding = await cache.embed('what was measured?')
+        cache.set(article, 'what was measured?', 'pt', embedding, LLMAskArticleResponse(answer='blood pressure', citation='A trial (2020)'))
+        return results, cache.get(article, 'pt', await cache.embed('what did they measure?'))
+
+    (first, second), hit = asyncio.run(run())
+
+    assert first is None and second is None
+    assert hit.answer == 'blood pressure'
+    assert FlakyModel.loads == 2 and cache.metrics()['ready']
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from app.core.serialization import unpack
+from app.services import single_flight
+from app.services.search_cache import SearchCache
+from app.services.single_flight import SingleFlight
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+    async def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+def test_followers_get_the_leaders_uncached_result(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(single_flight, "get_redis", lambda: redis)
+    # Two workers: separate instances, so only the Redis lock and the published result are shared.
+    leader, follower = SingleFlight(use_redis=True, wait=2.0), SingleFlight(use_redis=True, wait=2.0)
+    calls = []
+
+    async def work(name):
+        calls.append(name)
+        await asyncio.sleep(0.1)
+        return {'articles': [], 'sources_timed_out': ['pubmed']}, False
+
+    async def nothing_cached():
+        return None
+
+    async def run():
+        first = asyncio.create_task(leader.do("q", lambda: work("leader"), nothing_cached))
+        await asyncio.sleep(0.01)
+        started = time.monotonic()
+        shared = await follower.do("q", lambda: work("follower"), nothing_cached)
+        return await first, shared, time.monotonic() - started
+
+    (led, _), (payload, cached), waited = asyncio.run(run())
+
+    assert calls == ["leader"]
+    assert payload['sources_timed_out'] == ['pubmed'] and cached is False
+    assert waited < 1.0
+    assert led == payload
+
+
+def test_leader_publishes_only_the_shared_form(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(single_flight, "get_redis", lambda: redis)
+    flight = SingleFlight(use_redis=True, wait=2.0)
+
+    async def work():
+        return {'articles': [{'title': 'A', 'raw': {'huge': 'x' * 10000}}]}
+
+    result = asyncio.run(flight.do("q", work, share=SearchCache.strip))
+
+    assert result['articles'][0]['raw']
+    assert unpack(redis.data[SingleFlight.PREFIX + "result:q"]) == {'articles': [{'title': 'A'}]}
@@ -0,0 +1,43 @@
+import asyncio
+
+from app.core.config import settings
+from app.services import tokens
+
+
+class FlakyTiktoken:
+    """Fails the first load (offline), then returns an encoding that counts words."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_encoding(self, name):
+        self.calls += 1
+        if self.calls == 1:
+            raise OSError("download failed")
+        return WordEncoding()
+
+
+class WordEncoding:
+    def encode(self, text, disallowed_special=()):
+        return text.split()
+
+
+def test_tokenizer_loads_in_background_and_retries_after_failure(monkeypatch):
+    fake = FlakyTiktoken()
+    monkeypatch.setattr(tokens, "tiktoken", fake)
+    monkeypatch.setattr(tokens, "_loaded", None)
+    monkeypatch.setattr(tokens, "_loading", None)
+    monkeypatch.setattr(tokens, "_retry_at", 0.0)
+    monkeypatch.setattr(settings, "LLM_TOKENIZER_RETRY_SECONDS", 0)
+    text = "one two three four five six seven eight"
+
+    async def run():
+        counts = [tokens.count_tokens(text)]  # never waits for the load: estimated, first load starts
+        await tokens._loading
+        counts.append(tokens.count_tokens(text))  # first load failed: still estimated, retry starts
+        await tokens._loading
+        counts.append(tokens.count_tokens(text))
+        return counts
+
+    assert asyncio.run(run()) == [10, 10, 8]
+    assert fake.calls == 2